@@ -1,11 +1,12 @@
 from django.contrib import admin
-from .models import Course, Enrollment, Material, CourseMember, CourseContent, Comment
+from .models import Course, Enrollment, Material, CourseMember, CourseContent, Comment, Statistic, StartupFingerprint
 
 # Register your models here.
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
     list_display = ['code', 'name', 'credits', 'instructor', 'created_at']
+    list_select_related = ['instructor']
     list_filter = ['credits', 'created_at']
     search_fields = ['code', 'name', 'description']
     
@@ -41,5 +42,19 @@ class CourseContentAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ['content_id', 'member_id', 'created_at']
+    # __str__ content dan member membaca course dan user
+    list_select_related = ['content_id__course_id', 'member_id__user_id', 'member_id__course']
     list_filter = ['created_at']
     search_fields = ['comment']
+
+
+@admin.register(Statistic)
+class StatisticAdmin(admin.ModelAdmin):
+    list_display = ['name', 'value', 'updated_at']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(StartupFingerprint)
+class StartupFingerprintAdmin(admin.ModelAdmin):
+    list_display = ['name', 'fingerprint', 'updated_at']
+    readonly_fields = ['updated_at']
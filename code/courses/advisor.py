@@ -0,0 +1,177 @@
+"""
+Index Advisor
+Menjalankan EXPLAIN untuk setiap query di balik route GET dan melaporkan
+sequential scan (serta sort tanpa index) pada tabel besar
+
+Dijalankan lewat `python manage.py index_advisor` terhadap database yang
+sedang dipakai (sebaiknya berisi data berukuran produksi, misalnya dari
+`setup_demo --scale`), karena keputusan planner bergantung pada statistik
+tabel. Setiap route GET di courses.routes.ROUTES ditambah PROBES (variasi
+filter API) dipanggil sekali lewat test Client; query SELECT yang dijalankan
+ditangkap lalu di-EXPLAIN. Route non-GET dilewati sehingga data tidak berubah.
+
+- PostgreSQL: node `Seq Scan on <tabel>` dan node `Sort`
+- SQLite: `SCAN <tabel>` tanpa index dan `USE TEMP B-TREE FOR ORDER BY`
+"""
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from ninja_jwt.tokens import RefreshToken
+
+from .models import Course, CourseContent, CourseMember, Enrollment, Material
+from .routes import ROUTES, Route, api_path, isolated_state, make_clients
+
+
+# Variasi filter API yang tidak tercakup ROUTES (pola akses yang diindeks)
+PROBES = [
+    Route('GET /api/v1/courses?min_price&max_price', lambda ctx, i: api_path('courses?min_price=100000&max_price=300000')),
+    Route('GET /api/v1/courses?teacher_id', lambda ctx, i: api_path(f"courses?teacher_id={ctx['teacher_id']}")),
+    Route('GET /api/v1/courses?cursor', lambda ctx, i: api_path('courses?cursor=')),
+    Route('GET /api/v1/members?roles', lambda ctx, i: api_path('members?roles=student'), client='jwt'),
+    Route('GET /api/v1/members?user_id', lambda ctx, i: api_path(f"members?user_id={ctx['user_id']}"), client='jwt'),
+    Route('GET /api/v1/contents?course_id&cursor', lambda ctx, i: api_path(f"contents?course_id={ctx['course_id']}&cursor=")),
+    Route('GET /api/v1/comments?content_id&cursor', lambda ctx, i: api_path(f"comments?content_id={ctx['content_id']}&cursor=")),
+    Route('GET enrollment_list?course', lambda ctx, i: f"/enrollments/?course={ctx['course_id']}", client='session'),
+]
+
+SQLITE_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+SQLITE_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+POSTGRES_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+POSTGRES_SORT_RE = re.compile(r'->\s+Sort\b|^Sort\b')
+
+
+def explain(sql: str) -> list:
+    """Baris rencana eksekusi (teks) untuk satu query"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}')
+        return [row[0] for row in cursor.fetchall()]
+
+
+def find_issues(plan: list) -> list:
+    """
+    Cari sequential scan dan sort di rencana eksekusi
+
+    Returns:
+        list: (jenis, tabel atau None, baris rencana)
+    """
+    issues = []
+    for line in plan:
+        text = line.strip()
+        if connection.vendor == 'sqlite':
+            match = SQLITE_SCAN_RE.match(text)
+            if match:
+                issues.append(('seq_scan', match.group(1), text))
+            elif text.startswith(SQLITE_SORT):
+                issues.append(('sort', None, text))
+        else:
+            match = POSTGRES_SCAN_RE.search(text)
+            if match:
+                issues.append(('seq_scan', match.group(1), text))
+            elif POSTGRES_SORT_RE.search(text):
+                issues.append(('sort', None, text))
+    return issues
+
+
+_row_counts = {}
+
+
+def table_rows(table: str) -> int:
+    """Perkiraan jumlah baris tabel (statistik planner di PostgreSQL)"""
+    if table not in _row_counts:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+                row = cursor.fetchone()
+                _row_counts[table] = max(row[0], 0) if row else 0
+            else:
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                _row_counts[table] = cursor.fetchone()[0]
+    return _row_counts[table]
+
+
+def build_context(username: str = None) -> dict:
+    """
+    Id contoh untuk path route, dipilih dari kasus terberat: course dengan
+    enrollment terbanyak dan content dengan komentar terbanyak
+
+    Raises:
+        ValueError: Jika superuser atau data belum ada
+    """
+    users = User.objects.filter(is_active=True)
+    admin = users.filter(username=username).first() if username else \
+        users.filter(is_superuser=True).order_by('id').first()
+    if admin is None:
+        raise ValueError('Superuser aktif tidak ditemukan; gunakan --username')
+
+    course = Course.objects.order_by('-enrollment_count', 'id').first()
+    content = CourseContent.objects.order_by('-comment_count', 'id').first()
+    if course is None or content is None:
+        raise ValueError('Database belum berisi course/content; jalankan setup_demo terlebih dahulu')
+    material = Material.objects.filter(course=course).first()
+    enrollment = Enrollment.objects.filter(course=course).first()
+    member = CourseMember.objects.filter(course=course).first()
+
+    refresh = RefreshToken.for_user(admin)
+    return {
+        'admin': admin,
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+        'course_id': course.id,
+        'content_id': content.id,
+        'material_id': material.id if material else 0,
+        'enrollment_id': enrollment.id if enrollment else 0,
+        'user_id': member.user_id_id if member else admin.id,
+        'teacher_id': course.teacher_id or admin.id,
+    }
+
+
+def analyze(ctx: dict, min_rows: int = 1000, sorts: bool = False, only: list = None, log=None) -> dict:
+    """
+    EXPLAIN semua query SELECT dari setiap route GET
+
+    Args:
+        ctx: Hasil build_context()
+        min_rows: Sequential scan pada tabel lebih kecil dari ini diabaikan
+        sorts: Laporkan juga sort yang tidak dilayani index
+        only: Hanya route yang key-nya mengandung salah satu string ini
+
+    Returns:
+        dict: key route -> {status, queries, issues}
+    """
+    clients = make_clients(ctx)
+    report = {}
+    with isolated_state():
+        for route in ROUTES + PROBES:
+            if route.method != 'GET' or (only and not any(pattern in route.key for pattern in only)):
+                continue
+            with CaptureQueriesContext(connection) as captured:
+                response = clients[route.client].get(route.path(ctx, 0), secure=True)
+
+            issues, seen = [], set()
+            for query in captured.captured_queries:
+                sql = query['sql']
+                if sql in seen or not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                    continue
+                seen.add(sql)
+                for kind, table, line in find_issues(explain(sql)):
+                    if kind == 'sort' and not sorts:
+                        continue
+                    if kind == 'seq_scan' and table_rows(table) < min_rows:
+                        continue
+                    issues.append({
+                        'kind': kind,
+                        'table': table,
+                        'rows': table_rows(table) if table else None,
+                        'plan': line.strip(),
+                        'sql': sql,
+                    })
+
+            report[route.key] = {'status': response.status_code, 'queries': len(captured), 'issues': issues}
+            if log:
+                log(route.key, report[route.key])
+    return report
@@ -1,29 +1,38 @@
 from ninja import NinjaAPI, Schema
 from ninja.errors import HttpError
-from ninja_jwt.authentication import JWTAuth
 from ninja_jwt.tokens import RefreshToken
-from ninja.pagination import paginate, PageNumberPagination
+from ninja.pagination import paginate
 from pydantic import field_validator
 import re
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.db.models import Q
 from .models import CourseMember, CourseContent, Comment, Course
 from .throttling import throttle, throttle_strict, throttle_moderate
+from .pagination import CustomPagination
+from .search import search as fulltext_search
+from .caching import cache_response
+from .conditional import conditional_get
+from .replicas import use_replica
+from .servermode import ASYNC_VIEWS, asgi_variant, async_under_asgi
 from .auth_api import auth_router
+from .authentication import AsyncCachedJWTAuth, CachedJWTAuth
+from .hashing import HashingPoolBusy, authenticate_user, create_user
 from typing import List, Optional
 
 apiv1 = NinjaAPI()
-auth = JWTAuth()
+auth = CachedJWTAuth()
+async_auth = AsyncCachedJWTAuth()
 
 # Include auth router
 apiv1.add_router('/auth', auth_router)
 
-# Custom Pagination
-class CustomPagination(PageNumberPagination):
-    page_size = 10
-    max_page_size = 100
 
+@apiv1.exception_handler(HashingPoolBusy)
+def hashing_pool_busy(request, exc):
+    """Pool hashing password penuh: 503 cepat dengan Retry-After"""
+    response = apiv1.create_response(request, {"detail": str(exc)}, status=503)
+    response['Retry-After'] = str(exc.retry_after)
+    return response
 
 @apiv1.get('/hello')
 def helloApi(request):
@@ -123,7 +132,7 @@ def register(request, data: Register):
     if User.objects.filter(email=data.email).exists():
         raise HttpError(400, "Email sudah terdaftar")
     
-    newUser = User.objects.create_user(
+    newUser = create_user(
         username=data.username,
         password=data.password,
         email=data.email,
@@ -150,7 +159,7 @@ class TokenOut(Schema):
 @throttle_moderate
 def login(request, credentials: LoginSchema):
     """Login endpoint - returns JWT tokens"""
-    user = authenticate(username=credentials.username, password=credentials.password)
+    user = authenticate_user(credentials.username, credentials.password, request)
     
     if user is None:
         raise HttpError(401, "Username atau password salah")
@@ -204,7 +213,8 @@ def logout(request, data: RefreshTokenSchema):
         return {'message': 'Logout berhasil'}
 
 
-@apiv1.get('/me', auth=auth, response=UserOut)
+@apiv1.get('/me', auth=async_auth if ASYNC_VIEWS else auth, response=UserOut)
+@async_under_asgi
 def get_current_user(request):
     """Get current authenticated user"""
     return request.auth
@@ -227,10 +237,11 @@ def list_users(request, search: Optional[str] = None, is_staff: Optional[bool] =
     Query Parameters:
     - search: Search in username, first_name, last_name, email
     - is_staff: Filter by staff status (true/false)
+    - cursor: Keyset pagination token (kosong untuk halaman pertama)
     """
     users = User.objects.all()
     
-    # Filtering by search
+    # Filtering by search (di PostgreSQL memakai index trigram, migration 0004)
     if search:
         users = users.filter(
             Q(username__icontains=search) |
@@ -261,30 +272,25 @@ class CourseSchema(Schema):
     name: str
     description: str
     price: int
-    teacher: int
+    teacher: Optional[int] = None
+    enrollment_count: int = 0
+    material_count: int = 0
+    content_count: int = 0
+    member_count: int = 0
 
 
-@apiv1.get("/courses", response=List[CourseSchema])
-@paginate(CustomPagination)
-@throttle(max_requests=30, time_window=60)
-def list_courses(request, search: Optional[str] = None, min_price: Optional[int] = None, max_price: Optional[int] = None, teacher_id: Optional[int] = None):
-    """List all courses with pagination and filtering - public endpoint
-    
-    Query Parameters:
-    - search: Search in course name or description
-    - min_price: Minimum price filter
-    - max_price: Maximum price filter
-    - teacher_id: Filter by teacher ID
-    """
+# Counter denormalisasi (courses.counters) yang ikut dikirim di CourseSchema
+COURSE_COUNTERS = ('enrollment_count', 'material_count', 'content_count', 'member_count')
+COURSE_DETAIL_FIELDS = ('id', 'name', 'description', 'price', 'teacher', *COURSE_COUNTERS)
+
+
+def filter_courses(search: Optional[str] = None, min_price: Optional[int] = None, max_price: Optional[int] = None, teacher_id: Optional[int] = None):
+    """Queryset course sesuai filter list_courses (dipakai juga untuk ETag)"""
     courses = Course.objects.all()
     
-    # Filtering by search
+    # Full-text search (diurutkan berdasarkan relevansi)
     if search:
-        courses = courses.filter(
-            Q(name__icontains=search) |
-            Q(description__icontains=search) |
-            Q(code__icontains=search)
-        )
+        courses = fulltext_search(courses, search)
     
     # Filtering by price range
     if min_price is not None:
@@ -296,30 +302,53 @@ def list_courses(request, search: Optional[str] = None, min_price: Optional[int]
     if teacher_id is not None:
         courses = courses.filter(teacher_id=teacher_id)
     
-    return [
-        {
-            "id": c.id,
-            "name": c.name,
-            "description": c.description,
-            "price": c.price,
-            "teacher": c.teacher.id if c.teacher else None
-        }
-        for c in courses
-    ]
+    return courses
+
+
+@apiv1.get("/courses", response=List[CourseSchema])
+@use_replica('courses')
+@throttle(max_requests=30, time_window=60)
+@conditional_get('courses', filter_courses)
+@cache_response('courses')
+@paginate(CustomPagination)
+@async_under_asgi
+def list_courses(request, search: Optional[str] = None, min_price: Optional[int] = None, max_price: Optional[int] = None, teacher_id: Optional[int] = None):
+    """List all courses with pagination and filtering - public endpoint
+    
+    Query Parameters:
+    - search: Full-text search in course code, name or description (ranked)
+    - min_price: Minimum price filter
+    - max_price: Maximum price filter
+    - teacher_id: Filter by teacher ID
+    - cursor: Keyset pagination token (kosong untuk halaman pertama)
+    
+    Mendukung conditional GET (ETag / Last-Modified).
+    """
+    courses = filter_courses(search, min_price, max_price, teacher_id)
+    
+    # Biarkan paginator yang menjalankan LIMIT/OFFSET; kolom FK dibaca langsung (tanpa join)
+    # search_rank = bagian ordering (posisi cursor) saat search aktif
+    ranked = ('search_rank',) if search else ()
+    return courses.values('id', 'code', 'name', 'description', 'price', 'teacher', *COURSE_COUNTERS, *ranked)
+
+
+async def aget_course(request, course_id: int):
+    """Varian async get_course (SERVER_MODE=asgi)"""
+    try:
+        return await Course.objects.values(*COURSE_DETAIL_FIELDS).aget(id=course_id)
+    except Course.DoesNotExist:
+        raise HttpError(404, "Course tidak ditemukan")
 
 
 @apiv1.get("/courses/{course_id}", response=CourseSchema)
+@use_replica('courses')
+@conditional_get('courses', lambda course_id: Course.objects.filter(id=course_id))
+@cache_response('courses')
+@asgi_variant(aget_course)
 def get_course(request, course_id: int):
-    """Get specific course - public endpoint"""
+    """Get specific course - public endpoint (mendukung ETag / Last-Modified)"""
     try:
-        c = Course.objects.get(id=course_id)
-        return {
-            "id": c.id,
-            "name": c.name,
-            "description": c.description,
-            "price": c.price,
-            "teacher": c.teacher.id if c.teacher else None
-        }
+        return Course.objects.values(*COURSE_DETAIL_FIELDS).get(id=course_id)
     except Course.DoesNotExist:
         raise HttpError(404, "Course tidak ditemukan")
 
@@ -357,7 +386,7 @@ def create_course(request, data: CourseCreateSchema):
         "name": course.name,
         "description": course.description,
         "price": course.price,
-        "teacher": course.teacher.id
+        "teacher": course.teacher_id
     }
 
 
@@ -374,27 +403,21 @@ def list_members(request, roles: Optional[str] = None, user_id: Optional[int] =
     """List all course members with pagination and filtering - requires authentication
     
     Query Parameters:
-    - roles: Filter by role (teacher/student)
+    - roles: Filter by role, exact (instructor/student)
     - user_id: Filter by user ID
+    - cursor: Keyset pagination token (kosong untuk halaman pertama)
     """
     members = CourseMember.objects.all()
     
-    # Filtering by role
+    # Filtering by role (exact, dilayani index member_roles_recent_idx)
     if roles:
-        members = members.filter(roles__icontains=roles)
+        members = members.filter(roles=roles.lower())
     
     # Filtering by user
     if user_id is not None:
         members = members.filter(user_id_id=user_id)
     
-    return [
-        {
-            "id": m.id,
-            "user_id": m.user_id.id,
-            "roles": m.roles,
-        }
-        for m in members
-    ]
+    return members.values('id', 'user_id', 'roles', 'joined_at')
 
 
 class CourseContentSchema(Schema):
@@ -404,42 +427,43 @@ class CourseContentSchema(Schema):
     description: str
     video_url: str
     file_attachment: str
+    comment_count: int = 0
 
 
-@apiv1.get("/contents", response=List[CourseContentSchema])
-@paginate(CustomPagination)
-@throttle(max_requests=30, time_window=60)
-def list_contents(request, course_id: Optional[int] = None, search: Optional[str] = None):
-    """List all course contents with pagination and filtering
-    
-    Query Parameters:
-    - course_id: Filter by course ID
-    - search: Search in content name or description
-    """
+def filter_contents(course_id: Optional[int] = None, search: Optional[str] = None):
+    """Queryset content sesuai filter list_contents (dipakai juga untuk ETag)"""
     contents = CourseContent.objects.all()
     
     # Filtering by course
     if course_id is not None:
         contents = contents.filter(course_id_id=course_id)
     
-    # Filtering by search
+    # Full-text search (diurutkan berdasarkan relevansi)
     if search:
-        contents = contents.filter(
-            Q(name__icontains=search) |
-            Q(description__icontains=search)
-        )
+        contents = fulltext_search(contents, search)
     
-    return [
-        {
-            "id": c.id,
-            "course_id": c.course_id.id,
-            "name": c.name,
-            "description": c.description,
-            "video_url": c.video_url,
-            "file_attachment": c.file_attachment
-        }
-        for c in contents
-    ]
+    return contents
+
+
+@apiv1.get("/contents", response=List[CourseContentSchema])
+@use_replica('contents')
+@throttle(max_requests=30, time_window=60)
+@conditional_get('contents', filter_contents)
+@cache_response('contents')
+@paginate(CustomPagination)
+@async_under_asgi
+def list_contents(request, course_id: Optional[int] = None, search: Optional[str] = None):
+    """List all course contents with pagination and filtering
+    
+    Query Parameters:
+    - course_id: Filter by course ID
+    - search: Full-text search in content name or description (ranked)
+    - cursor: Keyset pagination token (kosong untuk halaman pertama)
+    
+    Mendukung conditional GET (ETag / Last-Modified).
+    """
+    ranked = ('search_rank',) if search else ()
+    return filter_contents(course_id, search).values('id', 'course_id', 'name', 'description', 'video_url', 'file_attachment', 'comment_count', 'order', 'created_at', *ranked)
 
 
 class CommentSchema(Schema):
@@ -450,14 +474,18 @@ class CommentSchema(Schema):
 
 
 @apiv1.get("/comments", response=List[CommentSchema])
-@paginate(CustomPagination)
+@use_replica('comments')
 @throttle(max_requests=30, time_window=60)
+@cache_response('comments')
+@paginate(CustomPagination)
+@async_under_asgi
 def list_comments(request, content_id: Optional[int] = None, member_id: Optional[int] = None):
     """List all comments with pagination and filtering
     
     Query Parameters:
     - content_id: Filter by content ID
     - member_id: Filter by member ID
+    - cursor: Keyset pagination token (kosong untuk halaman pertama)
     """
     comments = Comment.objects.all()
     
@@ -469,15 +497,7 @@ def list_comments(request, content_id: Optional[int] = None, member_id: Optional
     if member_id is not None:
         comments = comments.filter(member_id_id=member_id)
     
-    return [
-        {
-            "id": c.id,
-            "content_id": c.content_id.id,
-            "member_id": c.member_id.id,
-            "comment": c.comment,
-        }
-        for c in comments
-    ]
+    return comments.values('id', 'content_id', 'member_id', 'comment', 'created_at')
 
 
 class CommentCreateSchema(Schema):
@@ -507,7 +527,7 @@ def create_comment(request, data: CommentCreateSchema):
     
     return {
         "id": comment.id,
-        "content_id": comment.content_id.id,
-        "member_id": comment.member_id.id,
+        "content_id": comment.content_id_id,
+        "member_id": comment.member_id_id,
         "comment": comment.comment
     }
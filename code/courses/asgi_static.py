@@ -0,0 +1,43 @@
+"""
+Static files untuk mode ASGI (SERVER_MODE=asgi)
+
+WhiteNoiseMiddleware hanya sinkron: di bawah ASGIHandler seluruh chain
+middleware ikut diadaptasi ke thread sehingga view async tidak berguna. Pada
+mode ASGI WhiteNoise dikeluarkan dari MIDDLEWARE (lihat settings) dan file di
+STATIC_ROOT dilayani oleh handler ini sebelum request masuk ke Django.
+
+Nama file ber-hash dari manifest (CompressedManifestStaticFilesStorage)
+dikirim dengan Cache-Control immutable satu tahun, file lain 60 detik
+(sama seperti default WhiteNoise).
+"""
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.views.static import serve
+
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+DEFAULT_MAX_AGE = 60
+
+
+class StaticRootHandler(ASGIStaticFilesHandler):
+    """
+    ASGIStaticFilesHandler yang membaca STATIC_ROOT (hasil collectstatic)
+
+    Handler bawaan Django memakai finders (file sumber, tanpa nama ber-hash),
+    sedangkan template production merujuk nama dari manifest.
+    """
+
+    def __init__(self, application):
+        super().__init__(application)
+        hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+        self.immutable = set(hashed_files.values())
+
+    def serve(self, request):
+        path = self.file_path(request.path).replace('\\', '/')
+        response = serve(request, path, document_root=settings.STATIC_ROOT)
+        if path in self.immutable:
+            response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = f'public, max-age={DEFAULT_MAX_AGE}'
+        return response
@@ -1,15 +1,15 @@
 from ninja import Router
 from ninja.errors import HttpError
 from ninja_jwt.tokens import RefreshToken
-from ninja_jwt.authentication import JWTAuth
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.db import IntegrityError
 from .auth_schemas import RegisterSchema, LoginSchema, TokenResponseSchema, MessageSchema
 from .throttling import throttle_strict
+from .authentication import CachedJWTAuth
+from .hashing import authenticate_user, create_user
 
 auth_router = Router(tags=['Authentication'])
-jwt_auth = JWTAuth()
+jwt_auth = CachedJWTAuth()
 
 
 @auth_router.post('/register', response={201: TokenResponseSchema, 400: MessageSchema})
@@ -32,7 +32,7 @@ def register(request, payload: RegisterSchema):
     
     try:
         # Create user
-        user = User.objects.create_user(
+        user = create_user(
             username=payload.username,
             email=payload.email,
             password=payload.password,
@@ -65,7 +65,7 @@ def login(request, payload: LoginSchema):
     Login user and return JWT tokens
     """
     # Authenticate user
-    user = authenticate(username=payload.username, password=payload.password)
+    user = authenticate_user(payload.username, payload.password, request)
     
     if user is None:
         raise HttpError(401, "Username atau password salah")
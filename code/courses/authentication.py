@@ -0,0 +1,113 @@
+"""
+JWT Authentication dengan cache user
+Menghindari query `auth_user` di setiap request yang memakai JWT
+
+Token yang sudah tervalidasi membawa `user_id`; record user disimpan di cache
+in-process (TTL pendek, jumlah entry terbatas) dan dihapus saat User disimpan
+atau dihapus (lihat `courses.signals`). Karena cache per proses, perubahan di
+worker lain paling lama terlihat setelah JWT_USER_CACHE_TTL detik.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from ninja_jwt.authentication import AsyncJWTAuth, JWTAuth
+from ninja_jwt.settings import api_settings
+
+
+JWT_USER_CACHE_TTL = getattr(settings, 'JWT_USER_CACHE_TTL', 30)
+JWT_USER_CACHE_SIZE = getattr(settings, 'JWT_USER_CACHE_SIZE', 1024)
+
+
+class UserCache:
+    """Cache LRU + TTL untuk object User, key = user_id"""
+
+    def __init__(self, ttl: int = JWT_USER_CACHE_TTL, max_size: int = JWT_USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+        # Salinan agar perubahan atribut di satu request tidak bocor ke request lain
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        with self.lock:
+            self.entries[user_id] = (copy.copy(user), time.monotonic() + self.ttl)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedUserMixin:
+    """get_user() berbasis `user_cache`; dipakai oleh auth sync maupun async"""
+
+    def get_cached_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        return user_cache.get(user_id) if user_id is not None else None
+
+    def get_user(self, validated_token):
+        user = self.get_cached_user(validated_token)
+        if user is not None:
+            return user
+
+        # Validasi (user ada & aktif) tetap dilakukan oleh JWTAuth
+        user = super().get_user(validated_token)
+        user_cache.set(validated_token.get(api_settings.USER_ID_CLAIM), user)
+        return user
+
+
+class CachedJWTAuth(CachedUserMixin, JWTAuth):
+    """
+    Pengganti JWTAuth yang meng-cache user berdasarkan `user_id` di token
+
+    Usage:
+        auth = CachedJWTAuth()
+
+        @apiv1.get('/me', auth=auth)
+        def get_current_user(request):
+            return request.auth
+    """
+
+
+class AsyncCachedJWTAuth(CachedUserMixin, AsyncJWTAuth):
+    """
+    Versi async CachedJWTAuth untuk endpoint `async def`
+
+    Cache hit dijawab langsung di event loop; hanya cache miss yang
+    menjalankan query user lewat sync_to_async.
+    """
+
+    async def async_jwt_authenticate(self, request, token: str):
+        request.user = AnonymousUser()
+        validated_token = self.get_validated_token(token)
+        user = self.get_cached_user(validated_token)
+        if user is None:
+            user = await sync_to_async(self.get_user)(validated_token)
+        request.user = user
+        return user
@@ -0,0 +1,660 @@
+"""
+Benchmark Suite
+Mengukur throughput dan latency setiap route API (apiv1) dan view HTML
+
+Dijalankan lewat `python manage.py benchmark`:
+1. Membuat database benchmark terpisah (database test Django: SQLite
+   in-memory atau `test_<DB_NAME>` di PostgreSQL) sehingga data asli aman
+2. Mengisi dataset berparameter (N course, M user, K komentar) dengan seed
+   random tetap agar hasil bisa direproduksi
+3. Memanggil setiap route lewat Django test Client (in-process, termasuk
+   seluruh middleware) dan mencatat latency, status dan jumlah query
+4. Menghasilkan laporan JSON; jika baseline diberikan, setiap route
+   dibandingkan (perubahan p50/p99/throughput dan flag regresi)
+
+Response cache, throttle dan metric memakai storage sementara selama
+benchmark agar tidak mengganggu server yang sedang berjalan di host yang sama.
+
+`python manage.py benchmark_connections` (PostgreSQL) menjalankan route GET
+yang sama dari beberapa thread dengan koneksi persisten per thread
+(CONN_MAX_AGE) lalu dengan connection pool psycopg3 (DB_POOL), dan
+membandingkan latency, throughput serta jumlah koneksi server.
+
+`python manage.py benchmark_memory` menjalankan gunicorn sungguhan tanpa lalu
+dengan preload (GUNICORN_PRELOAD, lihat gunicorn.conf.py) dan membandingkan
+memori per worker (RSS, PSS, USS dari /proc/<pid>/smaps_rollup) setelah
+request pemanasan.
+"""
+import copy
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connections
+from django.db.utils import load_backend
+from django.test import Client
+from ninja_jwt.tokens import RefreshToken
+
+from .counters import recount
+from .models import Comment, Course, CourseContent, CourseMember, Enrollment, Material
+from .routes import BENCHMARK_PASSWORD, ROUTES, Route, discover_routes, isolated_state, make_clients
+from .search import rebuild_search_index
+from .stats import STAT_MODELS, reconcile
+
+
+MEMBERS_PER_COURSE = 5
+MATERIALS_PER_COURSE = 3
+CONTENTS_PER_COURSE = 3
+
+
+# Dataset
+
+def seed_dataset(courses: int, users: int, comments: int, seed: int = 42, using: str = 'default') -> dict:
+    """
+    Isi database dengan dataset benchmark (bulk_create, tanpa signal)
+
+    Returns:
+        dict: id yang dipakai route (course, content, material, enrollment, user)
+    """
+    rng = random.Random(seed)
+    password = make_password(BENCHMARK_PASSWORD)  # hash sekali untuk semua user
+
+    user_objs = [User(username='bench_admin', email='bench_admin@example.com', password=password,
+                      is_staff=True, is_superuser=True)]
+    user_objs += [
+        User(username=f'bench_user{i:05d}', email=f'bench_user{i:05d}@example.com', password=password,
+             first_name=f'User{i}', last_name='Benchmark')
+        for i in range(1, users)
+    ]
+    user_objs = User.objects.using(using).bulk_create(user_objs, batch_size=1000)
+    admin = user_objs[0]
+
+    course_objs = Course.objects.using(using).bulk_create([
+        Course(code=f'B{i:05d}', name=f'Benchmark Course {i}',
+               description=f'Course benchmark nomor {i} tentang pemrograman dan basis data',
+               price=rng.randrange(0, 1000000, 50000), credits=rng.choice((2, 3, 4)),
+               teacher=rng.choice(user_objs), instructor=rng.choice(user_objs))
+        for i in range(courses)
+    ], batch_size=1000)
+
+    Material.objects.using(using).bulk_create([
+        Material(course=course, title=f'Materi {j}', content='Isi materi benchmark', order=j)
+        for course in course_objs for j in range(MATERIALS_PER_COURSE)
+    ], batch_size=1000)
+    content_objs = CourseContent.objects.using(using).bulk_create([
+        CourseContent(course_id=course, name=f'Konten {j}', description='Deskripsi konten benchmark', order=j)
+        for course in course_objs for j in range(CONTENTS_PER_COURSE)
+    ], batch_size=1000)
+
+    member_objs, enrollment_objs = [], []
+    for index, course in enumerate(course_objs):
+        members = rng.sample(user_objs[1:], min(MEMBERS_PER_COURSE, len(user_objs) - 1))
+        if index == 0:
+            members = [admin] + members  # admin boleh berkomentar di course pertama
+        for user in members:
+            member_objs.append(CourseMember(user_id=user, course=course, roles='student'))
+            enrollment_objs.append(Enrollment(student=user, course=course))
+    member_objs = CourseMember.objects.using(using).bulk_create(member_objs, batch_size=1000)
+    enrollment_objs = Enrollment.objects.using(using).bulk_create(enrollment_objs, batch_size=1000)
+
+    members_by_course = {}
+    for member in member_objs:
+        members_by_course.setdefault(member.course_id, []).append(member)
+    comment_objs = []
+    for i in range(comments):
+        content = rng.choice(content_objs)
+        comment_objs.append(Comment(
+            content_id=content, member_id=rng.choice(members_by_course[content.course_id_id]),
+            comment=f'Komentar benchmark {i}',
+        ))
+    Comment.objects.using(using).bulk_create(comment_objs, batch_size=1000)
+
+    # bulk_create melewati signal: sinkronkan index dan counter
+    rebuild_search_index(using=using)
+    for name in STAT_MODELS:
+        reconcile(name, using=using)
+    recount(using=using)
+
+    first_course = course_objs[0]
+    return {
+        'admin': admin,
+        'user_id': user_objs[-1].id,
+        'course_id': first_course.id,
+        'content_id': next(c.id for c in content_objs if c.course_id_id == first_course.id),
+        'material_id': Material.objects.using(using).filter(course=first_course).values_list('id', flat=True)[0],
+        'enrollment_id': enrollment_objs[0].id,
+    }
+
+
+# Runner
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile dari list yang sudah diurutkan"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def latency_summary(latencies: list) -> dict:
+    """Ringkasan latency (ms): mean dan percentile"""
+    latencies = sorted(latencies)
+    return {
+        'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        'p50': round(percentile(latencies, 50), 3),
+        'p90': round(percentile(latencies, 90), 3),
+        'p99': round(percentile(latencies, 99), 3),
+        'max': round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+
+def _remote_addr(index: int) -> str:
+    # IP berbeda per request agar rate limiter tidak ikut diukur sebagai 429
+    return f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}'
+
+
+def measure(route: Route, client: Client, ctx: dict, iterations: int, warmup: int, counter) -> dict:
+    latencies, statuses, queries = [], {}, []
+    for i in range(warmup + iterations):
+        index = next(counter)
+        extra = {'REMOTE_ADDR': _remote_addr(index)}
+        path = route.path(ctx, index)
+        data = route.data(ctx, index) if route.data else None
+        kwargs = {}
+        if data is not None:
+            kwargs = {'data': data} if route.form else {'data': json.dumps(data), 'content_type': 'application/json'}
+
+        start = time.perf_counter()
+        # secure=True: tanpa DEBUG, SECURE_SSL_REDIRECT mengalihkan request http (301)
+        response = getattr(client, route.method.lower())(path, **kwargs, secure=True, **extra)
+        elapsed = time.perf_counter() - start
+
+        if i < warmup:
+            continue
+        latencies.append(elapsed * 1000)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+        if response.has_header('X-Query-Count'):
+            queries.append(int(response['X-Query-Count']))
+
+    total = sum(latencies)
+    return {
+        'method': route.method,
+        'client': route.client,
+        'requests': len(latencies),
+        'errors': sum(n for status, n in statuses.items() if status.startswith('5')),
+        'status_codes': statuses,
+        'throughput_rps': round(len(latencies) / (total / 1000), 2) if total else 0.0,
+        'latency_ms': latency_summary(latencies),
+        'queries_mean': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def run_routes(ctx: dict, iterations: int, warmup: int, only: list = None, log=None) -> dict:
+    clients = make_clients(ctx)
+    counter = iter(range(10 ** 9))
+    results = {}
+    for route in ROUTES:
+        if only and not any(pattern in route.key for pattern in only):
+            continue
+        count = max(3, iterations // 10) if route.slow else iterations
+        results[route.key] = measure(route, clients[route.client], ctx, count, 0 if route.slow else warmup, counter)
+        if log:
+            latency = results[route.key]['latency_ms']
+            log(f"{route.key:<45} p50={latency['p50']:>8.2f}ms p99={latency['p99']:>8.2f}ms "
+                f"rps={results[route.key]['throughput_rps']:>8.1f}")
+    return results
+
+
+def _change(new, old):
+    return round((new - old) / old * 100, 2) if old else None
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> dict:
+    """
+    Bandingkan laporan dengan baseline per route
+
+    Route dianggap regresi jika p50 atau p99 naik lebih dari `threshold` persen.
+    """
+    comparison = {}
+    for key, result in report['routes'].items():
+        old = baseline.get('routes', {}).get(key)
+        if old is None:
+            continue
+        p50 = _change(result['latency_ms']['p50'], old['latency_ms']['p50'])
+        p99 = _change(result['latency_ms']['p99'], old['latency_ms']['p99'])
+        comparison[key] = {
+            'p50_change_pct': p50,
+            'p99_change_pct': p99,
+            'throughput_change_pct': _change(result['throughput_rps'], old['throughput_rps']),
+            'queries_change': (
+                round(result['queries_mean'] - old['queries_mean'], 2)
+                if result['queries_mean'] is not None and old.get('queries_mean') is not None else None
+            ),
+            'regression': any(value is not None and value > threshold for value in (p50, p99)),
+        }
+    return comparison
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=settings.BASE_DIR, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def _seeded_context(courses: int, users: int, comments: int, seed: int, using: str, log=None) -> tuple:
+    started = time.perf_counter()
+    ctx = seed_dataset(courses, users, comments, seed=seed, using=using)
+    seed_seconds = time.perf_counter() - started
+    refresh = RefreshToken.for_user(ctx['admin'])
+    ctx.update(access=str(refresh.access_token), refresh=str(refresh),
+               logout_refresh=str(RefreshToken.for_user(ctx['admin'])))
+    if log:
+        log(f'Dataset siap dalam {seed_seconds:.1f}s ({connections[using].vendor})')
+    return ctx, seed_seconds
+
+
+def run_benchmark(courses: int = 200, users: int = 100, comments: int = 1000, iterations: int = 50,
+                  warmup: int = 5, seed: int = 42, using: str = 'default', keepdb: bool = False,
+                  only: list = None, log=None) -> dict:
+    """
+    Jalankan benchmark lengkap di database benchmark terpisah
+
+    Returns:
+        dict: Laporan (meta, routes, uncovered)
+    """
+    connection = connections[using]
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+    try:
+        with isolated_state():
+            ctx, seed_seconds = _seeded_context(courses, users, comments, seed, using, log)
+            routes = run_routes(ctx, iterations, warmup, only=only, log=log)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_commit': _git_commit(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'dataset': {'courses': courses, 'users': users, 'comments': comments, 'seed': seed},
+            'iterations': iterations,
+            'warmup': warmup,
+            'seed_seconds': round(seed_seconds, 2),
+        },
+        'routes': routes,
+        'uncovered': sorted(discover_routes() - {route.key for route in ROUTES}),
+    }
+
+
+# Connection pool vs koneksi persisten
+
+def connection_settings(settings_dict: dict, pool: dict = None) -> dict:
+    """
+    Salinan settings database untuk satu mode koneksi
+
+    Args:
+        pool: Opsi psycopg_pool (mode pool); None = koneksi persisten
+            per thread (CONN_MAX_AGE=600 + health check, setup tanpa DB_POOL)
+    """
+    database = copy.deepcopy(settings_dict)
+    options = {key: value for key, value in database.get('OPTIONS', {}).items() if key != 'pool'}
+    database.update(OPTIONS=options, CONN_HEALTH_CHECKS=True)
+    if pool is None:
+        database.update(ENGINE='django.db.backends.postgresql', CONN_MAX_AGE=600)
+    else:
+        database.update(ENGINE='courses.pooled_postgresql', CONN_MAX_AGE=0)
+        options['pool'] = dict(pool)
+    return database
+
+
+def _server_connections(cursor, terminate: bool = False) -> int:
+    """Jumlah (atau terminate) koneksi klien lain ke database ini"""
+    target = 'pg_terminate_backend(pid)' if terminate else '*'
+    cursor.execute(
+        f'SELECT count({target}) FROM pg_stat_activity '
+        "WHERE datname = current_database() AND pid <> pg_backend_pid() AND backend_type = 'client backend'"
+    )
+    return cursor.fetchone()[0]
+
+
+def run_connection_mode(ctx: dict, database: dict, threads: int, requests: int, kill: bool = False,
+                        only: list = None, using: str = 'default') -> dict:
+    """
+    Jalankan route GET dari beberapa thread (seperti worker gunicorn --threads)
+    dengan satu mode koneksi
+
+    Setiap request diapit close_old_connections() seperti handler WSGI: mode
+    persisten menjalankan health check lalu memakai ulang koneksi thread,
+    mode pool meminjam koneksi dan mengembalikannya di akhir request.
+
+    Args:
+        database: Hasil connection_settings()
+        requests: Request per thread
+        kill: Putuskan semua koneksi server di tengah run (pg_terminate_backend)
+    """
+    routes = [
+        route for route in ROUTES
+        if route.method == 'GET' and not route.slow and (not only or any(p in route.key for p in only))
+    ]
+    backend = load_backend(database['ENGINE'])
+    alias = f'{using}_benchmark'
+    acquired, latencies, statuses = [], [], {}
+    counter = itertools.count()
+    halfway = threading.Event()
+    lock = threading.Lock()
+
+    class Wrapper(backend.DatabaseWrapper):
+        # Waktu connect baru (persisten) atau checkout (pool)
+        def get_new_connection(self, conn_params):
+            start = time.perf_counter()
+            try:
+                return super().get_new_connection(conn_params)
+            finally:
+                acquired.append((time.perf_counter() - start) * 1000)
+
+    def worker(number):
+        # Koneksi thread ini memakai mode yang diukur (alias berbeda: pool terpisah)
+        wrapper = connections[using] = Wrapper(database, alias)
+        clients = make_clients(ctx)
+        close_old_connections()
+        try:
+            for i in range(requests):
+                route = routes[(number + i) % len(routes)]
+                index = next(counter)
+                start = time.perf_counter()
+                close_old_connections()
+                response = clients[route.client].get(
+                    route.path(ctx, index), secure=True, REMOTE_ADDR=_remote_addr(index),
+                )
+                close_old_connections()
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+                if index == threads * requests // 2:
+                    halfway.set()
+        finally:
+            wrapper.close()
+
+    pool_stats, killed, peak = {}, 0, 0
+    workers = [threading.Thread(target=worker, args=(n,), name=f'bench-{n}') for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    try:
+        with connections[using].cursor() as cursor:
+            while any(thread.is_alive() for thread in workers):
+                peak = max(peak, _server_connections(cursor))
+                if kill and halfway.is_set() and not killed:
+                    killed = _server_connections(cursor, terminate=True)
+                time.sleep(0.02)
+        for thread in workers:
+            thread.join()
+        wall = time.perf_counter() - started
+    finally:
+        pool = backend.DatabaseWrapper._connection_pools.pop(alias, None)
+        if pool is not None:
+            pool_stats = pool.get_stats()
+            pool.close()
+
+    return {
+        'engine': database['ENGINE'],
+        'conn_max_age': database['CONN_MAX_AGE'],
+        'pool': database['OPTIONS'].get('pool'),
+        'threads': threads,
+        'requests': len(latencies),
+        'errors': sum(n for status, n in statuses.items() if status.startswith('5')),
+        'status_codes': statuses,
+        'throughput_rps': round(len(latencies) / wall, 2) if wall else 0.0,
+        'latency_ms': latency_summary(latencies),
+        # persisten: connect baru per thread (+ reconnect); pool: setiap checkout
+        'connection_acquire_ms': dict(latency_summary(acquired), count=len(acquired)),
+        'server_connections_peak': peak,
+        'server_connections_opened': pool_stats.get('connections_num', 0) if pool_stats else len(acquired),
+        'server_connections_killed': killed,
+        'pool_wait_ms': pool_stats.get('requests_wait_ms', 0) if pool_stats else None,
+    }
+
+
+def run_connection_benchmark(pool: dict, threads: int = 8, requests: int = 200, kill: bool = False,
+                             courses: int = 200, users: int = 100, comments: int = 1000, seed: int = 42,
+                             using: str = 'default', keepdb: bool = False, only: list = None, log=None) -> dict:
+    """
+    Bandingkan koneksi persisten (setup default) dengan connection pool psycopg3
+    di database benchmark terpisah (hanya PostgreSQL)
+
+    Raises:
+        ValueError: Jika database bukan PostgreSQL
+
+    Returns:
+        dict: Laporan (meta, modes, comparison)
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        raise ValueError('Benchmark connection pool membutuhkan PostgreSQL')
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+    modes = {}
+    try:
+        with isolated_state():
+            ctx, seed_seconds = _seeded_context(courses, users, comments, seed, using, log)
+            for mode, options in (('persistent', None), ('pool', pool)):
+                database = connection_settings(connection.settings_dict, options)
+                modes[mode] = result = run_connection_mode(ctx, database, threads, requests, kill, only, using)
+                if log:
+                    latency = result['latency_ms']
+                    log(f"{mode:<11} p50={latency['p50']:>8.2f}ms p99={latency['p99']:>8.2f}ms "
+                        f"rps={result['throughput_rps']:>8.1f} errors={result['errors']} "
+                        f"koneksi server={result['server_connections_peak']} "
+                        f"dibuka={result['server_connections_opened']}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+    base, pooled = modes['persistent'], modes['pool']
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'dataset': {'courses': courses, 'users': users, 'comments': comments, 'seed': seed},
+            'threads': threads,
+            'requests_per_thread': requests,
+            'kill': kill,
+            'seed_seconds': round(seed_seconds, 2),
+        },
+        'modes': modes,
+        'comparison': {
+            'p50_change_pct': _change(pooled['latency_ms']['p50'], base['latency_ms']['p50']),
+            'p99_change_pct': _change(pooled['latency_ms']['p99'], base['latency_ms']['p99']),
+            'throughput_change_pct': _change(pooled['throughput_rps'], base['throughput_rps']),
+        },
+    }
+
+
+# Memori worker gunicorn (preload)
+
+MEMORY_PATHS = [
+    '/health/live', '/health/ready', '/login/', '/auth/login/', '/auth/register/',
+    '/api/v1/courses', '/api/v1/openapi.json', '/api/v1/docs', '/metrics',
+]
+# Field smaps_rollup (kB) -> nama di laporan
+SMAPS_FIELDS = {'Rss': 'rss', 'Pss': 'pss', 'Private_Clean': 'private_clean', 'Private_Dirty': 'private_dirty'}
+
+
+def process_memory(pid: int) -> dict:
+    """RSS, PSS dan USS (private) satu proses dalam MB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as fh:
+        for line in fh:
+            field, _, rest = line.partition(':')
+            if field in SMAPS_FIELDS:
+                values[SMAPS_FIELDS[field]] = int(rest.split()[0]) / 1024
+    return {
+        'rss_mb': round(values['rss'], 1),
+        'pss_mb': round(values['pss'], 1),
+        'uss_mb': round(values['private_clean'] + values['private_dirty'], 1),
+    }
+
+
+def _child_pids(pid: int) -> list:
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as fh:
+                # Format: pid (comm) state ppid ...; comm bisa mengandung spasi
+                ppid = int(fh.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _fetch(url: str) -> int:
+    request = urllib.request.Request(url, headers={'X-Forwarded-Proto': 'https'})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+
+def run_memory_mode(preload: bool, workers: int, requests: int, paths: list, timeout: float, tmp: str) -> dict:
+    """Jalankan gunicorn, kirim request pemanasan, lalu ukur memori master dan worker"""
+    port = _free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    state = os.path.join(tmp, 'preload' if preload else 'default')
+    env = dict(
+        os.environ, GUNICORN_PRELOAD=str(preload),
+        METRICS_DIR=os.path.join(state, 'metrics'),
+        API_CACHE_LOCATION=os.path.join(state, 'api_cache'),
+        THROTTLE_LOCATION=os.path.join(state, 'throttle.sqlite3'),
+    )
+    command = [
+        sys.executable, '-m', 'gunicorn', 'lms_project.wsgi:application', '--config', os.path.join(str(settings.BASE_DIR), 'gunicorn.conf.py'),
+        '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--log-level', 'warning',
+    ]
+    started = time.perf_counter()
+    server = subprocess.Popen(command, cwd=str(settings.BASE_DIR), env=env, stdout=subprocess.DEVNULL)
+    try:
+        # Siap jika semua worker sudah fork dan liveness menjawab
+        while len(_child_pids(server.pid)) < workers or _fetch(base_url + '/health/live') != 200:
+            if server.poll() is not None:
+                raise RuntimeError(f'gunicorn berhenti dengan exit code {server.returncode}')
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError(f'gunicorn belum siap setelah {timeout}s')
+            time.sleep(0.2)
+        ready_seconds = time.perf_counter() - started
+
+        statuses = {}
+        urls = [base_url + paths[i % len(paths)] for i in range(requests)]
+        # Request paralel agar semua worker ikut menerima request
+        with ThreadPoolExecutor(max_workers=workers * 2) as pool:
+            for status in pool.map(_fetch, urls):
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+        worker_memory = [dict(pid=pid, **process_memory(pid)) for pid in _child_pids(server.pid)]
+        master_memory = process_memory(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+    return {
+        'preload': preload,
+        'ready_seconds': round(ready_seconds, 2),
+        'statuses': statuses,
+        'master': master_memory,
+        'workers': worker_memory,
+        'worker_avg': {
+            field: round(sum(worker[field] for worker in worker_memory) / len(worker_memory), 1)
+            for field in ('rss_mb', 'pss_mb', 'uss_mb')
+        },
+        # PSS membagi halaman bersama secara adil: total memori fisik semua proses
+        'total_pss_mb': round(master_memory['pss_mb'] + sum(worker['pss_mb'] for worker in worker_memory), 1),
+        'total_uss_mb': round(master_memory['uss_mb'] + sum(worker['uss_mb'] for worker in worker_memory), 1),
+    }
+
+
+def run_memory_benchmark(workers: int = 3, requests: int = 300, paths: list = None, timeout: float = 60,
+                         log=None) -> dict:
+    """
+    Bandingkan memori worker gunicorn tanpa dan dengan preload (gc.freeze)
+    terhadap database yang dikonfigurasi (hanya request GET)
+
+    Raises:
+        ValueError: Jika /proc/<pid>/smaps_rollup tidak tersedia (bukan Linux)
+
+    Returns:
+        dict: Laporan (meta, modes, comparison)
+    """
+    if not os.path.exists(f'/proc/{os.getpid()}/smaps_rollup'):
+        raise ValueError('Benchmark memori membutuhkan /proc/<pid>/smaps_rollup (Linux)')
+    paths = paths or MEMORY_PATHS
+    modes = {}
+    with tempfile.TemporaryDirectory(prefix='lms_bench_memory_') as tmp:
+        for mode, preload in (('default', False), ('preload', True)):
+            modes[mode] = result = run_memory_mode(preload, workers, requests, paths, timeout, tmp)
+            if log:
+                avg = result['worker_avg']
+                log(f"{mode:<8} worker rss={avg['rss_mb']:>6.1f}MB pss={avg['pss_mb']:>6.1f}MB "
+                    f"uss={avg['uss_mb']:>6.1f}MB total pss={result['total_pss_mb']:>6.1f}MB "
+                    f"siap={result['ready_seconds']:.2f}s")
+
+    base, preloaded = modes['default'], modes['preload']
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connections['default'].vendor,
+            'workers': workers,
+            'requests': requests,
+            'paths': paths,
+        },
+        'modes': modes,
+        'comparison': {
+            'worker_pss_change_pct': _change(preloaded['worker_avg']['pss_mb'], base['worker_avg']['pss_mb']),
+            'worker_uss_change_pct': _change(preloaded['worker_avg']['uss_mb'], base['worker_avg']['uss_mb']),
+            'total_pss_change_pct': _change(preloaded['total_pss_mb'], base['total_pss_mb']),
+        },
+    }
@@ -0,0 +1,146 @@
+"""
+Response Caching Implementation
+Cache hasil endpoint publik (read-mostly) dengan invalidasi berbasis signal
+
+Key cache = namespace + generasi namespace + path + query params yang
+dinormalisasi. Invalidasi dilakukan dengan menaikkan generasi namespace
+(lihat `invalidate`), sehingga semua entry lama otomatis tidak terpakai.
+"""
+import hashlib
+import inspect
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+CACHE_ALIAS = getattr(settings, 'API_CACHE_ALIAS', 'api')
+CACHE_TIMEOUT = getattr(settings, 'API_CACHE_TIMEOUT', 300)
+KEY_PREFIX = 'apiv1'
+# Dengan read replica, namespace yang baru ditulis dibaca dari primary selama
+# window ini agar data replica yang tertinggal tidak masuk cache (courses.replicas)
+REPLICA_STICKY_SECONDS = getattr(settings, 'REPLICA_STICKY_SECONDS', 5) \
+    if getattr(settings, 'DATABASE_REPLICAS', None) else 0
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _generation_key(namespace: str) -> str:
+    return f'{KEY_PREFIX}:gen:{namespace}'
+
+
+def written_key(namespace: str) -> str:
+    """Key penanda namespace baru saja ditulis (hanya ada selama REPLICA_STICKY_SECONDS)"""
+    return f'{KEY_PREFIX}:written:{namespace}'
+
+
+def get_generation(namespace: str) -> int:
+    """Generasi aktif untuk namespace (dibuat jika belum ada)"""
+    cache = get_cache()
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Nilai awal berbasis waktu agar tidak bentrok dengan generasi yang ter-evict
+        cache.add(key, int(time.time() * 1000), None)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def invalidate(*namespaces: str):
+    """
+    Invalidasi semua response cache untuk namespace tertentu
+
+    Dijalankan setelah transaksi commit agar request lain tidak sempat
+    meng-cache data lama dengan generasi baru.
+    """
+    def bump():
+        cache = get_cache()
+        for namespace in namespaces:
+            # Generasi = waktu tulis terakhir (ms), dipakai juga sebagai
+            # Last-Modified minimum oleh conditional_get (delete / update baris
+            # lama tidak menaikkan MAX(updated_at)). Dua bump yang berbarengan
+            # tetap menghasilkan generasi baru yang lebih besar dari sebelumnya.
+            key = _generation_key(namespace)
+            current = cache.get(key) or 0
+            cache.set(key, max(current + 1, int(time.time() * 1000)), None)
+        if REPLICA_STICKY_SECONDS:
+            cache.set_many({written_key(namespace): 1 for namespace in namespaces}, REPLICA_STICKY_SECONDS)
+
+    transaction.on_commit(bump)
+
+
+def make_cache_key(namespace: str, request, exclude=()) -> str:
+    """
+    Key cache dari route + query params yang diurutkan
+
+    Args:
+        exclude: Nama query param yang tidak ikut key (misal parameter paginasi)
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        if key not in exclude
+        for value in values
+    )
+    raw = f'{request.path}?{params!r}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'{KEY_PREFIX}:{namespace}:{get_generation(namespace)}:{digest}'
+
+
+def cache_response(namespace: str, timeout: int = None):
+    """
+    Decorator untuk meng-cache hasil endpoint GET publik
+
+    Args:
+        namespace: Nama grup data yang di-invalidasi bersama (misal 'courses')
+        timeout: Umur maksimal entry dalam detik (default API_CACHE_TIMEOUT)
+
+    Usage:
+        @apiv1.get("/courses", response=List[CourseSchema])
+        @throttle(max_requests=30, time_window=60)
+        @cache_response('courses')
+        @paginate(CustomPagination)
+        def list_courses(request):
+            ...
+
+    Letakkan di atas `@paginate` agar yang disimpan adalah halaman final, dan
+    di bawah `@throttle` agar rate limit juga berlaku untuk cache hit.
+    Endpoint `async def` didukung (memakai `cache.aget` / `cache.aset`).
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method != 'GET':
+                    return await func(request, *args, **kwargs)
+
+                cache = get_cache()
+                key = await sync_to_async(make_cache_key)(namespace, request)
+                result = await cache.aget(key)
+                if result is None:
+                    result = await func(request, *args, **kwargs)
+                    await cache.aset(key, result, CACHE_TIMEOUT if timeout is None else timeout)
+                return result
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return func(request, *args, **kwargs)
+
+            cache = get_cache()
+            key = make_cache_key(namespace, request)
+            result = cache.get(key)
+            if result is None:
+                result = func(request, *args, **kwargs)
+                cache.set(key, result, CACHE_TIMEOUT if timeout is None else timeout)
+            return result
+
+        return wrapper
+    return decorator
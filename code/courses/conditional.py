@@ -0,0 +1,126 @@
+"""
+Conditional GET Implementation
+ETag / Last-Modified untuk endpoint API, dijawab 304 tanpa serialisasi body
+
+Statistik result set (jumlah baris dan MAX(updated_at)) disimpan di response
+cache per kombinasi filter, tanpa parameter paginasi, sehingga halaman berikutnya
+tidak memicu query agregat lagi sampai data berubah. ETag juga memuat generasi
+cache namespace agar update baris mana pun (yang memanggil `invalidate`) terdeteksi.
+"""
+import hashlib
+import inspect
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .caching import CACHE_TIMEOUT, get_cache, get_generation, make_cache_key
+
+
+# Parameter paginasi tidak mengubah agregat result set: satu COUNT/MAX per filter
+PAGINATION_PARAMS = ('page', 'page_size', 'cursor')
+
+
+def compute_stats(queryset) -> tuple:
+    """(count, last_modified) result set; last_modified berupa UNIX timestamp"""
+    stats = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+    last_modified = stats['last_modified']
+    return stats['count'], last_modified.timestamp() if last_modified else None
+
+
+def make_validators(request, stats: tuple, generation: int) -> tuple:
+    """
+    Hitung (etag, last_modified) untuk satu response
+
+    ETag mencakup path + query params (halaman berbeda = ETag berbeda),
+    statistik result set dan generasi namespace. Generasi adalah waktu
+    invalidate terakhir (ms), jadi last_modified = max(MAX(updated_at),
+    generasi) juga menangkap delete dan update yang tidak mengubah MAX.
+    """
+    count, updated = stats
+    params = sorted((key, value) for key, values in request.GET.lists() for value in values)
+    raw = f'{request.path}?{params!r}|{count}|{updated}|{generation}'
+    etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    return etag, int(max(updated or 0, generation / 1000))
+
+
+def conditional_get(namespace: str, queryset_func):
+    """
+    Decorator ETag / Last-Modified untuk endpoint GET Ninja
+
+    Args:
+        namespace: Namespace response cache (lihat `cache_response`)
+        queryset_func: Fungsi yang mengembalikan result set endpoint; menerima
+            subset dari parameter endpoint (dicocokkan berdasarkan nama)
+
+    Usage:
+        @apiv1.get("/courses/{course_id}", response=CourseSchema)
+        @conditional_get('courses', lambda course_id: Course.objects.filter(id=course_id))
+        @cache_response('courses')
+        def get_course(request, course_id: int):
+            ...
+
+    Letakkan paling luar (tepat di bawah `@apiv1.get`). Response 200 mendapat
+    header ETag/Last-Modified; request dengan If-None-Match / If-Modified-Since
+    yang masih valid dijawab 304 tanpa menjalankan endpoint. Endpoint
+    `async def` didukung; validator dihitung lewat sync_to_async.
+    """
+    accepted = set(inspect.signature(queryset_func).parameters)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def get_validators(request, kwargs) -> tuple:
+            cache = get_cache()
+            key = f'{make_cache_key(namespace, request, exclude=PAGINATION_PARAMS)}:validators'
+            stats = cache.get(key)
+            if stats is None:
+                queryset = queryset_func(**{name: kwargs[name] for name in accepted if name in kwargs})
+                stats = compute_stats(queryset)
+                cache.set(key, stats, CACHE_TIMEOUT)
+            return make_validators(request, stats, get_generation(namespace))
+
+        def check(request, response, validators):
+            etag, last_modified = validators
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+            # Validator juga wajib di 304 (RFC 9110 15.4.5) agar cache bisa memperbarui entry-nya
+            for target in (response, not_modified):
+                if target is None:
+                    continue
+                target['ETag'] = etag
+                target['Last-Modified'] = http_date(last_modified)
+            return not_modified
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(request, *args, response: HttpResponse, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await func(request, *args, **kwargs)
+
+                validators = await sync_to_async(get_validators)(request, kwargs)
+                not_modified = check(request, response, validators)
+                if not_modified is not None:
+                    return not_modified
+                return await func(request, *args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(request, *args, response: HttpResponse, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return func(request, *args, **kwargs)
+
+                not_modified = check(request, response, get_validators(request, kwargs))
+                if not_modified is not None:
+                    return not_modified
+                return func(request, *args, **kwargs)
+
+        # Ninja menyuntikkan temporal response lewat parameter bertipe HttpResponse
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter('response', inspect.Parameter.KEYWORD_ONLY, annotation=HttpResponse),
+        ])
+        return wrapper
+    return decorator
@@ -0,0 +1,89 @@
+"""
+Denormalized Counters
+Kolom jumlah child (enrollment, material, content, member, comment) di parent
+
+Counter di-update dari signal post_save (created) / post_delete dengan
+`UPDATE ... SET x_count = x_count + 1` di dalam transaksi yang sama dengan
+insert (lihat `AtomicSaveModel`) atau delete (Collector). `updated_at` parent
+ikut diperbarui agar ETag/Last-Modified API berubah bersama angkanya.
+
+Pada delete cascade (misal menghapus course beserta content dan komentarnya)
+parent yang ikut terhapus dicatat lewat `mark_deleting()` (signal pre_delete),
+sehingga child-nya tidak mengirim UPDATE counter ke baris yang akan dihapus.
+
+Operasi bulk yang melewati signal membuat counter drift; hitung ulang dengan
+`recount()` (dipanggil oleh `manage.py reconcile_stats`).
+"""
+import weakref
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Comment, Course, CourseContent, CourseMember, Enrollment, Material
+
+
+# Model child -> (model parent, nama FK di child, kolom counter di parent)
+COUNTERS = {
+    Enrollment: (Course, 'course', 'enrollment_count'),
+    Material: (Course, 'course', 'material_count'),
+    CourseContent: (Course, 'course_id', 'content_count'),
+    CourseMember: (Course, 'course', 'member_count'),
+    Comment: (CourseContent, 'content_id', 'comment_count'),
+}
+
+
+# Titik awal delete (instance / QuerySet, kwarg `origin` signal) -> {(model parent, pk)}
+# Entry hilang sendiri saat objek origin dibuang
+_deleting = weakref.WeakKeyDictionary()
+
+
+def mark_deleting(instance, origin):
+    """Catat parent yang ikut dihapus oleh delete dari `origin` (dipanggil di pre_delete)"""
+    if origin is not None:
+        _deleting.setdefault(origin, set()).add((type(instance), instance.pk))
+
+
+def parent_deleting(instance, origin) -> bool:
+    """True jika parent `instance` ikut terhapus dalam delete yang sama"""
+    deleting = _deleting.get(origin) if origin is not None else None
+    if not deleting:
+        return False
+    parent, fk_name, _ = COUNTERS[type(instance)]
+    return (parent, getattr(instance, instance._meta.get_field(fk_name).attname)) in deleting
+
+
+def adjust(instance, delta: int, using: str = 'default'):
+    """Tambah/kurangi counter parent milik `instance` secara atomik"""
+    parent, fk_name, column = COUNTERS[type(instance)]
+    parent_id = getattr(instance, instance._meta.get_field(fk_name).attname)
+    queryset = parent._default_manager.using(using).filter(pk=parent_id)
+    if delta < 0:
+        # Jangan sampai negatif jika counter sudah drift (diperbaiki oleh recount)
+        queryset = queryset.filter(**{f'{column}__gte': -delta})
+    queryset.update(**{
+        column: F(column) + delta,
+        'updated_at': timezone.now(),
+    })
+
+
+def recount(using: str = 'default') -> int:
+    """
+    Hitung ulang semua counter dari tabel child
+
+    Returns:
+        int: Jumlah baris parent yang nilainya berubah
+    """
+    changed = 0
+    for child, (parent, fk_name, column) in COUNTERS.items():
+        actual = Coalesce(Subquery(
+            child._default_manager.using(using)
+            .filter(**{fk_name: OuterRef('pk')})
+            .order_by().values(fk_name).annotate(total=Count('pk')).values('total')
+        ), Value(0))
+        changed += (
+            parent._default_manager.using(using)
+            .annotate(actual=actual).exclude(**{column: F('actual')})
+            .update(**{column: actual})
+        )
+    return changed
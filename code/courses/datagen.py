@@ -0,0 +1,321 @@
+"""
+Synthetic Data Generator
+Membuat data berukuran produksi (user, course, materi, konten, member,
+enrollment, komentar) secara deterministik dari seed
+
+Dipakai oleh `python manage.py setup_demo --scale N`. Satu unit scale:
+USERS_PER_SCALE user, COURSES_PER_SCALE course, dan rata-rata
+ENROLLMENTS_PER_COURSE enrollment per course (distribusi Pareto agar ada
+course yang sangat populer seperti di produksi).
+
+- Primary key dialokasikan di depan (mulai dari MAX(id) + 1) sehingga foreign
+  key bisa dihitung tanpa query balik dan setiap chunk bisa dibuat terpisah
+- Setiap chunk CHUNK_SIZE baris memakai RNG sendiri (seed, tabel, chunk):
+  hasilnya sama berapa pun jumlah worker dan batch size
+- Satu hash password dihitung sekali dan dipakai semua user
+- PostgreSQL: `COPY ... FROM STDIN`; database lain: `bulk_create` per batch
+- Chunk bisa dikerjakan paralel oleh beberapa proses (hanya PostgreSQL;
+  SQLite hanya mengizinkan satu penulis)
+
+Penulisan melewati signal, jadi index FTS, statistik dashboard, counter per
+course dan response cache disinkronkan di akhir.
+"""
+import bisect
+import csv
+import io
+import multiprocessing
+import random
+import time
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connections
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.db.models import Max
+from django.utils import timezone
+
+from .caching import invalidate
+from .counters import recount
+from .models import Comment, Course, CourseContent, CourseMember, Enrollment, Material
+from .search import rebuild_search_index
+from .stats import STAT_MODELS, reconcile
+
+
+SCALE_PASSWORD = 'student123'
+USERS_PER_SCALE = 10000
+COURSES_PER_SCALE = 100
+COMMENTS_PER_SCALE = 50000
+ENROLLMENTS_PER_COURSE = 100
+MATERIALS_PER_COURSE = 5
+CONTENTS_PER_COURSE = 10
+CHUNK_SIZE = 10000
+
+GRADES = ('A', 'A-', 'B+', 'B', 'B-', 'C', None)
+TOPICS = (
+    'Pemrograman', 'Basis Data', 'Jaringan', 'Algoritma', 'Keamanan', 'Statistika',
+    'Machine Learning', 'Cloud', 'Mobile', 'Sistem Operasi', 'Grafika', 'Kalkulus',
+)
+FIRST_NAMES = ('Andi', 'Budi', 'Sari', 'Dewi', 'Rudi', 'Fitri', 'Agus', 'Rina', 'Joko', 'Lestari')
+LAST_NAMES = ('Pratama', 'Santoso', 'Wijaya', 'Permata', 'Hartono', 'Wulandari', 'Saputra', 'Kusuma')
+
+# Urutan tabel mengikuti foreign key: tabel parent dimuat lebih dulu
+TABLES = {
+    'users': (User, ('id', 'username', 'password', 'first_name', 'last_name', 'email',
+                     'is_staff', 'is_superuser', 'is_active', 'date_joined')),
+    'courses': (Course, ('id', 'code', 'name', 'description', 'credits', 'price', 'teacher_id',
+                         'instructor_id', 'created_at', 'updated_at', 'enrollment_count',
+                         'material_count', 'content_count', 'member_count')),
+    'materials': (Material, ('id', 'course_id', 'title', 'content', 'order', 'created_at', 'updated_at')),
+    'contents': (CourseContent, ('id', 'course_id_id', 'name', 'description', 'video_url',
+                                 'file_attachment', 'order', 'created_at', 'updated_at', 'comment_count')),
+    'members': (CourseMember, ('id', 'user_id_id', 'course_id', 'roles', 'joined_at')),
+    'enrollments': (Enrollment, ('id', 'student_id', 'course_id', 'grade', 'enrolled_at')),
+    'comments': (Comment, ('id', 'content_id_id', 'member_id_id', 'comment', 'created_at', 'updated_at')),
+}
+
+
+class ScalePlan:
+    """
+    Ukuran dataset, id awal per tabel dan jumlah member per course
+
+    Dibuat sekali di proses utama lalu dikirim ke setiap worker.
+    """
+
+    def __init__(self, scale: float, seed: int = 42, using: str = 'default'):
+        self.seed = seed
+        self.using = using
+        self.users = max(1, int(USERS_PER_SCALE * scale))
+        self.courses = max(1, int(COURSES_PER_SCALE * scale))
+        self.comments = int(COMMENTS_PER_SCALE * scale)
+        self.prefix = f'scale{seed}_'
+        self.code_prefix = f'X{seed % 1000:03d}'
+        self.password = make_password(SCALE_PASSWORD)
+        self.now = timezone.now()
+        self.base = {
+            name: model._default_manager.using(using).aggregate(top=Max('id'))['top'] or 0
+            for name, (model, _) in TABLES.items()
+        }
+
+        # Jumlah member (= enrollment) per course berdistribusi Pareto
+        rng = random.Random(f'{seed}:plan')
+        cap = min(self.users, ENROLLMENTS_PER_COURSE * 50)
+        self.member_counts = [
+            min(cap, max(1, int(ENROLLMENTS_PER_COURSE * 0.5 * rng.paretovariate(2))))
+            for _ in range(self.courses)
+        ]
+        # Member course c menempati index offsets[c] .. offsets[c + 1] - 1
+        self.member_offsets = [0, *accumulate(self.member_counts)]
+        self.member_starts = [rng.randrange(self.users) for _ in range(self.courses)]
+
+    @property
+    def members(self) -> int:
+        return self.member_offsets[-1]
+
+    def size(self, table: str) -> int:
+        return {
+            'users': self.users,
+            'courses': self.courses,
+            'materials': self.courses * MATERIALS_PER_COURSE,
+            'contents': self.courses * CONTENTS_PER_COURSE,
+            'members': self.members,
+            'enrollments': self.members,
+            'comments': self.comments,
+        }[table]
+
+    def chunks(self, table: str) -> list:
+        total = self.size(table)
+        return [(table, start, min(start + CHUNK_SIZE, total)) for start in range(0, total, CHUNK_SIZE)]
+
+    def course_of_member(self, index: int) -> int:
+        return bisect.bisect_right(self.member_offsets, index) - 1
+
+
+# Generator baris per tabel: (plan, rng, start, stop) -> tuple sesuai kolom TABLES
+
+def _users(plan, rng, start, stop):
+    for i in range(start, stop):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = f'{plan.prefix}{i:07d}'
+        yield (plan.base['users'] + i + 1, username, plan.password, first, last,
+               f'{username}@example.com', False, False, True, plan.now)
+
+
+def _courses(plan, rng, start, stop):
+    for i in range(start, stop):
+        topic = rng.choice(TOPICS)
+        teacher = plan.base['users'] + rng.randrange(plan.users) + 1
+        members = plan.member_counts[i]
+        yield (plan.base['courses'] + i + 1, f'{plan.code_prefix}{i:06x}', f'{topic} {i}',
+               f'Course {topic.lower()} nomor {i} untuk data skala besar',
+               rng.choice((2, 3, 4)), rng.randrange(0, 1000000, 50000), teacher, teacher,
+               plan.now, plan.now, members, MATERIALS_PER_COURSE, CONTENTS_PER_COURSE, members)
+
+
+def _materials(plan, rng, start, stop):
+    for i in range(start, stop):
+        course, order = divmod(i, MATERIALS_PER_COURSE)
+        yield (plan.base['materials'] + i + 1, plan.base['courses'] + course + 1,
+               f'Materi {order + 1}', f'Isi materi {order + 1} course {course}', order + 1, plan.now, plan.now)
+
+
+def _contents(plan, rng, start, stop):
+    for i in range(start, stop):
+        course, order = divmod(i, CONTENTS_PER_COURSE)
+        yield (plan.base['contents'] + i + 1, plan.base['courses'] + course + 1,
+               f'Konten {order + 1}', f'Deskripsi konten {order + 1} course {course}', '', '',
+               order + 1, plan.now, plan.now, 0)
+
+
+def _member_user(plan, course: int, index: int) -> int:
+    # User berurutan dari titik awal acak: unik per course selama count <= users
+    slot = index - plan.member_offsets[course]
+    return plan.base['users'] + (plan.member_starts[course] + slot) % plan.users + 1
+
+
+def _members(plan, rng, start, stop):
+    for i in range(start, stop):
+        course = plan.course_of_member(i)
+        yield (plan.base['members'] + i + 1, _member_user(plan, course, i),
+               plan.base['courses'] + course + 1, 'student', plan.now)
+
+
+def _enrollments(plan, rng, start, stop):
+    for i in range(start, stop):
+        course = plan.course_of_member(i)
+        yield (plan.base['enrollments'] + i + 1, _member_user(plan, course, i),
+               plan.base['courses'] + course + 1, rng.choice(GRADES), plan.now)
+
+
+def _comments(plan, rng, start, stop):
+    for i in range(start, stop):
+        content = rng.randrange(plan.courses * CONTENTS_PER_COURSE)
+        course = content // CONTENTS_PER_COURSE
+        member = plan.member_offsets[course] + rng.randrange(plan.member_counts[course])
+        yield (plan.base['comments'] + i + 1, plan.base['contents'] + content + 1,
+               plan.base['members'] + member + 1, f'Komentar {i} untuk konten {content}', plan.now, plan.now)
+
+
+GENERATORS = {
+    'users': _users,
+    'courses': _courses,
+    'materials': _materials,
+    'contents': _contents,
+    'members': _members,
+    'enrollments': _enrollments,
+    'comments': _comments,
+}
+
+
+# Penulisan
+
+def _copy_rows(connection, model, attnames: tuple, rows: list):
+    """Muat baris lewat COPY (PostgreSQL, psycopg 3 atau psycopg2)"""
+    fields = [model._meta.get_field(name) for name in attnames]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['\\N' if value is None else value for value in row])
+    buffer.seek(0)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    sql = (
+        f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    )
+    with connection.cursor() as cursor:
+        if is_psycopg3:
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+        else:
+            cursor.copy_expert(sql, buffer)
+
+
+def load_chunk(plan: ScalePlan, table: str, start: int, stop: int, batch_size: int) -> int:
+    """Buat dan tulis satu chunk; hasilnya hanya bergantung pada (seed, tabel, start)"""
+    model, attnames = TABLES[table]
+    rng = random.Random(f'{plan.seed}:{table}:{start}')
+    rows = list(GENERATORS[table](plan, rng, start, stop))
+    connection = connections[plan.using]
+    if connection.vendor == 'postgresql':
+        for offset in range(0, len(rows), batch_size):
+            _copy_rows(connection, model, attnames, rows[offset:offset + batch_size])
+    else:
+        model._default_manager.using(plan.using).bulk_create(
+            [model(**dict(zip(attnames, row))) for row in rows], batch_size=batch_size
+        )
+    return len(rows)
+
+
+_worker_state = {}
+
+
+def _init_worker(plan: ScalePlan, batch_size: int):
+    _worker_state.update(plan=plan, batch_size=batch_size)
+
+
+def _run_chunk(chunk: tuple) -> tuple:
+    table, start, stop = chunk
+    return table, load_chunk(_worker_state['plan'], table, start, stop, _worker_state['batch_size'])
+
+
+def generate(plan: ScalePlan, batch_size: int = 5000, workers: int = 1, progress=None) -> dict:
+    """
+    Tulis seluruh dataset sesuai plan
+
+    Args:
+        plan: ScalePlan
+        batch_size: Jumlah baris per bulk_create / COPY
+        workers: Jumlah proses paralel (dipaksa 1 di luar PostgreSQL)
+        progress: Callback (table, rows, seconds) setelah setiap tabel selesai
+
+    Returns:
+        dict: Jumlah baris per tabel
+    """
+    connection = connections[plan.using]
+    if connection.vendor != 'postgresql':
+        workers = 1
+
+    pool = None
+    if workers > 1:
+        # Worker hasil fork tidak boleh memakai koneksi milik proses utama
+        connections.close_all()
+        pool = multiprocessing.get_context('fork').Pool(workers, _init_worker, (plan, batch_size))
+
+    written = {}
+    try:
+        for table in TABLES:
+            started = time.perf_counter()
+            chunks = plan.chunks(table)
+            if pool is not None:
+                # Tabel berikutnya baru dimulai setelah semua chunk parent selesai (foreign key)
+                total = sum(count for _, count in pool.imap_unordered(_run_chunk, chunks))
+            else:
+                total = sum(load_chunk(plan, *chunk, batch_size) for chunk in chunks)
+            written[table] = total
+            if progress:
+                progress(table, total, time.perf_counter() - started)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    finalize(plan.using)
+    return written
+
+
+def finalize(using: str = 'default'):
+    """Sinkronkan sequence, index FTS, statistik, counter dan cache setelah penulisan bulk"""
+    connection = connections[using]
+    models = [model for model, _ in TABLES.values()]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    rebuild_search_index(using=using)
+    for name in STAT_MODELS:
+        reconcile(name, using=using)
+    recount(using=using)
+    invalidate('courses', 'contents', 'comments')
@@ -0,0 +1,202 @@
+"""
+Password Hashing Offload
+Menjalankan hashing dan verifikasi password (PBKDF2) di process pool terbatas
+
+Mode dipilih lewat setting PASSWORD_HASHING_MODE:
+- 'inline': perilaku bawaan Django (`authenticate()` / `create_user()`)
+- 'pool': hashing dijalankan di ProcessPoolExecutor khusus. Jumlah job yang
+  berjalan dibatasi per host (slot file lock, dipakai bersama semua worker
+  gunicorn) dan per proses (antrean). Jika penuh, `HashingPoolBusy` dinaikkan
+  dan API menjawab 503 + Retry-After tanpa menunggu. Request yang diterima
+  tetap menahan worker sync-nya sampai hash selesai (atau timeout); yang
+  dibatasi adalah beban CPU hashing di host, bukan jumlah worker yang terpakai.
+"""
+import fcntl
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+from django.contrib.auth.models import User
+
+
+PASSWORD_HASHING_MODE = getattr(settings, 'PASSWORD_HASHING_MODE', 'inline')
+PASSWORD_HASHER_WORKERS = getattr(settings, 'PASSWORD_HASHER_WORKERS', 1)
+PASSWORD_HASHER_QUEUE_SIZE = getattr(settings, 'PASSWORD_HASHER_QUEUE_SIZE', 4)
+PASSWORD_HASHER_HOST_SLOTS = getattr(settings, 'PASSWORD_HASHER_HOST_SLOTS', 2)
+PASSWORD_HASHER_LOCK_DIR = getattr(settings, 'PASSWORD_HASHER_LOCK_DIR', '/tmp')
+PASSWORD_HASHER_TIMEOUT = getattr(settings, 'PASSWORD_HASHER_TIMEOUT', 10)
+PASSWORD_HASHER_RETRY_AFTER = getattr(settings, 'PASSWORD_HASHER_RETRY_AFTER', 2)
+
+
+class HashingPoolBusy(Exception):
+    """Pool hashing penuh; request sebaiknya diulang setelah `retry_after` detik"""
+
+    def __init__(self, retry_after: int = PASSWORD_HASHER_RETRY_AFTER):
+        super().__init__("Server sedang sibuk memproses login, silakan coba lagi")
+        self.retry_after = retry_after
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_queue_slots = threading.BoundedSemaphore(PASSWORD_HASHER_WORKERS + PASSWORD_HASHER_QUEUE_SIZE)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # Pool dibuat ulang setelah fork (setiap worker gunicorn punya pool sendiri)
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASHER_WORKERS,
+                mp_context=multiprocessing.get_context('fork'),
+            )
+            _executor_pid = os.getpid()
+    return _executor
+
+
+def _acquire_host_slot():
+    """
+    Ambil salah satu slot hashing host-wide (flock non-blocking)
+
+    Returns:
+        Fungsi untuk melepas slot
+
+    Raises:
+        HashingPoolBusy: Jika semua slot sedang dipakai
+    """
+    if not PASSWORD_HASHER_HOST_SLOTS:
+        return lambda: None
+    for index in range(PASSWORD_HASHER_HOST_SLOTS):
+        path = os.path.join(PASSWORD_HASHER_LOCK_DIR, f'lms_hasher_{index}.lock')
+        fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            continue
+
+        def release(fd=fd):
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        return release
+    raise HashingPoolBusy()
+
+
+def _run(func, *args):
+    if not _queue_slots.acquire(blocking=False):
+        raise HashingPoolBusy()
+    try:
+        release_host_slot = _acquire_host_slot()
+    except BaseException:
+        _queue_slots.release()
+        raise
+
+    def release(future=None):
+        release_host_slot()
+        _queue_slots.release()
+
+    try:
+        future = _get_executor().submit(func, *args)
+    except BaseException:
+        release()
+        raise
+    # Slot dilepas saat job selesai, bukan saat request berhenti menunggu: job
+    # yang sudah berjalan di child process tidak bisa dibatalkan dan tetap
+    # memakai CPU setelah timeout
+    future.add_done_callback(release)
+    try:
+        return future.result(timeout=PASSWORD_HASHER_TIMEOUT)
+    except FutureTimeoutError:
+        # Pool kelebihan beban: jawab 503 seperti saat antrean penuh.
+        # cancel() hanya berhasil untuk job yang belum mulai.
+        future.cancel()
+        raise HashingPoolBusy()
+
+
+def hash_password(raw_password: str) -> str:
+    """make_password() di process pool"""
+    return _run(make_password, raw_password)
+
+
+def verify_password(raw_password: str, encoded: str) -> bool:
+    """check_password() di process pool (tanpa upgrade hash)"""
+    return _run(check_password, raw_password, encoded)
+
+
+def _must_update(encoded: str) -> bool:
+    try:
+        return identify_hasher(encoded).must_update(encoded)
+    except ValueError:
+        return False
+
+
+def _login_failed(username: str, request=None):
+    """Kirim `user_login_failed` seperti `authenticate()` (password disensor)"""
+    user_login_failed.send(
+        sender='django.contrib.auth',
+        credentials={'username': username, 'password': '********************'},
+        request=request,
+    )
+
+
+def authenticate_user(username: str, password: str, request=None):
+    """
+    Pengganti `authenticate()` untuk endpoint API
+
+    Login gagal mengirim signal `user_login_failed` di kedua mode.
+
+    Returns:
+        User atau None (username/password salah, atau akun tidak aktif)
+
+    Raises:
+        HashingPoolBusy: Jika mode 'pool' dan pool penuh atau timeout
+    """
+    if PASSWORD_HASHING_MODE != 'pool':
+        return authenticate(request, username=username, password=password)
+
+    try:
+        user = User._default_manager.get_by_natural_key(username)
+    except User.DoesNotExist:
+        # Tetap hitung hash agar waktu respon tidak membocorkan username yang ada
+        hash_password(password)
+        _login_failed(username, request)
+        return None
+
+    if not verify_password(password, user.password):
+        _login_failed(username, request)
+        return None
+
+    if _must_update(user.password):
+        user.password = hash_password(password)
+        user.save(update_fields=['password'])
+
+    if not user.is_active:
+        _login_failed(username, request)
+        return None
+    return user
+
+
+def create_user(username: str, password: str, email: str = '', **extra_fields):
+    """
+    Pengganti `User.objects.create_user()` untuk endpoint registrasi
+
+    Raises:
+        HashingPoolBusy: Jika mode 'pool' dan pool penuh atau timeout
+    """
+    if PASSWORD_HASHING_MODE != 'pool':
+        return User.objects.create_user(username=username, password=password, email=email, **extra_fields)
+
+    user = User(
+        username=User.normalize_username(username),
+        email=User.objects.normalize_email(email),
+        **extra_fields
+    )
+    user.password = hash_password(password)
+    user.save()
+    return user
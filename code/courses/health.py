@@ -1,10 +1,67 @@
+"""
+Health Check Endpoints
+- /health/live: proses hidup (tanpa database), untuk liveness probe
+- /health/ready: database bisa diakses dan semua migration sudah diterapkan;
+  hasil dicache per proses selama HEALTH_READY_CACHE_SECONDS detik
+- /health/: diagnostik lengkap (versi Python, jumlah course, dsb)
+"""
 from django.http import JsonResponse
 from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
 from django.conf import settings
 import sys
+import threading
+import time
+
+
+HEALTH_READY_CACHE_SECONDS = getattr(settings, 'HEALTH_READY_CACHE_SECONDS', 10)
+
+_ready_lock = threading.Lock()
+_ready_result = None
+_ready_expires = 0.0
+
+
+def liveness(request):
+    """Liveness probe: tidak menyentuh database"""
+    return JsonResponse({'status': 'ok'})
+
+
+def _check_ready() -> dict:
+    result = {'status': 'ready', 'database': 'connected'}
+    try:
+        connection.ensure_connection()
+        # Membaca tabel django_migrations saja, tanpa scan tabel data
+        executor = MigrationExecutor(connection)
+        pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    except Exception as e:
+        result.update(status='unavailable', database='error', error=str(e))
+        return result
+    result['pending_migrations'] = [f'{migration.app_label}.{migration.name}' for migration, _ in pending]
+    if pending:
+        result['status'] = 'unavailable'
+    return result
+
+
+def readiness(request):
+    """
+    Readiness probe: 200 jika database dan migration siap, 503 jika tidak
+
+    Hasil pengecekan dicache per proses agar probe yang sering tidak
+    membebani database.
+    """
+    global _ready_result, _ready_expires
+    with _ready_lock:
+        cached = _ready_result is not None and time.monotonic() < _ready_expires
+        if not cached:
+            _ready_result = _check_ready()
+            _ready_result['checked_at'] = time.time()
+            _ready_expires = time.monotonic() + HEALTH_READY_CACHE_SECONDS
+        result = dict(_ready_result, cached=cached)
+    return JsonResponse(result, status=200 if result['status'] == 'ready' else 503)
+
 
 def health_check(request):
-    """Health check endpoint untuk debugging"""
+    """Health check endpoint untuk debugging (diagnostik lengkap, tidak dicache)"""
     status = {
         'status': 'ok',
         'debug': settings.DEBUG,
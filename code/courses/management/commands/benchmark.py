@@ -0,0 +1,65 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from courses.benchmark import compare, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark throughput & latency semua route API dan view HTML (laporan JSON)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=200, help='Jumlah course di dataset')
+        parser.add_argument('--users', type=int, default=100, help='Jumlah user di dataset')
+        parser.add_argument('--comments', type=int, default=1000, help='Jumlah komentar di dataset')
+        parser.add_argument('--iterations', type=int, default=50, help='Request per route')
+        parser.add_argument('--warmup', type=int, default=5, help='Request pemanasan per route (tidak diukur)')
+        parser.add_argument('--seed', type=int, default=42, help='Seed random dataset')
+        parser.add_argument('--only', nargs='*', help='Hanya route yang key-nya mengandung teks ini')
+        parser.add_argument('--output', default='benchmark.json', help='File laporan JSON ("-" untuk stdout)')
+        parser.add_argument('--baseline', help='Laporan JSON sebelumnya untuk dibandingkan')
+        parser.add_argument('--threshold', type=float, default=10.0,
+                            help='Kenaikan p50/p99 (persen) yang dianggap regresi')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit code 1 jika ada regresi')
+        parser.add_argument('--database', default='default', help='Alias database')
+        parser.add_argument('--keepdb', action='store_true', help='Pakai ulang database benchmark')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as fh:
+                    baseline = json.load(fh)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Baseline tidak bisa dibaca: {e}')
+
+        log = self.stderr.write if options['output'] == '-' else self.stdout.write
+        report = run_benchmark(
+            courses=options['courses'], users=options['users'], comments=options['comments'],
+            iterations=options['iterations'], warmup=options['warmup'], seed=options['seed'],
+            using=options['database'], keepdb=options['keepdb'], only=options['only'], log=log,
+        )
+
+        regressions = []
+        if baseline is not None:
+            report['baseline'] = {key: baseline.get('meta', {}).get(key) for key in ('timestamp', 'git_commit')}
+            report['comparison'] = compare(report, baseline, options['threshold'])
+            regressions = [key for key, result in report['comparison'].items() if result['regression']]
+
+        if options['output'] == '-':
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        else:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Laporan benchmark: {options['output']}"))
+
+        if report['uncovered']:
+            log(self.style.WARNING(f"Route belum diukur: {', '.join(report['uncovered'])}"))
+        for key in regressions:
+            result = report['comparison'][key]
+            log(self.style.ERROR(
+                f"Regresi {key}: p50 {result['p50_change_pct']:+}% p99 {result['p99_change_pct']:+}%"
+            ))
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} route mengalami regresi')
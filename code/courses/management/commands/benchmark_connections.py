@@ -0,0 +1,58 @@
+import json
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from courses.benchmark import run_connection_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark koneksi persisten vs connection pool psycopg3 (PostgreSQL, laporan JSON)'
+
+    def add_arguments(self, parser):
+        pool = settings.DB_POOL_OPTIONS
+        parser.add_argument('--threads', type=int, default=8, help='Thread paralel (seperti gunicorn --threads)')
+        parser.add_argument('--requests', type=int, default=200, help='Request per thread per mode')
+        parser.add_argument('--pool-min-size', type=int, default=pool['min_size'], help='min_size pool')
+        parser.add_argument('--pool-max-size', type=int, default=pool['max_size'], help='max_size pool')
+        parser.add_argument('--pool-timeout', type=float, default=pool['timeout'],
+                            help='Detik menunggu koneksi saat pool penuh')
+        parser.add_argument('--kill', action='store_true',
+                            help='Putuskan semua koneksi server di tengah setiap run (simulasi koneksi rusak)')
+        parser.add_argument('--courses', type=int, default=200, help='Jumlah course di dataset')
+        parser.add_argument('--users', type=int, default=100, help='Jumlah user di dataset')
+        parser.add_argument('--comments', type=int, default=1000, help='Jumlah komentar di dataset')
+        parser.add_argument('--seed', type=int, default=42, help='Seed random dataset')
+        parser.add_argument('--only', nargs='*', help='Hanya route yang key-nya mengandung teks ini')
+        parser.add_argument('--output', default='benchmark_connections.json',
+                            help='File laporan JSON ("-" untuk stdout)')
+        parser.add_argument('--database', default='default', help='Alias database')
+        parser.add_argument('--keepdb', action='store_true', help='Pakai ulang database benchmark')
+
+    def handle(self, *args, **options):
+        pool = dict(
+            settings.DB_POOL_OPTIONS, min_size=options['pool_min_size'],
+            max_size=options['pool_max_size'], timeout=options['pool_timeout'],
+        )
+        log = self.stderr.write if options['output'] == '-' else self.stdout.write
+        try:
+            report = run_connection_benchmark(
+                pool, threads=options['threads'], requests=options['requests'], kill=options['kill'],
+                courses=options['courses'], users=options['users'], comments=options['comments'],
+                seed=options['seed'], using=options['database'], keepdb=options['keepdb'],
+                only=options['only'], log=log,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['output'] == '-':
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        else:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Laporan benchmark: {options['output']}"))
+
+        comparison = report['comparison']
+        log(f"Pool vs persisten: p50 {comparison['p50_change_pct']:+}% p99 {comparison['p99_change_pct']:+}% "
+            f"throughput {comparison['throughput_change_pct']:+}%")
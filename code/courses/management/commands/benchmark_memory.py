@@ -0,0 +1,38 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from courses.benchmark import MEMORY_PATHS, run_memory_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark memori worker gunicorn tanpa vs dengan preload (RSS/PSS/USS, laporan JSON)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=3, help='Jumlah worker gunicorn (seperti start.sh)')
+        parser.add_argument('--requests', type=int, default=300, help='Request pemanasan per mode')
+        parser.add_argument('--paths', nargs='+', default=MEMORY_PATHS, help='Path GET untuk pemanasan')
+        parser.add_argument('--timeout', type=float, default=60, help='Detik menunggu gunicorn siap')
+        parser.add_argument('--output', default='benchmark_memory.json', help='File laporan JSON ("-" untuk stdout)')
+
+    def handle(self, *args, **options):
+        log = self.stderr.write if options['output'] == '-' else self.stdout.write
+        try:
+            report = run_memory_benchmark(
+                workers=options['workers'], requests=options['requests'], paths=options['paths'],
+                timeout=options['timeout'], log=log,
+            )
+        except (ValueError, RuntimeError) as e:
+            raise CommandError(str(e))
+
+        if options['output'] == '-':
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        else:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Laporan benchmark: {options['output']}"))
+
+        comparison = report['comparison']
+        log(f"Preload vs default: PSS per worker {comparison['worker_pss_change_pct']:+}% "
+            f"USS per worker {comparison['worker_uss_change_pct']:+}% total PSS {comparison['total_pss_change_pct']:+}%")
@@ -0,0 +1,38 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from courses.startup import STEPS, boot
+
+
+class Command(BaseCommand):
+    help = 'Langkah startup (migrate, collectstatic, setup_demo) yang dilewati jika tidak ada perubahan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--steps', nargs='+', choices=STEPS, default=list(STEPS),
+                            help='Langkah yang dijalankan (default semua)')
+        parser.add_argument('--force', action='store_true', help='Jalankan walau fingerprint tidak berubah')
+        parser.add_argument('--database', default='default', help='Alias database')
+        parser.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        results = boot(options['steps'], force=options['force'], using=options['database'])
+        total = time.perf_counter() - started
+
+        if options['json']:
+            self.stdout.write(json.dumps({'steps': results, 'seconds': round(total, 3)}, indent=2))
+        else:
+            for step, result in results.items():
+                if result['status'] == 'failed':
+                    self.stdout.write(self.style.ERROR(f"❌ {step}: {result['error']}"))
+                    continue
+                style = self.style.SUCCESS if result['status'] == 'ran' else self.style.WARNING
+                self.stdout.write(style(f"{step:<8} {result['status']:<8} {result['seconds']:.2f}s"))
+                if result.get('output') and options['verbosity'] > 1:
+                    self.stdout.write(result['output'])
+            self.stdout.write(self.style.SUCCESS(f'✅ Startup selesai dalam {total:.2f}s'))
+
+        # Migrate gagal: exit code 1 agar start.sh mengulang (langkah lain tidak fatal)
+        if results.get('migrate', {}).get('status') == 'failed':
+            raise CommandError('migrate gagal')
@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from courses.advisor import analyze, build_context
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN query di balik setiap route GET dan laporkan sequential scan pada tabel besar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help='User untuk route yang butuh login (default: superuser pertama)')
+        parser.add_argument('--min-rows', type=int, default=1000,
+                            help='Abaikan sequential scan pada tabel dengan baris lebih sedikit')
+        parser.add_argument('--sorts', action='store_true', help='Laporkan juga sort yang tidak memakai index')
+        parser.add_argument('--only', action='append', help='Hanya route yang mengandung string ini (boleh berulang)')
+        parser.add_argument('--json', action='store_true', help='Cetak laporan sebagai JSON')
+        parser.add_argument('--fail-on-seqscan', action='store_true',
+                            help='Exit non-zero jika ada sequential scan (untuk CI)')
+
+    def handle(self, *args, **options):
+        try:
+            ctx = build_context(options['username'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        def log(key, result):
+            if options['json']:
+                return
+            if not result['issues']:
+                self.stdout.write(f"   {key:<45} {result['status']}  {result['queries']} queries  OK")
+                return
+            self.stdout.write(self.style.WARNING(f"⚠️  {key:<45} {result['status']}  {result['queries']} queries"))
+            for issue in result['issues']:
+                target = f"{issue['table']} (~{issue['rows']:,} rows)" if issue['table'] else ''
+                self.stdout.write(f"      {issue['kind']}: {target} {issue['plan']}")
+                self.stdout.write(f"      {issue['sql'][:300]}")
+
+        report = analyze(ctx, min_rows=options['min_rows'], sorts=options['sorts'], only=options['only'], log=log)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+
+        scans = sum(1 for result in report.values() for issue in result['issues'] if issue['kind'] == 'seq_scan')
+        routes = sum(1 for result in report.values() if result['issues'])
+        summary = f'{len(report)} route(s) diperiksa, {routes} dengan temuan, {scans} sequential scan'
+        if scans and options['fail_on_seqscan']:
+            raise CommandError(summary)
+        self.stderr.write(self.style.WARNING(summary) if routes else self.style.SUCCESS(summary))
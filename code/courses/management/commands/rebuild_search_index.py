@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from courses.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang index full-text search (FTS5 di SQLite)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Alias database')
+
+    def handle(self, *args, **options):
+        rebuild_search_index(using=options['database'])
+        self.stdout.write(self.style.SUCCESS('✅ Search index rebuilt'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from courses.counters import recount
+from courses.stats import STAT_MODELS, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Hitung ulang counter statistik dashboard dan counter per course/content'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Alias database')
+
+    def handle(self, *args, **options):
+        for name in STAT_MODELS:
+            previous, value = reconcile(name, using=options['database'])
+            if previous == value:
+                self.stdout.write(f'   {name}: {value}')
+            else:
+                self.stdout.write(self.style.WARNING(f'   {name}: {previous} -> {value}'))
+        changed = recount(using=options['database'])
+        self.stdout.write(f'   per-course/content counters fixed: {changed} row(s)')
+        self.stdout.write(self.style.SUCCESS('✅ Statistics reconciled'))
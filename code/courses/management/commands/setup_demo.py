@@ -1,12 +1,27 @@
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
+from courses.datagen import SCALE_PASSWORD, ScalePlan, generate
 from courses.models import Course, Material, Enrollment, CourseMember, CourseContent, Comment
 
 
 class Command(BaseCommand):
-    help = 'Setup demo data untuk SimpleLMS'
+    help = 'Setup demo data untuk SimpleLMS (--scale N untuk data sintetis berukuran produksi)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0,
+                            help='Buat data sintetis: N x (10.000 user, 100 course, 50.000 komentar)')
+        parser.add_argument('--seed', type=int, default=42, help='Seed random (data sama untuk seed sama)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Baris per bulk_create / COPY')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Jumlah proses paralel (hanya PostgreSQL)')
+        parser.add_argument('--database', default='default', help='Alias database')
 
     def handle(self, *args, **options):
+        if options['scale'] > 0:
+            return self.handle_scale(options)
+
         self.stdout.write(self.style.WARNING('Setting up demo data...\n'))
 
         # Create superuser admin
@@ -255,3 +270,28 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING('  Username: mahasiswa_andi / mahasiswa_sari / etc'))
         self.stdout.write(self.style.WARNING('  Password: student123'))
         self.stdout.write(self.style.SUCCESS('='*60))
+
+    def handle_scale(self, options):
+        plan = ScalePlan(options['scale'], seed=options['seed'], using=options['database'])
+        if User.objects.using(plan.using).filter(username__startswith=plan.prefix).exists() or \
+                Course.objects.using(plan.using).filter(code__startswith=plan.code_prefix).exists():
+            raise CommandError(f'Data scale untuk seed {plan.seed} sudah ada; gunakan --seed lain')
+
+        self.stdout.write(self.style.WARNING(
+            f'Generating scale {options["scale"]:g} (seed {plan.seed}): {plan.users:,} users, '
+            f'{plan.courses:,} courses, {plan.members:,} enrollments, {plan.comments:,} comments...\n'
+        ))
+
+        def progress(table, rows, seconds):
+            rate = rows / seconds if seconds else 0
+            self.stdout.write(self.style.SUCCESS(f'✅ {table}: {rows:,} rows in {seconds:.1f}s ({rate:,.0f} rows/s)'))
+
+        started = time.perf_counter()
+        generate(plan, batch_size=options['batch_size'], workers=options['workers'], progress=progress)
+
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        self.stdout.write(self.style.SUCCESS(f'Scale data completed in {time.perf_counter() - started:.1f}s\n'))
+        self.stdout.write(self.style.WARNING('Generated User Credentials:'))
+        self.stdout.write(self.style.WARNING(f'  Username: {plan.prefix}0000000 / {plan.prefix}0000001 / etc'))
+        self.stdout.write(self.style.WARNING(f'  Password: {SCALE_PASSWORD}'))
+        self.stdout.write(self.style.SUCCESS('='*60))
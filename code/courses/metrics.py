@@ -0,0 +1,299 @@
+"""
+Request Metrics
+Counter, gauge dan histogram latency per route, diekspor dalam format teks Prometheus
+
+Label `route` = `resolver_match.view_name`, yaitu nama URL untuk view Django
+dan nama operation untuk endpoint Ninja (misal 'api-1.0.0:list_courses').
+
+Setiap proses (worker gunicorn) mengumpulkan metric di memori; background
+thread menulisnya setiap METRICS_FLUSH_INTERVAL detik ke file
+`<METRICS_DIR>/<pid>-<id>.json`.
+Endpoint `/metrics` menjumlahkan semua file, sehingga hasilnya agregat seluruh
+worker di host. File worker yang sudah mati tetap dijumlahkan agar counter
+tidak turun; direktori dibersihkan oleh start.sh sebelum server dijalankan.
+Gauge (nilai saat ini, misal ukuran connection pool) hanya dijumlahkan dari
+proses yang masih hidup. Metric yang dibaca dari sumber lain didaftarkan lewat
+`register_collector` dan diperbarui setiap flush.
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+from .middleware import current_query_stats
+
+
+METRICS_DIR = getattr(settings, 'METRICS_DIR', '/tmp/lms_metrics')
+METRICS_FLUSH_INTERVAL = getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0)
+METRICS_TOKEN = getattr(settings, 'METRICS_TOKEN', '')
+METRICS_PUBLIC = getattr(settings, 'METRICS_PUBLIC', settings.DEBUG)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Checkout dari pool umumnya di bawah 1 ms; bucket atas untuk menunggu pool penuh
+CHECKOUT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# nama metric -> (tipe, deskripsi)
+METRICS = {
+    'lms_http_requests_total': ('counter', 'Jumlah request HTTP per route, method dan status'),
+    'lms_http_request_duration_seconds': ('histogram', 'Latency request HTTP per route'),
+    'lms_db_queries_total': ('counter', 'Jumlah query SQL per route'),
+    'lms_db_query_duration_seconds_total': ('counter', 'Total waktu query SQL per route'),
+    'lms_throttle_rejections_total': ('counter', 'Request yang ditolak rate limiter per route'),
+    'lms_session_saves_total': ('counter', 'Penyimpanan session: written (cache + database) atau skipped'),
+    'lms_db_pool_size': ('gauge', 'Koneksi di connection pool (dipakai + idle) per alias database'),
+    'lms_db_pool_available': ('gauge', 'Koneksi idle di connection pool'),
+    'lms_db_pool_requests_waiting': ('gauge', 'Checkout yang sedang menunggu koneksi pool'),
+    'lms_db_pool_requests_total': ('counter', 'Jumlah checkout koneksi dari pool'),
+    'lms_db_pool_wait_seconds_total': ('counter', 'Total waktu checkout menunggu pool yang penuh'),
+    'lms_db_pool_errors_total': ('counter', 'Checkout pool yang gagal (timeout atau error)'),
+    'lms_db_pool_connections_total': ('counter', 'Koneksi server baru yang dibuka pool'),
+    'lms_db_pool_connections_lost_total': ('counter', 'Koneksi pool rusak yang dibuang saat health check'),
+    'lms_db_pool_checkout_seconds': ('histogram', 'Latency checkout koneksi dari pool (termasuk health check)'),
+}
+
+BUCKETS = {
+    'lms_db_pool_checkout_seconds': CHECKOUT_BUCKETS,
+}
+
+# Fungsi (store) yang dipanggil sebelum setiap flush
+COLLECTORS = []
+
+
+def register_collector(collector):
+    """Daftarkan fungsi pengisi metric dari sumber lain (misal statistik pool)"""
+    if collector not in COLLECTORS:
+        COLLECTORS.append(collector)
+
+
+class MetricsStore:
+    """Metric satu proses; di-flush ke file JSON miliknya sendiri"""
+
+    def __init__(self, directory: str = METRICS_DIR):
+        self.directory = directory
+        self.pid = os.getpid()
+        self.path = os.path.join(directory, f'{self.pid}-{uuid.uuid4().hex[:8]}.json')
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+
+    def inc(self, name: str, labels: tuple, amount: float = 1):
+        with self.lock:
+            key = (name, labels)
+            self.counters[key] = self.counters.get(key, 0) + amount
+            self.dirty = True
+
+    def set_gauge(self, name: str, labels: tuple, value: float):
+        with self.lock:
+            key = (name, labels)
+            if self.gauges.get(key) != value:
+                self.gauges[key] = value
+                self.dirty = True
+
+    def observe(self, name: str, labels: tuple, value: float):
+        bounds = BUCKETS.get(name, LATENCY_BUCKETS)
+        with self.lock:
+            key = (name, labels)
+            entry = self.histograms.get(key)
+            if entry is None:
+                # [jumlah per bucket (non-kumulatif, + bucket +Inf), sum, count]
+                entry = self.histograms[key] = [[0] * (len(bounds) + 1), 0.0, 0]
+            index = next((i for i, bound in enumerate(bounds) if value <= bound), len(bounds))
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+            self.dirty = True
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            self.dirty = False
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in self.gauges.items()],
+                'histograms': [
+                    [name, list(labels), list(buckets), total, count]
+                    for (name, labels), (buckets, total, count) in self.histograms.items()
+                ],
+            }
+
+    def flush(self, force: bool = False):
+        for collector in COLLECTORS:
+            collector(self)
+        if not (force or self.dirty):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # Tulis ke file sementara lalu rename agar pembaca tidak melihat file setengah jadi
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(tmp, self.path)
+
+    def start(self):
+        """Flush di background thread agar request tidak menulis file"""
+        def loop():
+            while True:
+                time.sleep(METRICS_FLUSH_INTERVAL)
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+        threading.Thread(target=loop, name='metrics-flush', daemon=True).start()
+        atexit.register(self.flush, True)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> MetricsStore:
+    """Store proses ini (dibuat ulang setelah fork)"""
+    global _store
+    if _store is None or _store.pid != os.getpid():
+        with _store_lock:
+            if _store is None or _store.pid != os.getpid():
+                _store = MetricsStore()
+                _store.start()
+    return _store
+
+
+def route_name(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match and match.view_name else 'unmatched'
+
+
+def record_throttle_rejection(request):
+    """Dipanggil oleh decorator throttle saat request ditolak"""
+    get_store().inc('lms_throttle_rejections_total', (('route', route_name(request)),))
+
+
+def _record(request, response, elapsed: float):
+    store = get_store()
+    route = route_name(request)
+    store.inc('lms_http_requests_total', (
+        ('route', route), ('method', request.method), ('status', str(response.status_code)),
+    ))
+    store.observe('lms_http_request_duration_seconds', (('route', route),), elapsed)
+    stats = current_query_stats()
+    if stats is not None:
+        store.inc('lms_db_queries_total', (('route', route),), stats.count)
+        store.inc('lms_db_query_duration_seconds_total', (('route', route),), stats.duration)
+    return response
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Middleware pencatat metric request
+
+    Pasang tepat setelah `query_count_middleware` agar waktu DB per request
+    (termasuk query session/auth) bisa dibaca dari QueryStats.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            start = time.perf_counter()
+            response = await get_response(request)
+            return _record(request, response, time.perf_counter() - start)
+    else:
+        def middleware(request):
+            start = time.perf_counter()
+            response = get_response(request)
+            return _record(request, response, time.perf_counter() - start)
+
+    return middleware
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect(directory: str = METRICS_DIR) -> tuple:
+    """Jumlahkan metric dari file semua proses (gauge hanya dari proses yang hidup)"""
+    counters, histograms, gauges = {}, {}, {}
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        try:
+            with open(path) as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in data['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, buckets, total, count in data['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            entry = histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+            entry[0] = [a + b for a, b in zip(entry[0], buckets)]
+            entry[1] += total
+            entry[2] += count
+        pid = os.path.basename(path).split('-', 1)[0]
+        if pid.isdigit() and _alive(int(pid)):
+            for name, labels, value in data.get('gauges', ()):
+                key = (name, tuple(map(tuple, labels)))
+                gauges[key] = gauges.get(key, 0) + value
+    return counters, histograms, gauges
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def render(counters: dict, histograms: dict, gauges: dict = None) -> str:
+    """Format teks Prometheus (exposition format 0.0.4)"""
+    lines = []
+    for name, (kind, description) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind in ('counter', 'gauge'):
+            values = counters if kind == 'counter' else gauges or {}
+            for (metric, labels), value in sorted(values.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+            continue
+        for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, observed in zip((*BUCKETS.get(name, LATENCY_BUCKETS), '+Inf'), buckets):
+                cumulative += observed
+                lines.append(f'{name}_bucket{_format_labels((*labels, ("le", bound)))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    Endpoint /metrics (Prometheus)
+
+    Dengan METRICS_TOKEN wajib `Authorization: Bearer <METRICS_TOKEN>`. Tanpa
+    token endpoint ditolak (403) kecuali METRICS_PUBLIC (default: DEBUG).
+    """
+    if METRICS_TOKEN:
+        if request.headers.get('Authorization') != f'Bearer {METRICS_TOKEN}':
+            return HttpResponse(status=401)
+    elif not METRICS_PUBLIC:
+        return HttpResponse('Set METRICS_TOKEN untuk mengakses /metrics', status=403)
+    store = get_store()
+    store.flush(force=True)
+    return HttpResponse(render(*collect(store.directory)), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,231 @@
+"""
+Query Inspector Middleware
+Mencatat jumlah dan durasi query SQL per request, mendeteksi pola N+1
+
+Setiap query dicatat lewat execute wrapper yang dipasang di setiap koneksi
+database (signal `connection_created`, lihat courses.signals). Statistik
+disimpan di contextvar sehingga query dari `sync_to_async` (view async) ikut
+terhitung ke request yang benar.
+
+Per request:
+- Header `X-Query-Count`, `X-Query-Time` (ms) dan `Server-Timing`
+- Log JSON ke logger `courses.queries` (WARNING jika ada pelanggaran)
+- Pelanggaran: jumlah query melebihi budget view (QUERY_BUDGETS /
+  QUERY_BUDGET_DEFAULT) atau satu bentuk query yang sama diulang
+  >= QUERY_DUPLICATE_THRESHOLD kali (indikasi N+1)
+- Jika QUERY_BUDGET_RAISE aktif (hanya default saat `manage.py test`; di luar
+  test pelanggaran cukup di-log), pelanggaran menaikkan `QueryBudgetExceeded`
+  agar regresi gagal di test
+- Jika TEMPLATE_TIMING aktif (default saat DEBUG): total waktu render di header
+  `X-Template-Time` dan `Server-Timing`, rincian per template dan per block
+  (`template#block`, tanpa waktu template/block anak, termasuk query lazy yang
+  dievaluasi saat render) di field `templates` log JSON
+"""
+import contextvars
+import json
+import logging
+import time
+from collections import Counter
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.template.base import Template
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, BlockNode
+from django.utils.decorators import sync_and_async_middleware
+
+
+logger = logging.getLogger('courses.queries')
+
+QUERY_BUDGET_DEFAULT = getattr(settings, 'QUERY_BUDGET_DEFAULT', 30)
+QUERY_BUDGETS = getattr(settings, 'QUERY_BUDGETS', {})
+QUERY_DUPLICATE_THRESHOLD = getattr(settings, 'QUERY_DUPLICATE_THRESHOLD', 5)
+QUERY_BUDGET_RAISE = getattr(settings, 'QUERY_BUDGET_RAISE', False)
+TEMPLATE_TIMING = getattr(settings, 'TEMPLATE_TIMING', settings.DEBUG)
+
+_current = contextvars.ContextVar('query_stats', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Request melebihi budget query atau mengandung pola N+1"""
+
+
+class QueryStats:
+    """Kumpulan query satu request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        # Waktu render: total template teratas dan self time per nama template
+        self.render = 0.0
+        self.templates = Counter()
+        self.render_stack = []
+
+    def add(self, sql: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        # SQL masih berupa template (%s), jadi query yang sama dengan parameter berbeda = satu bentuk
+        self.shapes[sql] += 1
+
+    def duplicates(self, threshold: int) -> list:
+        return [(sql, n) for sql, n in self.shapes.most_common() if n >= threshold]
+
+
+def current_query_stats():
+    """QueryStats request yang sedang berjalan (None di luar request)"""
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper: catat query ke statistik request aktif (jika ada)"""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add(sql, time.perf_counter() - start)
+
+
+def _template_label(template, context) -> str:
+    return template.name or '<string>'
+
+
+def _block_label(node, context) -> str:
+    # Block yang dirender adalah override terakhir (template anak), bukan node di parent
+    block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
+    block = (block_context.get_block(node.name) if block_context else None) or node
+    return f"{block.origin.template_name or '<string>'}#{node.name}"
+
+
+def record_render(render, label):
+    """
+    Bungkus `Template._render` atau `BlockNode.render`: self time per label
+    (waktu template/block anak tidak ikut dihitung)
+    """
+    @wraps(render)
+    def wrapper(obj, context):
+        stats = _current.get()
+        if stats is None:
+            return render(obj, context)
+        stack = stats.render_stack
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return render(obj, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            stats.templates[label(obj, context)] += elapsed - children
+            if stack:
+                stack[-1] += elapsed
+            else:
+                stats.render += elapsed
+
+    wrapper.records_render = True
+    return wrapper
+
+
+def install_template_timing():
+    """Pasang `record_render` sekali per proses (template, parent extends, include dan block)"""
+    if not getattr(Template._render, 'records_render', False):
+        Template._render = record_render(Template._render, _template_label)
+    if not getattr(BlockNode.render, 'records_render', False):
+        BlockNode.render = record_render(BlockNode.render, _block_label)
+
+
+def install_recorder(connection, **kwargs):
+    """Receiver `connection_created`: pasang `record_query` sekali per koneksi"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _view_name(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else ''
+
+
+def _report(request, response, stats: QueryStats, elapsed: float):
+    view = _view_name(request)
+    budget = QUERY_BUDGETS.get(view, QUERY_BUDGET_DEFAULT)
+    duplicates = stats.duplicates(QUERY_DUPLICATE_THRESHOLD)
+
+    db_ms = stats.duration * 1000
+    response['X-Query-Count'] = str(stats.count)
+    response['X-Query-Time'] = f'{db_ms:.1f}'
+    response['Server-Timing'] = f'db;dur={db_ms:.1f};desc="{stats.count} queries"'
+    if stats.templates:
+        render_ms = stats.render * 1000
+        response['X-Template-Time'] = f'{render_ms:.1f}'
+        response['Server-Timing'] += f', tpl;dur={render_ms:.1f};desc="templates"'
+
+    violations = []
+    if budget is not None and stats.count > budget:
+        violations.append(f'{stats.count} queries > budget {budget}')
+    for sql, repeated in duplicates:
+        violations.append(f'N+1: {repeated}x {sql[:200]}')
+    # Request normal hanya dicatat di level DEBUG: lewati serialisasi jika tidak dipakai
+    if not violations and not logger.isEnabledFor(logging.DEBUG):
+        return response
+
+    record = {
+        'event': 'request_queries',
+        'method': request.method,
+        'path': request.path,
+        'view': view,
+        'status': response.status_code,
+        'queries': stats.count,
+        'db_ms': round(db_ms, 2),
+        'total_ms': round(elapsed * 1000, 2),
+        'budget': budget,
+        'duplicates': [{'sql': sql[:200], 'count': repeated} for sql, repeated in duplicates],
+    }
+    if stats.templates:
+        record['render_ms'] = round(stats.render * 1000, 2)
+        record['templates'] = {name: round(seconds * 1000, 2) for name, seconds in stats.templates.most_common()}
+    if not violations:
+        logger.debug(json.dumps(record))
+        return response
+
+    logger.warning(json.dumps(record))
+    if QUERY_BUDGET_RAISE:
+        raise QueryBudgetExceeded(f'{request.method} {request.path} ({view}): ' + '; '.join(violations))
+    return response
+
+
+@sync_and_async_middleware
+def query_count_middleware(get_response):
+    """
+    Middleware pencatat query per request
+
+    Pasang di awal MIDDLEWARE agar query dari middleware lain (session,
+    auth) ikut terhitung. Budget per view diatur di QUERY_BUDGETS dengan key
+    `resolver_match.view_name` (misal 'home' atau 'api-1.0.0:list_courses').
+    """
+    if TEMPLATE_TIMING:
+        install_template_timing()
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            stats = QueryStats()
+            token = _current.set(stats)
+            start = time.perf_counter()
+            try:
+                response = await get_response(request)
+            finally:
+                _current.reset(token)
+            return _report(request, response, stats, time.perf_counter() - start)
+    else:
+        def middleware(request):
+            stats = QueryStats()
+            token = _current.set(stats)
+            start = time.perf_counter()
+            try:
+                response = get_response(request)
+            finally:
+                _current.reset(token)
+            return _report(request, response, stats, time.perf_counter() - start)
+
+    return middleware
@@ -0,0 +1,62 @@
+"""
+Full-text search index untuk Course dan CourseContent.
+
+PostgreSQL: kolom `search_vector` (tsvector, GENERATED ... STORED) + GIN index,
+sehingga selalu ter-update oleh database pada setiap INSERT/UPDATE.
+SQLite: tabel virtual FTS5 `<table>_fts` yang dipelihara oleh signal di
+`courses.signals` (lihat `courses.search`).
+"""
+from django.db import migrations
+
+
+SEARCH_TABLES = {
+    'courses_course': (('code', 'A'), ('name', 'A'), ('description', 'B')),
+    'courses_coursecontent': (('name', 'A'), ('description', 'B')),
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, fields in SEARCH_TABLES.items():
+        if vendor == 'postgresql':
+            vector = ' || '.join(
+                f"setweight(to_tsvector('simple', coalesce(\"{name}\", '')), '{weight}')"
+                for name, weight in fields
+            )
+            schema_editor.execute(
+                f'ALTER TABLE "{table}" ADD COLUMN "search_vector" tsvector '
+                f'GENERATED ALWAYS AS ({vector}) STORED'
+            )
+            schema_editor.execute(
+                f'CREATE INDEX "{table}_search_vector_gin" ON "{table}" USING gin ("search_vector")'
+            )
+        elif vendor == 'sqlite':
+            columns = ', '.join(name for name, _ in fields)
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE \"{table}_fts\" USING fts5({columns}, "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            schema_editor.execute(
+                f'INSERT INTO "{table}_fts"(rowid, {columns}) SELECT id, {columns} FROM "{table}"'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table in SEARCH_TABLES:
+        if vendor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_search_vector_gin"')
+            schema_editor.execute(f'ALTER TABLE "{table}" DROP COLUMN IF EXISTS "search_vector"')
+        elif vendor == 'sqlite':
+            schema_editor.execute(f'DROP TABLE IF EXISTS "{table}_fts"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_price_course_teacher_alter_course_instructor_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
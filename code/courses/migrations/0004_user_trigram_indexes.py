@@ -0,0 +1,46 @@
+"""
+Trigram (pg_trgm) GIN index untuk pencarian substring user.
+
+Lookup `icontains` di PostgreSQL dikompilasi menjadi
+`UPPER("kolom"::text) LIKE UPPER('%...%')`, sehingga index dibuat pada
+ekspresi yang sama agar bisa dipakai planner tanpa mengubah semantik query
+(`list_users` dan filter `student__username__icontains` di `enrollment_list`).
+Database selain PostgreSQL dilewati.
+"""
+from django.conf import settings
+from django.db import migrations
+
+
+TRIGRAM_COLUMNS = ('username', 'first_name', 'last_name', 'email')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{table}_{column}_upper_trgm" '
+            f'ON "{table}" USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_{column}_upper_trgm"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_fulltext_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
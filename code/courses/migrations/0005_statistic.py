@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+STAT_MODELS = {
+    'total_courses': 'Course',
+    'total_enrollments': 'Enrollment',
+    'total_materials': 'Material',
+}
+
+
+def seed_statistics(apps, schema_editor):
+    """Isi counter awal dari data yang sudah ada"""
+    using = schema_editor.connection.alias
+    Statistic = apps.get_model('courses', 'Statistic')
+    for name, model_name in STAT_MODELS.items():
+        value = apps.get_model('courses', model_name).objects.using(using).count()
+        Statistic.objects.using(using).update_or_create(name=name, defaults={'value': value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_user_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Statistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Nama statistik', max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0, help_text='Nilai statistik')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistic',
+                'verbose_name_plural': 'Statistics',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(seed_statistics, migrations.RunPython.noop),
+    ]
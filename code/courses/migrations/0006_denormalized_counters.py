@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+# (model child, FK di child, model parent, kolom counter)
+COUNTERS = (
+    ('Enrollment', 'course', 'Course', 'enrollment_count'),
+    ('Material', 'course', 'Course', 'material_count'),
+    ('CourseContent', 'course_id', 'Course', 'content_count'),
+    ('CourseMember', 'course', 'Course', 'member_count'),
+    ('Comment', 'content_id', 'CourseContent', 'comment_count'),
+)
+
+
+def backfill_counters(apps, schema_editor):
+    using = schema_editor.connection.alias
+    for child_name, fk_name, parent_name, column in COUNTERS:
+        child = apps.get_model('courses', child_name)
+        parent = apps.get_model('courses', parent_name)
+        total = Subquery(
+            child.objects.using(using).filter(**{fk_name: OuterRef('pk')})
+            .order_by().values(fk_name).annotate(total=Count('pk')).values('total')
+        )
+        parent.objects.using(using).update(**{column: Coalesce(total, Value(0))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_statistic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='content_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='material_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='coursecontent',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
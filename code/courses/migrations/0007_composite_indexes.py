@@ -0,0 +1,136 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:30
+"""
+Index komposit untuk query utama, menggantikan index FK tunggal yang menjadi
+prefix-nya.
+
+Migration ini non-atomic: di PostgreSQL index dibuat dan dihapus dengan
+CREATE/DROP INDEX CONCURRENTLY agar tabel tetap bisa ditulis selama build.
+Database lain memakai CREATE/DROP INDEX biasa. State model tetap dicatat oleh
+operasi AddIndex / AlterField(db_index=False) di bawah.
+"""
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+INDEXES = (
+    ('comment', models.Index(fields=['content_id', '-created_at', '-id'], name='comment_content_recent_idx')),
+    ('course', models.Index(fields=['price'], name='course_price_idx')),
+    ('course', models.Index(fields=['teacher', 'code'], name='course_teacher_code_idx')),
+    ('course', models.Index(fields=['-created_at'], name='course_recent_idx')),
+    ('coursecontent', models.Index(fields=['course_id', 'order', 'created_at', 'id'], name='content_course_order_idx')),
+    ('coursemember', models.Index(fields=['roles', '-joined_at', '-id'], name='member_roles_recent_idx')),
+    ('coursemember', models.Index(fields=['-joined_at', '-id'], name='member_recent_idx')),
+    ('enrollment', models.Index(fields=['course', '-enrolled_at', '-id'], name='enrollment_course_recent_idx')),
+    ('enrollment', models.Index(fields=['-enrolled_at', '-id'], name='enrollment_recent_idx')),
+)
+
+# Index FK tunggal yang kini redundan (prefix index komposit)
+REDUNDANT_FK_INDEXES = (
+    ('comment', 'content_id'),
+    ('course', 'teacher'),
+    ('coursecontent', 'course_id'),
+    ('enrollment', 'course'),
+)
+
+
+def _options(schema_editor) -> dict:
+    return {'concurrently': True} if schema_editor.connection.vendor == 'postgresql' else {}
+
+
+def create_indexes(apps, schema_editor):
+    options = _options(schema_editor)
+    # Index komposit dibuat lebih dulu agar kolom FK tidak pernah tanpa index
+    for model_name, index in INDEXES:
+        schema_editor.add_index(apps.get_model('courses', model_name), index, **options)
+    for model_name, field_name in REDUNDANT_FK_INDEXES:
+        model = apps.get_model('courses', model_name)
+        column = model._meta.get_field(field_name).column
+        for name in schema_editor._constraint_names(model, [column], index=True, type_=models.Index.suffix):
+            schema_editor.execute(schema_editor._delete_index_sql(model, name, **options))
+
+
+def drop_indexes(apps, schema_editor):
+    options = _options(schema_editor)
+    for model_name, field_name in REDUNDANT_FK_INDEXES:
+        model = apps.get_model('courses', model_name)
+        field = model._meta.get_field(field_name)
+        schema_editor.execute(schema_editor._create_index_sql(model, fields=[field], **options))
+    for model_name, index in INDEXES:
+        schema_editor.remove_index(apps.get_model('courses', model_name), index, **options)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('courses', '0006_denormalized_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_indexes, drop_indexes),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='comment',
+                    index=models.Index(fields=['content_id', '-created_at', '-id'], name='comment_content_recent_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='course',
+                    index=models.Index(fields=['price'], name='course_price_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='course',
+                    index=models.Index(fields=['teacher', 'code'], name='course_teacher_code_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='course',
+                    index=models.Index(fields=['-created_at'], name='course_recent_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='coursecontent',
+                    index=models.Index(fields=['course_id', 'order', 'created_at', 'id'], name='content_course_order_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='coursemember',
+                    index=models.Index(fields=['roles', '-joined_at', '-id'], name='member_roles_recent_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='coursemember',
+                    index=models.Index(fields=['-joined_at', '-id'], name='member_recent_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='enrollment',
+                    index=models.Index(fields=['course', '-enrolled_at', '-id'], name='enrollment_course_recent_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='enrollment',
+                    index=models.Index(fields=['-enrolled_at', '-id'], name='enrollment_recent_idx'),
+                ),
+                migrations.AlterField(
+                    model_name='comment',
+                    name='content_id',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='courses.coursecontent'),
+                ),
+                migrations.AlterField(
+                    model_name='course',
+                    name='teacher',
+                    field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='courses_taught', to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='coursecontent',
+                    name='course_id',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='contents', to='courses.course'),
+                ),
+                migrations.AlterField(
+                    model_name='enrollment',
+                    name='course',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='courses.course'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StartupFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Nama langkah startup', max_length=50, unique=True)),
+                ('fingerprint', models.CharField(help_text='SHA-256 input langkah', max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
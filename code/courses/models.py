@@ -1,22 +1,51 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
 
 # Create your models here.
 
-class Course(models.Model):
+
+class AtomicSaveModel(models.Model):
+    """
+    Base model yang menjalankan save() beserta signal post_save dalam satu transaksi
+
+    Dipakai model yang memelihara counter denormalisasi di parent-nya
+    (lihat courses.counters) atau statistik dashboard (courses.stats) agar
+    insert dan update counter commit bersama.
+    """
+    
+    class Meta:
+        abstract = True
+    
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+class Course(AtomicSaveModel):
     """Model untuk menyimpan data mata kuliah"""
     code = models.CharField(max_length=10, unique=True, help_text="Kode mata kuliah")
     name = models.CharField(max_length=200, help_text="Nama mata kuliah")
     description = models.TextField(blank=True, help_text="Deskripsi mata kuliah")
     credits = models.IntegerField(default=3, help_text="Jumlah SKS")
     price = models.IntegerField(default=0, help_text="Harga course")
-    teacher = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='courses_taught')
+    # Index FK digantikan index komposit di Meta.indexes (kolom pertama sama)
+    teacher = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='courses_taught', db_index=False)
     instructor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='courses_instructed')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Counter denormalisasi, dipelihara oleh courses.counters
+    enrollment_count = models.PositiveIntegerField(default=0, editable=False)
+    material_count = models.PositiveIntegerField(default=0, editable=False)
+    content_count = models.PositiveIntegerField(default=0, editable=False)
+    member_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         ordering = ['code']
+        indexes = [
+            models.Index(fields=['price'], name='course_price_idx'),
+            models.Index(fields=['teacher', 'code'], name='course_teacher_code_idx'),
+            models.Index(fields=['-created_at'], name='course_recent_idx'),
+        ]
         verbose_name = 'Course'
         verbose_name_plural = 'Courses'
     
@@ -24,16 +53,20 @@ class Course(models.Model):
         return f"{self.code} - {self.name}"
 
 
-class Enrollment(models.Model):
+class Enrollment(AtomicSaveModel):
     """Model untuk menyimpan data pendaftaran mahasiswa ke mata kuliah"""
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='enrollments')
-    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments', db_index=False)
     enrolled_at = models.DateTimeField(auto_now_add=True)
     grade = models.CharField(max_length=2, blank=True, null=True, help_text="Nilai akhir (A, B, C, D, E)")
     
     class Meta:
         unique_together = ['student', 'course']
         ordering = ['-enrolled_at']
+        indexes = [
+            models.Index(fields=['course', '-enrolled_at', '-id'], name='enrollment_course_recent_idx'),
+            models.Index(fields=['-enrolled_at', '-id'], name='enrollment_recent_idx'),
+        ]
         verbose_name = 'Enrollment'
         verbose_name_plural = 'Enrollments'
     
@@ -41,7 +74,7 @@ class Enrollment(models.Model):
         return f"{self.student.username} - {self.course.code}"
 
 
-class Material(models.Model):
+class Material(AtomicSaveModel):
     """Model untuk menyimpan materi pembelajaran"""
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='materials')
     title = models.CharField(max_length=200, help_text="Judul materi")
@@ -59,7 +92,7 @@ class Material(models.Model):
         return f"{self.course.code} - {self.title}"
 
 
-class CourseMember(models.Model):
+class CourseMember(AtomicSaveModel):
     """Model untuk menyimpan member dari course"""
     user_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='course_memberships')
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='members')
@@ -69,6 +102,10 @@ class CourseMember(models.Model):
     class Meta:
         unique_together = ['user_id', 'course']
         ordering = ['-joined_at']
+        indexes = [
+            models.Index(fields=['roles', '-joined_at', '-id'], name='member_roles_recent_idx'),
+            models.Index(fields=['-joined_at', '-id'], name='member_recent_idx'),
+        ]
         verbose_name = 'Course Member'
         verbose_name_plural = 'Course Members'
     
@@ -76,9 +113,9 @@ class CourseMember(models.Model):
         return f"{self.user_id.username} - {self.course.name} ({self.roles})"
 
 
-class CourseContent(models.Model):
+class CourseContent(AtomicSaveModel):
     """Model untuk menyimpan konten pembelajaran"""
-    course_id = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='contents')
+    course_id = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='contents', db_index=False)
     name = models.CharField(max_length=200, help_text="Nama konten")
     description = models.TextField(help_text="Deskripsi konten")
     video_url = models.URLField(blank=True, help_text="URL video")
@@ -86,9 +123,14 @@ class CourseContent(models.Model):
     order = models.IntegerField(default=0, help_text="Urutan konten")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Counter denormalisasi, dipelihara oleh courses.counters
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         ordering = ['order', 'created_at']
+        indexes = [
+            models.Index(fields=['course_id', 'order', 'created_at', 'id'], name='content_course_order_idx'),
+        ]
         verbose_name = 'Course Content'
         verbose_name_plural = 'Course Contents'
     
@@ -96,9 +138,9 @@ class CourseContent(models.Model):
         return f"{self.course_id.code} - {self.name}"
 
 
-class Comment(models.Model):
+class Comment(AtomicSaveModel):
     """Model untuk menyimpan komentar pada konten"""
-    content_id = models.ForeignKey(CourseContent, on_delete=models.CASCADE, related_name='comments')
+    content_id = models.ForeignKey(CourseContent, on_delete=models.CASCADE, related_name='comments', db_index=False)
     member_id = models.ForeignKey(CourseMember, on_delete=models.CASCADE, related_name='comments')
     comment = models.TextField(help_text="Isi komentar")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -106,8 +148,36 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['content_id', '-created_at', '-id'], name='comment_content_recent_idx'),
+        ]
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
     
     def __str__(self):
         return f"Comment by {self.member_id.user_id.username} on {self.content_id.name}"
+
+
+class Statistic(models.Model):
+    """Counter agregat (jumlah baris) yang di-update saat data berubah, lihat courses.stats"""
+    name = models.CharField(max_length=50, unique=True, help_text="Nama statistik")
+    value = models.BigIntegerField(default=0, help_text="Nilai statistik")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Statistic'
+        verbose_name_plural = 'Statistics'
+    
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+
+class StartupFingerprint(models.Model):
+    """Fingerprint input langkah startup yang terakhir berhasil, lihat courses.startup"""
+    name = models.CharField(max_length=50, unique=True, help_text="Nama langkah startup")
+    fingerprint = models.CharField(max_length=64, help_text="SHA-256 input langkah")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} = {self.fingerprint[:12]}"
@@ -0,0 +1,244 @@
+"""
+Pagination Implementation
+Offset pagination (page/page_size) dan keyset pagination (cursor) untuk API
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from ninja import Field, Schema
+from ninja.errors import HttpError
+from ninja.pagination import PageNumberPagination
+
+
+def encode_cursor(position: List[Any], reverse: bool = False) -> str:
+    """
+    Encode posisi keyset menjadi token opaque (base64 url-safe)
+
+    Args:
+        position: Nilai kolom ordering dari baris acuan
+        reverse: True untuk cursor "previous" (membaca mundur)
+    """
+    payload = json.dumps({'p': position, 'r': reverse}, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Tuple[Optional[List[Any]], bool]:
+    """
+    Decode token cursor menjadi (position, reverse)
+
+    Token kosong berarti halaman pertama.
+
+    Raises:
+        HttpError 400: Jika token tidak valid
+    """
+    if not token:
+        return None, False
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position, reverse = data['p'], bool(data.get('r', False))
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HttpError(400, "Cursor tidak valid")
+    if not isinstance(position, list):
+        raise HttpError(400, "Cursor tidak valid")
+    return position, reverse
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Keyset (cursor) pagination
+
+    Halaman dibaca dengan `WHERE (kolom ordering) > (posisi terakhir) LIMIT n`
+    sehingga biaya per halaman konstan dan tanpa COUNT(*). Ordering diambil dari
+    parameter `ordering`, `order_by()` queryset (misal `-search_rank` dari
+    full-text search) atau `Meta.ordering` model, dan selalu ditambah `id`
+    sebagai tie-breaker. Kolom ordering harus NOT NULL; untuk queryset
+    `.values()` kolom yang belum dipilih ditambahkan otomatis. Nilai posisi di
+    cursor divalidasi dengan `to_python()` field ordering-nya.
+
+    Query Parameters:
+    - cursor: Token dari field `next`/`previous` response (kosong = halaman pertama)
+    - page_size: Jumlah item per halaman
+    """
+
+    class Input(Schema):
+        cursor: Optional[str] = None
+        page_size: Optional[int] = Field(None, ge=1)
+
+    class Output(Schema):
+        items: List[Any]
+        next: Optional[str] = None
+        previous: Optional[str] = None
+
+    def __init__(self, ordering: Optional[Tuple[str, ...]] = None, page_size: int = 10,
+                 max_page_size: int = 100, **kwargs: Any) -> None:
+        self.ordering = tuple(ordering) if ordering else None
+        super().__init__(page_size=page_size, max_page_size=max_page_size, **kwargs)
+
+    def get_ordering(self, queryset) -> Tuple[str, ...]:
+        explicit = tuple(queryset.query.order_by)
+        if not all(isinstance(field, str) for field in explicit):
+            explicit = ()
+        ordering = self.ordering or explicit or tuple(queryset.model._meta.ordering)
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            # Tie-breaker unik agar posisi cursor selalu tepat satu baris
+            tiebreak = '-id' if ordering and ordering[-1].startswith('-') else 'id'
+            ordering = ordering + (tiebreak,)
+        return ordering
+
+    @staticmethod
+    def _reverse_order(ordering: Tuple[str, ...]) -> Tuple[str, ...]:
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def _get_position(item: Any, ordering: Tuple[str, ...]) -> List[Any]:
+        names = [field.lstrip('-').replace('pk', 'id') for field in ordering]
+        if isinstance(item, dict):
+            return [item[name] for name in names]
+        return [getattr(item, name) for name in names]
+
+    @staticmethod
+    def _ordering_field(queryset, name: str):
+        """Field model (atau output_field anotasi) untuk satu kolom ordering"""
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        opts = queryset.model._meta
+        field = None
+        for part in name.split(LOOKUP_SEP):
+            if field is not None:
+                opts = field.related_model._meta
+            field = opts.pk if part == 'pk' else opts.get_field(part)
+        return field
+
+    def _clean_position(self, queryset, ordering: Tuple[str, ...], position: List[Any]) -> List[Any]:
+        """
+        Konversi nilai posisi dari cursor ke tipe kolom ordering
+
+        Raises:
+            HttpError 400: Jika nilai tidak cocok dengan kolomnya (cursor palsu)
+        """
+        cleaned = []
+        try:
+            for field_name, value in zip(ordering, position):
+                field = self._ordering_field(queryset, field_name.lstrip('-'))
+                value = field.to_python(value)
+                if value is None:
+                    raise ValueError(field_name)
+                field.run_validators(value)
+                cleaned.append(value)
+        except (ValidationError, ValueError, TypeError, FieldDoesNotExist):
+            raise HttpError(400, "Cursor tidak valid")
+        return cleaned
+
+    @staticmethod
+    def _after(ordering: Tuple[str, ...], position: List[Any]) -> Q:
+        """Bangun predikat row-comparison: baris yang berada setelah `position`"""
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            branch = Q(**{f'{name}__{lookup}': position[index]})
+            for prev_field, prev_value in zip(ordering[:index], position[:index]):
+                branch &= Q(**{prev_field.lstrip('-'): prev_value})
+            condition |= branch
+        return condition
+
+    def _keyset_queryset(self, queryset, cursor: Optional[str], page_size: int) -> tuple:
+        """Queryset halaman keyset (page_size + 1 baris) beserta state cursor"""
+        ordering = self.get_ordering(queryset)
+        position, reverse = decode_cursor(cursor)
+
+        if position is not None:
+            if len(position) != len(ordering):
+                raise HttpError(400, "Cursor tidak valid")
+            position = self._clean_position(queryset, ordering, position)
+
+        if queryset._fields:
+            # Queryset .values(): posisi cursor dibaca dari kolom ordering
+            names = [field.lstrip('-').replace('pk', 'id') for field in ordering]
+            missing = [name for name in names if name not in queryset._fields]
+            if missing:
+                queryset = queryset.values(*queryset._fields, *missing)
+
+        scan_ordering = self._reverse_order(ordering) if reverse else ordering
+        queryset = queryset.order_by(*scan_ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(scan_ordering, position))
+
+        # Ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+        return queryset[:page_size + 1], ordering, position, reverse
+
+    def _keyset_page(self, rows: list, page_size: int, ordering, position, reverse: bool) -> dict:
+        has_more = len(rows) > page_size
+        items = rows[:page_size]
+        if reverse:
+            items.reverse()
+
+        next_cursor = previous_cursor = None
+        if items:
+            # Mundur: selalu ada halaman setelahnya (asal cursor), sebelumnya jika has_more
+            if reverse or has_more:
+                next_cursor = encode_cursor(self._get_position(items[-1], ordering))
+            if has_more if reverse else position is not None:
+                previous_cursor = encode_cursor(self._get_position(items[0], ordering), reverse=True)
+        elif position is not None and not reverse:
+            previous_cursor = encode_cursor(position, reverse=True)
+
+        return {
+            self.items_attribute: items,
+            'next': next_cursor,
+            'previous': previous_cursor,
+        }
+
+    def paginate_keyset(self, queryset, cursor: Optional[str], page_size: Optional[int]) -> dict:
+        page_size = self._get_page_size(page_size)
+        page, *state = self._keyset_queryset(queryset, cursor, page_size)
+        return self._keyset_page(list(page), page_size, *state)
+
+    async def apaginate_keyset(self, queryset, cursor: Optional[str], page_size: Optional[int]) -> dict:
+        page_size = self._get_page_size(page_size)
+        page, *state = self._keyset_queryset(queryset, cursor, page_size)
+        return self._keyset_page([row async for row in page], page_size, *state)
+
+    def paginate_queryset(self, queryset, pagination: Input, request, **params: Any) -> Any:
+        return self.paginate_keyset(queryset, pagination.cursor, pagination.page_size)
+
+    async def apaginate_queryset(self, queryset, pagination: Input, request, **params: Any) -> Any:
+        return await self.apaginate_keyset(queryset, pagination.cursor, pagination.page_size)
+
+
+class CustomPagination(KeysetPagination):
+    """
+    Page number pagination dengan mode keyset opsional per request
+
+    Tanpa parameter `cursor` perilakunya sama dengan PageNumberPagination
+    (`items` + `count`). Jika `cursor` dikirim (boleh kosong untuk halaman pertama),
+    response berisi `items` + `next`/`previous` tanpa COUNT(*).
+    """
+
+    class Input(Schema):
+        page: int = Field(1, ge=1)
+        page_size: Optional[int] = Field(None, ge=1)
+        cursor: Optional[str] = None
+
+    class Output(Schema):
+        items: List[Any]
+        count: Optional[int] = None
+        next: Optional[str] = None
+        previous: Optional[str] = None
+
+    def paginate_queryset(self, queryset, pagination: Input, request, **params: Any) -> Any:
+        if pagination.cursor is not None or 'cursor' in request.GET:
+            return self.paginate_keyset(queryset, pagination.cursor, pagination.page_size)
+        return PageNumberPagination.paginate_queryset(self, queryset, pagination, request, **params)
+
+    async def apaginate_queryset(self, queryset, pagination: Input, request, **params: Any) -> Any:
+        if pagination.cursor is not None or 'cursor' in request.GET:
+            return await self.apaginate_keyset(queryset, pagination.cursor, pagination.page_size)
+        return await PageNumberPagination.apaginate_queryset(self, queryset, pagination, request, **params)
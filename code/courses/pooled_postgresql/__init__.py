@@ -0,0 +1 @@
+# Database backend PostgreSQL + psycopg3 connection pool (ENGINE 'courses.pooled_postgresql')
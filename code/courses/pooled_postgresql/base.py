@@ -0,0 +1,76 @@
+"""
+PostgreSQL Connection Pool
+Backend `django.db.backends.postgresql` dengan instrumentasi psycopg_pool
+
+Dipakai settings untuk setiap alias PostgreSQL saat DB_POOL=True
+(OPTIONS['pool'], CONN_MAX_AGE=0). Setiap proses memiliki satu pool per
+alias; koneksi dipinjam saat query pertama request dan dikembalikan ke pool
+di akhir request. Health check (CONN_HEALTH_CHECKS) dijalankan pool saat
+checkout sehingga koneksi rusak diganti tanpa error di request.
+
+Metric di /metrics (label `alias`):
+- lms_db_pool_checkout_seconds: latency checkout per request, termasuk
+  health check dan menunggu pool penuh
+- ukuran pool, koneksi idle, antrean dan counter statistik psycopg_pool
+  (jumlah checkout, waktu tunggu, error, koneksi baru/rusak), dibaca
+  setiap flush metric
+
+Pool milik proses induk dibuang di proses hasil fork: thread worker pool
+tidak ikut ter-fork, sehingga proses anak membuat pool sendiri.
+"""
+import os
+import time
+
+from django.db.backends.postgresql import base
+
+from courses.metrics import get_store, register_collector
+
+
+# statistik psycopg_pool -> metric
+POOL_GAUGES = {
+    'pool_size': 'lms_db_pool_size',
+    'pool_available': 'lms_db_pool_available',
+    'requests_waiting': 'lms_db_pool_requests_waiting',
+}
+# statistik psycopg_pool -> (metric, pengali ke satuan metric)
+POOL_COUNTERS = {
+    'requests_num': ('lms_db_pool_requests_total', 1),
+    'requests_wait_ms': ('lms_db_pool_wait_seconds_total', 0.001),
+    'requests_errors': ('lms_db_pool_errors_total', 1),
+    'connections_num': ('lms_db_pool_connections_total', 1),
+    'connections_lost': ('lms_db_pool_connections_lost_total', 1),
+}
+
+
+def collect_pool_stats(store):
+    """Collector metric: statistik setiap pool yang sudah dibuat di proses ini"""
+    for alias, pool in list(DatabaseWrapper._connection_pools.items()):
+        # pop_stats: counter sejak pemanggilan sebelumnya, gauge nilai saat ini
+        stats = pool.pop_stats()
+        labels = (('alias', alias),)
+        for key, name in POOL_GAUGES.items():
+            store.set_gauge(name, labels, stats.get(key, 0))
+        for key, (name, scale) in POOL_COUNTERS.items():
+            if stats.get(key):
+                store.inc(name, labels, stats[key] * scale)
+
+
+def _forget_pools():
+    DatabaseWrapper._connection_pools.clear()
+
+
+register_collector(collect_pool_stats)
+os.register_at_fork(after_in_child=_forget_pools)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        if not self.pool:
+            return super().get_new_connection(conn_params)
+        start = time.perf_counter()
+        try:
+            return super().get_new_connection(conn_params)
+        finally:
+            get_store().observe('lms_db_pool_checkout_seconds', (('alias', self.alias),),
+                                time.perf_counter() - start)
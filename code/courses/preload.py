@@ -0,0 +1,65 @@
+"""
+Preload (gunicorn GUNICORN_PRELOAD=True)
+Import dan pemanasan aplikasi sekali di proses master sebelum fork worker
+
+Dipanggil dari gunicorn.conf.py. Semua yang dibangun di master (modul Django,
+django-ninja dan pydantic, URL resolver, schema OpenAPI apiv1, template yang
+sudah dikompilasi di cached loader) dipakai bersama semua worker secara
+copy-on-write. gunicorn.conf.py mematikan gc di master, memanggil
+gc.freeze() tepat sebelum fork dan menyalakan gc lagi di worker, sehingga
+garbage collector worker tidak menulis ke objek milik master (yang akan
+menyalin halaman memori ke setiap worker).
+
+State per proses (koneksi database, pool psycopg, metric store, koneksi
+SQLite throttle, executor hashing) dibuat ulang di worker berdasarkan pid;
+koneksi database yang dibuka saat pemanasan ditutup sebelum fork.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+from django.urls import get_resolver
+
+
+def _project_templates() -> list:
+    """Nama template milik project (bukan template bawaan paket, misal admin)"""
+    base = str(settings.BASE_DIR)
+    names = []
+    for engine in engines.all():
+        dirs = [str(d) for d in (*engine.dirs, *get_app_template_dirs('templates')) if str(d).startswith(base)]
+        for root_dir in dict.fromkeys(dirs):
+            for root, _, files in os.walk(root_dir):
+                names += [os.path.relpath(os.path.join(root, name), root_dir) for name in files if name.endswith('.html')]
+    return sorted(set(names))
+
+
+def warm_up() -> dict:
+    """
+    Bangun semua struktur lazy aplikasi di proses ini
+
+    Returns:
+        dict: Durasi (detik) per bagian
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    # Import semua modul URL/view dan isi cache reverse
+    get_resolver().reverse_dict
+    timings['urls'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    from .api import apiv1
+    apiv1.get_openapi_schema()
+    timings['openapi'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for engine in engines.all():
+        for name in _project_templates():
+            engine.get_template(name)
+    timings['templates'] = time.perf_counter() - started
+
+    connections.close_all()
+    return {part: round(seconds, 3) for part, seconds in timings.items()}
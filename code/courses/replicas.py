@@ -0,0 +1,196 @@
+"""
+Read Replica Routing
+Mengarahkan query baca view tertentu ke database replica (DATABASE_REPLICAS)
+
+- View yang ditandai `@use_replica` (endpoint GET publik dan list view HTML)
+  membaca dari satu replica yang dipilih acak per request
+- Semua penulisan, `select_for_update`, query di dalam `transaction.atomic`
+  dan query setelah request menulis tetap ke `default` (primary)
+- Read-your-writes: request yang menulis menandai klien "sticky" selama
+  REPLICA_STICKY_SECONDS lewat cookie `lms_primary` dan, untuk user JWT,
+  key cache per user; selama itu view replica membaca dari primary
+- Namespace response cache yang baru diinvalidasi juga dibaca dari primary
+  selama window yang sama, agar data replica yang tertinggal tidak di-cache
+
+Keputusan disimpan di contextvar (objek mutable) sehingga ikut terbawa ke
+thread `sync_to_async` milik view async. Tanpa replica semua query ke primary.
+"""
+import contextvars
+import inspect
+import random
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+from ninja_jwt.exceptions import TokenError
+from ninja_jwt.settings import api_settings
+from ninja_jwt.tokens import AccessToken
+
+from .caching import get_cache, written_key
+
+
+DATABASE_REPLICAS = getattr(settings, 'DATABASE_REPLICAS', [])
+REPLICA_STICKY_SECONDS = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+STICKY_COOKIE = 'lms_primary'
+
+_state = contextvars.ContextVar('replica_state', default=None)
+
+
+class RoutingState:
+    """Status routing satu request"""
+
+    def __init__(self):
+        self.replica = None  # alias replica jika view sedang boleh membaca dari replica
+        self.wrote = False
+
+
+class ReplicaRouter:
+    """Database router: baca ke replica hanya di dalam view `@use_replica`"""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.replica is None or state.wrote:
+            return DEFAULT_DB_ALIAS
+        # Transaksi terbuka di primary: baca dari snapshot yang sama
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        # Dipanggil juga untuk select_for_update / get_or_create
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica berisi data yang sama dengan primary
+        return True
+
+
+def _sticky_key(user_id) -> str:
+    return f'replica:sticky:{user_id}'
+
+
+def request_user_id(request):
+    """User id dari `request.auth` (endpoint ber-auth) atau header Bearer (endpoint publik)"""
+    user_id = getattr(getattr(request, 'auth', None), 'pk', None)
+    if user_id is not None:
+        return user_id
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None
+    try:
+        return AccessToken(header[7:]).get(api_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+@contextmanager
+def _replica_scope(sticky: bool):
+    state, token = _state.get(), None
+    if state is None:
+        # Tanpa middleware (misal dipanggil langsung di shell)
+        state = RoutingState()
+        token = _state.set(state)
+    previous = state.replica
+    if not sticky and not state.wrote:
+        state.replica = previous or random.choice(DATABASE_REPLICAS)
+    try:
+        yield
+    finally:
+        state.replica = previous
+        if token is not None:
+            _state.reset(token)
+
+
+def _sticky_keys(request, namespaces: tuple) -> list:
+    keys = [written_key(namespace) for namespace in namespaces]
+    user_id = request_user_id(request)
+    if user_id is not None:
+        keys.append(_sticky_key(user_id))
+    return keys
+
+
+def use_replica(*namespaces: str):
+    """
+    Decorator: query baca view ini boleh dilayani replica
+
+    Args:
+        namespaces: Namespace response cache view ini; selama namespace baru
+            ditulis (siapa pun penulisnya) view membaca dari primary
+
+    Pasang di luar decorator lain (tepat di bawah decorator route) agar query
+    ETag, cache dan pagination ikut ke replica.
+    """
+    def decorator(func):
+        if not DATABASE_REPLICAS:
+            return func
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(request, *args, **kwargs):
+                keys = _sticky_keys(request, namespaces)
+                sticky = STICKY_COOKIE in request.COOKIES or bool(keys and await get_cache().aget_many(keys))
+                with _replica_scope(sticky):
+                    return await func(request, *args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(request, *args, **kwargs):
+                keys = _sticky_keys(request, namespaces)
+                sticky = STICKY_COOKIE in request.COOKIES or bool(keys and get_cache().get_many(keys))
+                with _replica_scope(sticky):
+                    return func(request, *args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def _mark_sticky(request, response):
+    """Tandai klien yang baru menulis; returns user id untuk key cache (atau None)"""
+    response.set_cookie(
+        STICKY_COOKIE, '1', max_age=REPLICA_STICKY_SECONDS,
+        httponly=True, samesite='Lax', secure=request.is_secure(),
+    )
+    return request_user_id(request)
+
+
+@sync_and_async_middleware
+def replica_middleware(get_response):
+    """
+    Middleware status routing replica per request
+
+    Pasang setelah AuthenticationMiddleware: penulisan session/login di
+    middleware sebelumnya tidak dihitung sebagai penulisan data user.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            state = RoutingState()
+            token = _state.set(state)
+            try:
+                response = await get_response(request)
+            finally:
+                _state.reset(token)
+            if state.wrote and DATABASE_REPLICAS:
+                user_id = _mark_sticky(request, response)
+                if user_id is not None:
+                    await get_cache().aset(_sticky_key(user_id), 1, REPLICA_STICKY_SECONDS)
+            return response
+    else:
+        def middleware(request):
+            state = RoutingState()
+            token = _state.set(state)
+            try:
+                response = get_response(request)
+            finally:
+                _state.reset(token)
+            if state.wrote and DATABASE_REPLICAS:
+                user_id = _mark_sticky(request, response)
+                if user_id is not None:
+                    get_cache().set(_sticky_key(user_id), 1, REPLICA_STICKY_SECONDS)
+            return response
+
+    return middleware
@@ -0,0 +1,168 @@
+"""
+Route Table
+Daftar route API (apiv1) dan view HTML beserta helper untuk memanggilnya
+lewat Django test Client
+
+Dipakai bersama oleh `courses.benchmark` (mengukur latency) dan
+`courses.advisor` (EXPLAIN query di balik route GET). `discover_routes()`
+mendaftar route yang seharusnya ada di ROUTES agar route baru tidak
+terlewat.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from unittest import mock
+
+from django.conf import settings
+from django.test import Client, override_settings
+
+from . import metrics, throttling
+
+
+# Password semua user dataset benchmark (dipakai route login)
+BENCHMARK_PASSWORD = 'Benchmark123'
+
+
+class Route:
+    """
+    Satu route API atau view HTML
+
+    Args:
+        key: 'METHOD /api/v1/<pattern>' untuk API atau 'METHOD <url name>' untuk view HTML
+        path: Fungsi (ctx, i) -> URL
+        client: 'anon', 'session' (login Django) atau 'jwt' (header Bearer)
+        data: Fungsi (ctx, i) -> body (JSON untuk API, form untuk HTML)
+        form: Kirim body sebagai form (default JSON untuk API)
+        slow: Route dengan hashing password; jumlah iterasi dikurangi
+    """
+
+    def __init__(self, key: str, path, client: str = 'anon', data=None, form: bool = False, slow: bool = False):
+        self.key = key
+        self.method = key.split(' ', 1)[0]
+        self.path = path
+        self.client = client
+        self.data = data
+        self.form = form or not key.split(' ', 1)[1].startswith('/api/')
+        self.slow = slow
+
+
+def api_path(path: str) -> str:
+    """URL apiv1 untuk path relatif (misal 'courses?page=2')"""
+    return f'/api/v1/{path}'
+
+
+ROUTES = [
+    # API: demo
+    Route('GET /api/v1/hello', lambda ctx, i: api_path('hello')),
+    Route('GET /api/v1/calc/{nil1}/{opr}/{nil2}', lambda ctx, i: api_path(f'calc/{i}/x/7')),
+    Route('POST /api/v1/hello', lambda ctx, i: api_path('hello/'), data=lambda ctx, i: {'nama': 'bench'}, form=True),
+    Route('PUT /api/v1/users/{id}', lambda ctx, i: api_path(f"users/{ctx['user_id']}"), data=lambda ctx, i: {}),
+    Route('DELETE /api/v1/users/{id}', lambda ctx, i: api_path(f"users/{ctx['user_id']}")),
+    Route('POST /api/v1/calc', lambda ctx, i: api_path('calc'), data=lambda ctx, i: {'nil1': i, 'nil2': 3, 'opr': '-'}),
+    # API: auth
+    Route('POST /api/v1/register', lambda ctx, i: api_path('register/'), slow=True, data=lambda ctx, i: {
+        'username': f'bench_reg{i:05d}', 'password': BENCHMARK_PASSWORD, 'email': f'bench_reg{i:05d}@example.com',
+        'first_name': 'Bench', 'last_name': 'Register',
+    }),
+    Route('POST /api/v1/login', lambda ctx, i: api_path('login'), slow=True, data=lambda ctx, i: {
+        'username': 'bench_admin', 'password': BENCHMARK_PASSWORD,
+    }),
+    Route('POST /api/v1/refresh', lambda ctx, i: api_path('refresh'), data=lambda ctx, i: {'refresh': ctx['refresh']}),
+    Route('POST /api/v1/logout', lambda ctx, i: api_path('logout'), client='jwt',
+          data=lambda ctx, i: {'refresh': ctx['logout_refresh']}),
+    Route('GET /api/v1/me', lambda ctx, i: api_path('me'), client='jwt'),
+    Route('POST /api/v1/auth/register', lambda ctx, i: api_path('auth/register'), slow=True, data=lambda ctx, i: {
+        'username': f'bench_auth{i:05d}', 'email': f'bench_auth{i:05d}@example.com',
+        'password': BENCHMARK_PASSWORD, 'password_confirm': BENCHMARK_PASSWORD,
+    }),
+    Route('POST /api/v1/auth/login', lambda ctx, i: api_path('auth/login'), slow=True, data=lambda ctx, i: {
+        'username': 'bench_admin', 'password': BENCHMARK_PASSWORD,
+    }),
+    Route('POST /api/v1/auth/refresh', lambda ctx, i: api_path(f"auth/refresh?refresh_token={ctx['refresh']}")),
+    Route('POST /api/v1/auth/logout', lambda ctx, i: api_path('auth/logout')),
+    Route('GET /api/v1/auth/verify', lambda ctx, i: api_path('auth/verify'), client='jwt'),
+    # API: data
+    Route('GET /api/v1/users', lambda ctx, i: api_path('users'), client='jwt'),
+    Route('GET /api/v1/users/{user_id}', lambda ctx, i: api_path(f"users/{ctx['user_id']}"), client='jwt'),
+    Route('GET /api/v1/courses', lambda ctx, i: api_path(f'courses?page={i % 5 + 1}')),
+    Route('POST /api/v1/courses', lambda ctx, i: api_path('courses'), client='jwt', data=lambda ctx, i: {
+        'code': f'N{i:05d}', 'name': f'New Course {i}', 'description': 'Dibuat oleh benchmark', 'price': 100000,
+    }),
+    Route('GET /api/v1/courses/{course_id}', lambda ctx, i: api_path(f"courses/{ctx['course_id']}")),
+    Route('GET /api/v1/members', lambda ctx, i: api_path('members'), client='jwt'),
+    Route('GET /api/v1/contents', lambda ctx, i: api_path(f"contents?course_id={ctx['course_id']}")),
+    Route('GET /api/v1/comments', lambda ctx, i: api_path(f"comments?content_id={ctx['content_id']}")),
+    Route('POST /api/v1/comments', lambda ctx, i: api_path('comments'), client='jwt', data=lambda ctx, i: {
+        'content_id': ctx['content_id'], 'comment': f'Komentar baru {i}',
+    }),
+    # HTML views
+    Route('GET home', lambda ctx, i: '/', client='session'),
+    Route('GET login', lambda ctx, i: '/login/'),
+    Route('GET logout', lambda ctx, i: '/logout/'),
+    Route('GET profile', lambda ctx, i: '/profile/', client='session'),
+    Route('GET jwt_login', lambda ctx, i: '/auth/login/'),
+    Route('GET register', lambda ctx, i: '/auth/register/'),
+    Route('GET course_list', lambda ctx, i: '/courses/', client='session'),
+    Route('GET course_create', lambda ctx, i: '/courses/create/', client='session'),
+    Route('GET course_detail', lambda ctx, i: f"/courses/{ctx['course_id']}/", client='session'),
+    Route('GET course_update', lambda ctx, i: f"/courses/{ctx['course_id']}/update/", client='session'),
+    Route('GET course_delete', lambda ctx, i: f"/courses/{ctx['course_id']}/delete/", client='session'),
+    Route('GET material_create', lambda ctx, i: f"/courses/{ctx['course_id']}/materials/create/", client='session'),
+    Route('GET material_update', lambda ctx, i: f"/materials/{ctx['material_id']}/update/", client='session'),
+    Route('GET material_delete', lambda ctx, i: f"/materials/{ctx['material_id']}/delete/", client='session'),
+    Route('GET enrollment_list', lambda ctx, i: '/enrollments/', client='session'),
+    Route('GET enrollment_create', lambda ctx, i: '/enrollments/create/', client='session'),
+    Route('GET enrollment_update', lambda ctx, i: f"/enrollments/{ctx['enrollment_id']}/update/", client='session'),
+    Route('GET enrollment_delete', lambda ctx, i: f"/enrollments/{ctx['enrollment_id']}/delete/", client='session'),
+    Route('GET apihtml', lambda ctx, i: '/apihtml/', client='session'),
+    Route('GET api_docs', lambda ctx, i: '/api-docs/', client='session'),
+]
+
+
+def discover_routes() -> set:
+    """Semua route yang seharusnya diukur: operation apiv1 + URL name courses.urls"""
+    from .api import apiv1
+    from .urls import urlpatterns
+
+    keys = set()
+    for prefix, router in apiv1._routers:
+        for path, path_view in router.path_operations.items():
+            pattern = '/'.join(part.strip('/') for part in (prefix, path) if part.strip('/'))
+            for operation in path_view.operations:
+                for method in operation.methods:
+                    keys.add(f'{method} /api/v1/{pattern}')
+    keys.update(f'GET {pattern.name}' for pattern in urlpatterns)
+    return keys
+
+
+@contextmanager
+def isolated_state():
+    """Response cache, cache session, throttle dan metric sementara selama pengukuran"""
+    with tempfile.TemporaryDirectory(prefix='lms_bench_') as tmp:
+        caches = dict(settings.CACHES)
+        caches[settings.API_CACHE_ALIAS] = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'lms-benchmark',
+        }
+        caches[settings.SESSION_CACHE_ALIAS] = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'lms-benchmark-sessions',
+        }
+        backend = throttling.SQLiteThrottleBackend(location=os.path.join(tmp, 'throttle.sqlite3'))
+        store = metrics.MetricsStore(directory=os.path.join(tmp, 'metrics'))
+        with override_settings(CACHES=caches), \
+                mock.patch.object(throttling, '_backend', backend), \
+                mock.patch.object(metrics, '_store', store):
+            yield
+
+
+def make_clients(ctx: dict) -> dict:
+    """Test Client per jenis autentikasi route: 'anon', 'session' dan 'jwt'"""
+    # 5xx dicatat sebagai response (kolom errors), bukan menghentikan run
+    session = Client(raise_request_exception=False)
+    session.force_login(ctx['admin'])
+    return {
+        'anon': Client(raise_request_exception=False),
+        'session': session,
+        'jwt': Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Bearer {ctx['access']}"),
+    }
@@ -0,0 +1,133 @@
+"""
+Full-text Search Implementation
+Pencarian course dan course content dengan ranking, tanpa service eksternal
+
+- PostgreSQL: kolom `search_vector` (tsvector generated column) + GIN index
+- SQLite: tabel virtual FTS5 `<table>_fts`, dipelihara lewat signal
+- Database lain: fallback ke `icontains`
+
+Index dibuat oleh migration `0003_fulltext_search`.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Course, CourseContent
+
+
+SEARCH_CONFIG = 'simple'
+
+# Field yang diindeks per model (harus sama dengan migration 0003)
+SEARCH_FIELDS = {
+    Course: ('code', 'name', 'description'),
+    CourseContent: ('name', 'description'),
+}
+
+MAX_TERMS = 10
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _terms(query: str) -> list:
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def _fts_table(model) -> str:
+    return f'{model._meta.db_table}_fts'
+
+
+def search(queryset, query: str):
+    """
+    Filter queryset dengan full-text search dan urutkan berdasarkan relevansi
+
+    Setiap kata dicocokkan sebagai prefix dan semua kata harus ada (AND).
+    Hasil diberi anotasi `search_rank` (semakin besar semakin relevan; konstan
+    pada fallback `icontains`). Queryset `.values()` harus ikut memilih
+    `search_rank` agar bisa dipakai sebagai posisi keyset pagination.
+
+    Args:
+        queryset: QuerySet Course atau CourseContent
+        query: Kata kunci dari parameter `search` / `q`
+    """
+    model = queryset.model
+    fields = SEARCH_FIELDS[model]
+    terms = _terms(query)
+    vendor = connections[queryset.db].vendor
+
+    if not terms or vendor not in ('postgresql', 'sqlite'):
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f'{field}__icontains': query})
+        queryset = queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return queryset.order_by('-search_rank', *model._meta.ordering)
+
+    table = model._meta.db_table
+    if vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        matches = RawSQL(
+            f'"{table}"."search_vector" @@ to_tsquery(%s, %s)',
+            (SEARCH_CONFIG, tsquery), output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f'ts_rank("{table}"."search_vector", to_tsquery(%s, %s))',
+            (SEARCH_CONFIG, tsquery), output_field=FloatField(),
+        )
+        queryset = queryset.filter(matches).annotate(search_rank=rank)
+    else:
+        fts = _fts_table(model)
+        match = ' '.join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM "{fts}" WHERE "{fts}" MATCH %s', (match,))
+        ).annotate(search_rank=RawSQL(
+            f'(SELECT -bm25("{fts}") FROM "{fts}" WHERE "{fts}" MATCH %s AND rowid = "{table}"."id")',
+            (match,), output_field=FloatField(),
+        ))
+
+    return queryset.order_by('-search_rank', *model._meta.ordering)
+
+
+def index_instance(instance, using: str = 'default'):
+    """Tulis ulang baris FTS5 untuk satu instance (hanya SQLite)"""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    fields = SEARCH_FIELDS[type(instance)]
+    fts = _fts_table(type(instance))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{fts}" WHERE rowid = %s', [instance.pk])
+        cursor.execute(
+            f'INSERT INTO "{fts}"(rowid, {", ".join(fields)}) VALUES (%s{", %s" * len(fields)})',
+            [instance.pk] + [getattr(instance, field) or '' for field in fields],
+        )
+
+
+def unindex_instance(instance, using: str = 'default'):
+    """Hapus baris FTS5 untuk satu instance (hanya SQLite)"""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{_fts_table(type(instance))}" WHERE rowid = %s', [instance.pk])
+
+
+def rebuild_search_index(using: str = 'default'):
+    """
+    Bangun ulang seluruh index FTS5 dari tabel sumber (hanya SQLite)
+
+    Diperlukan setelah operasi yang tidak memicu signal, misalnya
+    `bulk_create` atau `QuerySet.update()`. Di PostgreSQL tidak perlu karena
+    `search_vector` adalah generated column.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for model, fields in SEARCH_FIELDS.items():
+            fts = _fts_table(model)
+            columns = ', '.join(fields)
+            cursor.execute(f'DELETE FROM "{fts}"')
+            cursor.execute(
+                f'INSERT INTO "{fts}"(rowid, {columns}) '
+                f'SELECT id, {columns} FROM "{model._meta.db_table}"'
+            )
@@ -0,0 +1,51 @@
+"""
+View sinkron / async sesuai SERVER_MODE
+
+Di bawah WSGI (default start.sh) view `async def` tidak memberi manfaat:
+setiap request dibungkus async_to_sync dan query ORM async pindah thread lagi.
+Karena itu view baca API ditulis sinkron dan hanya dijalankan sebagai
+coroutine saat SERVER_MODE=asgi (uvicorn worker, lihat lms_project/asgi.py).
+"""
+from functools import wraps
+
+from django.conf import settings
+
+
+ASYNC_VIEWS = getattr(settings, 'SERVER_MODE', 'wsgi') == 'asgi'
+
+
+def async_under_asgi(view):
+    """
+    Jalankan view sinkron sebagai `async def` saat SERVER_MODE=asgi
+
+    Hanya untuk view yang tidak menjalankan query sendiri (mengembalikan
+    queryset lazy atau object yang sudah dimuat); evaluasi dilakukan oleh
+    paginator async Ninja.
+    """
+    if not ASYNC_VIEWS:
+        return view
+
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def asgi_variant(async_view):
+    """
+    Ganti view sinkron dengan `async_view` saat SERVER_MODE=asgi
+
+    Untuk view yang menjalankan query sendiri: varian async memakai API ORM
+    async (`aget`, ...) dengan parameter yang sama.
+
+    Usage:
+        @apiv1.get("/courses/{course_id}")
+        @asgi_variant(aget_course)
+        def get_course(request, course_id: int):
+            ...
+    """
+    def decorator(view):
+        if not ASYNC_VIEWS:
+            return view
+        return wraps(view)(async_view)
+    return decorator
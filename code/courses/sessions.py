@@ -0,0 +1,54 @@
+"""
+Session Engine (cache + database, write coalescing)
+SESSION_ENGINE = 'courses.sessions'
+
+Turunan `cached_db`: session dibaca dari cache bersama (SESSION_CACHE_ALIAS)
+dan setiap penulisan diteruskan ke tabel django_session (write-through),
+sehingga session tetap ada jika cache dibersihkan. Cache harus dipakai bersama
+semua host (Redis/Memcached): flush saat logout hanya menghapus entry di cache
+tersebut. Settings memilih engine ini secara default hanya jika
+SESSION_CACHE_BACKEND adalah backend bersama.
+
+Dengan SESSION_SAVE_EVERY_REQUEST, Django menyimpan session di setiap request
+hanya untuk memperpanjang masa berlaku (sliding expiry). Engine ini melewati
+penyimpanan tersebut selama data session tidak berubah dan waktu sejak
+penulisan terakhir belum mencapai SESSION_REFRESH_FRACTION x umur session.
+Session yang aktif tetap berlaku minimal (1 - fraction) x SESSION_COOKIE_AGE
+setelah request terakhirnya; perubahan data (login, logout, flash message)
+selalu langsung ditulis.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+
+from .metrics import get_store
+
+
+SESSION_REFRESH_FRACTION = getattr(settings, 'SESSION_REFRESH_FRACTION', 0.25)
+# Waktu (epoch) penulisan terakhir, disimpan di data session
+REFRESHED_KEY = '_session_refreshed_at'
+
+
+class SessionStore(cached_db.SessionStore):
+
+    def _skip(self, must_create: bool, refreshed, expiry_age: int) -> bool:
+        """True jika penyimpanan bisa dilewati (data sama, belum waktunya diperpanjang)"""
+        skip = (
+            not must_create and self.session_key is not None and not self.modified
+            and refreshed is not None and time.time() - refreshed < SESSION_REFRESH_FRACTION * expiry_age
+        )
+        get_store().inc('lms_session_saves_total', (('result', 'skipped' if skip else 'written'),))
+        return skip
+
+    def save(self, must_create=False):
+        if self._skip(must_create, self.get(REFRESHED_KEY), self.get_expiry_age()):
+            return
+        self[REFRESHED_KEY] = int(time.time())
+        super().save(must_create)
+
+    async def asave(self, must_create=False):
+        if self._skip(must_create, await self.aget(REFRESHED_KEY), await self.aget_expiry_age()):
+            return
+        await self.aset(REFRESHED_KEY, int(time.time()))
+        await super().asave(must_create)
@@ -0,0 +1,124 @@
+"""
+Signal handlers untuk app courses
+"""
+from django.contrib.auth.models import User
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .authentication import user_cache
+from .caching import invalidate
+from .counters import adjust, mark_deleting, parent_deleting
+from .middleware import install_recorder
+from .models import Course, CourseContent, CourseMember, Comment, Enrollment, Material
+from .search import index_instance, unindex_instance
+from .stats import increment
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=CourseContent)
+def update_search_index(sender, instance, using, **kwargs):
+    """Sinkronkan index full-text setelah course/content disimpan"""
+    index_instance(instance, using=using)
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=CourseContent)
+def remove_search_index(sender, instance, using, **kwargs):
+    """Hapus course/content dari index full-text"""
+    unindex_instance(instance, using=using)
+
+
+# Namespace response cache yang bergantung pada tiap model
+CACHE_NAMESPACES = {
+    Course: ('courses',),
+    CourseContent: ('contents', 'courses'),
+    Comment: ('comments', 'contents'),
+    # Counter denormalisasi di Course ikut tampil di API course
+    Enrollment: ('courses',),
+    Material: ('courses',),
+    CourseMember: ('courses',),
+    # Menghapus user meng-SET_NULL Course.teacher lewat UPDATE tanpa signal
+    User: ('courses',),
+}
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=CourseContent)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=Material)
+@receiver(post_save, sender=CourseMember)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=CourseContent)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=Material)
+@receiver(post_delete, sender=CourseMember)
+def invalidate_response_cache(sender, **kwargs):
+    """Invalidasi response cache API publik setelah data berubah"""
+    invalidate(*CACHE_NAMESPACES[sender])
+
+
+@receiver(post_delete, sender=User)
+def invalidate_teacher_cache(sender, **kwargs):
+    """Invalidasi cache course saat user (teacher) dihapus"""
+    invalidate(*CACHE_NAMESPACES[sender])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Hapus user dari cache JWTAuth saat diubah, dinonaktifkan, atau dihapus"""
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=Material)
+def increment_stats(sender, created, using, **kwargs):
+    """Naikkan counter dashboard saat baris baru dibuat"""
+    if created:
+        increment(sender, 1, using=using)
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=Material)
+def decrement_stats(sender, using, **kwargs):
+    """Turunkan counter dashboard (termasuk baris yang ikut terhapus cascade)"""
+    increment(sender, -1, using=using)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=Material)
+@receiver(post_save, sender=CourseContent)
+@receiver(post_save, sender=CourseMember)
+@receiver(post_save, sender=Comment)
+def increment_counter(sender, instance, created, using, **kwargs):
+    """Naikkan counter denormalisasi di parent saat child baru dibuat"""
+    if created:
+        adjust(instance, 1, using=using)
+
+
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=Material)
+@receiver(post_delete, sender=CourseContent)
+@receiver(post_delete, sender=CourseMember)
+@receiver(post_delete, sender=Comment)
+def decrement_counter(sender, instance, using, origin=None, **kwargs):
+    """Turunkan counter denormalisasi di parent saat child dihapus"""
+    # Parent yang ikut terhapus cascade tidak perlu di-UPDATE per child
+    if not parent_deleting(instance, origin):
+        adjust(instance, -1, using=using)
+
+
+@receiver(pre_delete, sender=Course)
+@receiver(pre_delete, sender=CourseContent)
+def mark_counter_parent_deleting(sender, instance, origin=None, **kwargs):
+    """Catat parent counter yang akan dihapus (pre_delete dikirim sebelum cascade)"""
+    mark_deleting(instance, origin)
+
+
+# Pencatat query untuk query_count_middleware, dipasang di setiap koneksi baru
+connection_created.connect(install_recorder, dispatch_uid='courses.install_query_recorder')
@@ -0,0 +1,208 @@
+"""
+Startup Orchestrator
+Langkah start container (migrate, collectstatic, setup_demo) yang dilewati
+jika inputnya tidak berubah sejak start sebelumnya
+
+Dijalankan lewat `python manage.py boot` (start.sh). Fingerprint per langkah:
+- migrate: migration di disk dibandingkan dengan tabel django_migrations
+  (satu query, tanpa signal post_migrate)
+- static: SHA-256 semua file sumber static (finder collectstatic), disimpan di
+  STATIC_ROOT setelah collectstatic berhasil
+- demo: SHA-256 source command setup_demo (data demo), disimpan di tabel
+  StartupFingerprint setelah setup_demo berhasil
+
+collectstatic (hanya filesystem) berjalan paralel dengan langkah database
+(migrate lalu setup_demo). Di PostgreSQL langkah database dijalankan di bawah
+advisory lock agar replica yang start bersamaan tidak menjalankannya dua
+kali; fingerprint dicek ulang setelah lock didapat.
+"""
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+
+from .models import StartupFingerprint
+
+
+STEPS = ('migrate', 'static', 'demo')
+STATIC_FINGERPRINT_FILE = '.startup-fingerprint'
+# pg_advisory_lock key untuk langkah database ('LMS' + 1)
+BOOT_LOCK_ID = 0x4C4D5301
+
+
+# Fingerprint
+
+def _sha256(chunks) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pending_migrations(using: str = 'default') -> list:
+    """Migration di disk yang belum tercatat di django_migrations"""
+    executor = MigrationExecutor(connections[using])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [f'{migration.app_label}.{migration.name}' for migration, _ in plan]
+
+
+def static_fingerprint() -> str:
+    """Hash path dan isi semua file yang akan dikumpulkan collectstatic"""
+    ignore_patterns = apps.get_app_config('staticfiles').ignore_patterns
+    files = {}
+    for finder in get_finders():
+        for path, storage in finder.list(ignore_patterns):
+            # Finder pertama menang, sama seperti collectstatic
+            files.setdefault(path, storage)
+
+    def chunks():
+        for path in sorted(files):
+            yield path.encode()
+            with files[path].open(path) as fh:
+                yield fh.read()
+
+    return _sha256(chunks())
+
+
+def stored_static_fingerprint() -> str:
+    # Storage manifest (whitenoise/ManifestStaticFilesStorage): manifest juga harus ada
+    manifest = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest and not staticfiles_storage.exists(manifest):
+        return ''
+    try:
+        with open(os.path.join(str(settings.STATIC_ROOT), STATIC_FINGERPRINT_FILE)) as fh:
+            return fh.read().strip()
+    except OSError:
+        return ''
+
+
+def demo_fingerprint() -> str:
+    """Hash source command setup_demo; berubah setiap data demo diubah"""
+    from .management.commands import setup_demo
+
+    with open(setup_demo.__file__, 'rb') as fh:
+        return _sha256([fh.read()])
+
+
+def stored_fingerprint(name: str, using: str = 'default') -> str:
+    return StartupFingerprint.objects.using(using).filter(name=name).values_list('fingerprint', flat=True).first() or ''
+
+
+def save_fingerprint(name: str, fingerprint: str, using: str = 'default'):
+    StartupFingerprint.objects.using(using).update_or_create(name=name, defaults={'fingerprint': fingerprint})
+
+
+# Langkah
+
+def _result(status: str, started: float, **extra) -> dict:
+    return dict(status=status, seconds=round(time.perf_counter() - started, 3), **extra)
+
+
+def run_migrate(force: bool = False, using: str = 'default') -> dict:
+    started = time.perf_counter()
+    pending = pending_migrations(using)
+    if not pending and not force:
+        return _result('skipped', started)
+    output = io.StringIO()
+    call_command('migrate', database=using, interactive=False, stdout=output)
+    return _result('ran', started, migrations=pending, output=output.getvalue())
+
+
+def run_static(force: bool = False) -> dict:
+    started = time.perf_counter()
+    fingerprint = static_fingerprint()
+    if fingerprint == stored_static_fingerprint() and not force:
+        return _result('skipped', started, fingerprint=fingerprint[:12])
+    output = io.StringIO()
+    call_command('collectstatic', interactive=False, verbosity=0, stdout=output)
+    with open(os.path.join(str(settings.STATIC_ROOT), STATIC_FINGERPRINT_FILE), 'w') as fh:
+        fh.write(fingerprint)
+    return _result('ran', started, fingerprint=fingerprint[:12], output=output.getvalue())
+
+
+def run_demo(force: bool = False, using: str = 'default') -> dict:
+    started = time.perf_counter()
+    fingerprint = demo_fingerprint()
+    if fingerprint == stored_fingerprint('demo', using) and not force:
+        return _result('skipped', started, fingerprint=fingerprint[:12])
+    output = io.StringIO()
+    call_command('setup_demo', database=using, stdout=output)
+    save_fingerprint('demo', fingerprint, using)
+    return _result('ran', started, fingerprint=fingerprint[:12], output=output.getvalue())
+
+
+@contextmanager
+def database_lock(using: str = 'default'):
+    """Advisory lock PostgreSQL (session) selama langkah database; no-op di database lain"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_lock(%s)', [BOOT_LOCK_ID])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(%s)', [BOOT_LOCK_ID])
+
+
+def _guarded(step, *args) -> dict:
+    started = time.perf_counter()
+    try:
+        return step(*args)
+    except Exception as e:
+        return _result('failed', started, error=f'{type(e).__name__}: {e}')
+
+
+def boot(steps=STEPS, force: bool = False, using: str = 'default') -> dict:
+    """
+    Jalankan langkah startup yang inputnya berubah
+
+    Args:
+        steps: Subset dari STEPS
+        force: Jalankan semua langkah walau fingerprint sama
+
+    Returns:
+        dict: nama langkah -> {status: ran/skipped/failed, seconds, ...}
+    """
+    results = {}
+
+    def static_step():
+        results['static'] = _guarded(run_static, force)
+
+    def database_steps():
+        started = time.perf_counter()
+        try:
+            with database_lock(using):
+                if 'migrate' in steps:
+                    results['migrate'] = _guarded(run_migrate, force, using)
+                # Data demo butuh schema terbaru
+                if 'demo' in steps and results.get('migrate', {}).get('status') != 'failed':
+                    results['demo'] = _guarded(run_demo, force, using)
+        except Exception as e:
+            # Database belum bisa dihubungi (lock)
+            step = 'migrate' if 'migrate' in steps else 'demo'
+            results.setdefault(step, _result('failed', started, error=f'{type(e).__name__}: {e}'))
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='boot') as executor:
+        futures = []
+        if 'static' in steps:
+            futures.append(executor.submit(static_step))
+        if 'migrate' in steps or 'demo' in steps:
+            futures.append(executor.submit(database_steps))
+        for future in futures:
+            future.result()
+    return {step: results[step] for step in STEPS if step in results}
@@ -0,0 +1,72 @@
+"""
+Dashboard Statistics
+Counter jumlah course / enrollment / material yang dipelihara secara inkremental
+
+Setiap counter disimpan sebagai satu baris di tabel `Statistic` dan di-update
+dengan `UPDATE ... SET value = value + 1` (F expression) dari signal
+post_save / post_delete, di dalam transaksi yang sama dengan perubahan data.
+Dashboard cukup membaca satu query kecil, bukan COUNT(*) per tabel.
+
+Operasi bulk yang melewati signal (`bulk_create`, `QuerySet.update`, SQL
+mentah) membuat counter drift; perbaiki dengan `manage.py reconcile_stats`
+(sekaligus menghitung ulang counter per course di courses.counters).
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Course, Enrollment, Material, Statistic
+
+
+# Nama statistik -> model yang dihitung
+STAT_MODELS = {
+    'total_courses': Course,
+    'total_enrollments': Enrollment,
+    'total_materials': Material,
+}
+STAT_NAMES = {model: name for name, model in STAT_MODELS.items()}
+
+
+def reconcile(name: str, using: str = 'default') -> tuple:
+    """
+    Hitung ulang satu statistik dengan COUNT(*) dan simpan hasilnya
+
+    Returns:
+        tuple: (nilai sebelumnya atau None, nilai baru)
+    """
+    with transaction.atomic(using=using):
+        previous = (
+            Statistic.objects.using(using).select_for_update()
+            .filter(name=name).values_list('value', flat=True).first()
+        )
+        value = STAT_MODELS[name]._default_manager.using(using).count()
+        if previous is None:
+            try:
+                with transaction.atomic(using=using):
+                    Statistic.objects.using(using).create(name=name, value=value)
+            except IntegrityError:
+                # Dibuat bersamaan oleh request lain
+                Statistic.objects.using(using).filter(name=name).update(value=value)
+        elif previous != value:
+            Statistic.objects.using(using).filter(name=name).update(value=value)
+    return previous, value
+
+
+def increment(model, delta: int, using: str = 'default'):
+    """Tambah/kurangi counter milik `model` secara atomik"""
+    name = STAT_NAMES[model]
+    updated = Statistic.objects.using(using).filter(name=name).update(value=F('value') + delta)
+    if not updated:
+        # Baris counter belum ada: inisialisasi dari COUNT(*) (sudah mencakup perubahan ini)
+        reconcile(name, using=using)
+
+
+def get_stats(using: str = 'default') -> dict:
+    """Semua statistik dashboard dalam satu query"""
+    stats = dict(
+        Statistic.objects.using(using)
+        .filter(name__in=STAT_MODELS).values_list('name', 'value')
+    )
+    for name in STAT_MODELS:
+        if name not in stats:
+            stats[name] = reconcile(name, using=using)[1]
+    return stats
@@ -1,3 +1,898 @@
-from django.test import TestCase
+import base64
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, connections
+from django.db.migrations import Migration
+from django.db.backends.postgresql.operations import DatabaseOperations as PostgresOperations
+from django.http import HttpResponse
+from django.template import engines
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from ninja_jwt.tokens import RefreshToken
+
+from . import api, hashing, health, preload, replicas, startup
+from .authentication import user_cache
+from .caching import invalidate, written_key
+from .hashing import HashingPoolBusy
+from .metrics import MetricsStore
+from .middleware import QueryBudgetExceeded, install_recorder, query_count_middleware
+from .models import Comment, Course, CourseContent, CourseMember, Enrollment, Statistic
+from .pagination import encode_cursor
+from .pooled_postgresql.base import (
+    POOL_GAUGES, DatabaseWrapper as PooledDatabaseWrapper, _forget_pools, collect_pool_stats,
+)
+from .search import search
+from .servermode import asgi_variant, async_under_asgi
+from .sessions import SessionStore
+from .stats import get_stats, reconcile
+from .throttling import CacheThrottleBackend, MemoryThrottleBackend, SQLiteThrottleBackend
+
+
+# Semua cache lokal per test (tanpa file /tmp yang dipakai bersama worker)
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'test-{alias}'}
+    for alias in ('default', 'api', 'sessions', 'template_fragments')
+}
+
+
+def forge_cursor(payload: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+@override_settings(CACHES=TEST_CACHES, SECURE_SSL_REDIRECT=False)
+class APITestCase(TestCase):
+    """Base test API: cache dan throttle bersih per test"""
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        user_cache.clear()
+        patcher = mock.patch('courses.throttling._backend', MemoryThrottleBackend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # File metric ke direktori sementara, bukan METRICS_DIR milik server
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch('courses.metrics._store', MetricsStore(directory=directory.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user('teacher1', password='rahasia123', is_staff=True)
+        cls.student = User.objects.create_user('student1', password='rahasia123')
+        cls.courses = [
+            Course.objects.create(
+                code=f'CS{index:02d}', name=f'Pemrograman {index}', price=index * 1000,
+                description='Dasar pemrograman' if index % 2 else 'Basis data', teacher=cls.teacher,
+            )
+            for index in range(1, 8)
+        ]
+        cls.content = CourseContent.objects.create(course_id=cls.courses[0], name='Pertemuan 1', description='Variabel')
+        cls.member = CourseMember.objects.create(course=cls.courses[0], user_id=cls.student, roles='student')
+        for index in range(3):
+            Comment.objects.create(content_id=cls.content, member_id=cls.member, comment=f'Komentar {index}')
+
+
+class CursorPaginationTests(APITestCase):
+
+    def walk(self, url: str, **params) -> list:
+        """Ikuti cursor `next` sampai habis, kembalikan semua id"""
+        ids, cursor = [], ''
+        while cursor is not None:
+            response = self.client.get(url, {**params, 'cursor': cursor, 'page_size': 3})
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            ids.extend(item['id'] for item in data['items'])
+            cursor = data['next']
+        return ids
+
+    def test_cursor_round_trip_matches_ordering(self):
+        expected = list(Course.objects.order_by('code').values_list('id', flat=True))
+        self.assertEqual(self.walk('/api/v1/courses'), expected)
+
+    def test_previous_cursor_returns_preceding_page(self):
+        first = self.client.get('/api/v1/courses', {'cursor': '', 'page_size': 3}).json()
+        second = self.client.get('/api/v1/courses', {'cursor': first['next'], 'page_size': 3}).json()
+        back = self.client.get('/api/v1/courses', {'cursor': second['previous'], 'page_size': 3}).json()
+        self.assertIsNone(first['previous'])
+        self.assertEqual(back['items'], first['items'])
+
+    def test_cursor_with_search_keeps_relevance_order(self):
+        offset = self.client.get('/api/v1/courses', {'search': 'pemrograman', 'page_size': 100}).json()
+        self.assertEqual(self.walk('/api/v1/courses', search='pemrograman'), [item['id'] for item in offset['items']])
+
+    def test_cursor_on_datetime_ordering(self):
+        expected = list(Comment.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(self.walk('/api/v1/comments'), expected)
+
+    def test_malformed_cursor_is_rejected(self):
+        response = self.client.get('/api/v1/courses', {'cursor': '!!!'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_forged_cursor_values_are_rejected(self):
+        cases = [
+            ('/api/v1/courses', {'p': ['x', 'y']}),
+            ('/api/v1/courses', {'p': ['CS01', None]}),
+            ('/api/v1/courses', {'p': ['CS01']}),
+            ('/api/v1/comments', {'p': ['notadate', 1]}),
+            ('/api/v1/comments', {'p': ['2020-01-01T00:00:00Z', 'abc']}),
+            ('/api/v1/comments', {'p': 'bukan-list'}),
+        ]
+        for url, payload in cases:
+            with self.subTest(url=url, payload=payload):
+                response = self.client.get(url, {'cursor': forge_cursor(payload)})
+                self.assertEqual(response.status_code, 400)
+
+    def test_valid_encoded_cursor_is_accepted(self):
+        cursor = encode_cursor(['CS03', self.courses[2].id])
+        items = self.client.get('/api/v1/courses', {'cursor': cursor}).json()['items']
+        self.assertEqual(items[0]['id'], self.courses[3].id)
+
+
+class InlineExecutor:
+    """Pengganti ProcessPoolExecutor: job dijalankan langsung"""
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+
+class StuckExecutor:
+    """Pengganti ProcessPoolExecutor yang job-nya tidak pernah selesai"""
+
+    def submit(self, func, *args):
+        return Future()
+
+
+@mock.patch('courses.hashing.PASSWORD_HASHING_MODE', 'pool')
+@mock.patch('courses.hashing.PASSWORD_HASHER_HOST_SLOTS', 0)
+class HashingPoolTests(APITestCase):
+
+    def login(self, password: str):
+        return self.client.post(
+            '/api/v1/login', {'username': 'student1', 'password': password}, content_type='application/json',
+        )
+
+    def test_successful_login_in_pool_mode(self):
+        with mock.patch('courses.hashing._get_executor', return_value=InlineExecutor()):
+            response = self.login('rahasia123')
+        self.assertEqual(response.status_code, 200)
+
+    def test_failed_login_sends_user_login_failed(self):
+        received = []
+
+        def handler(sender, credentials, request=None, **kwargs):
+            received.append(credentials)
+
+        user_login_failed.connect(handler)
+        self.addCleanup(user_login_failed.disconnect, handler)
+        with mock.patch('courses.hashing._get_executor', return_value=InlineExecutor()):
+            response = self.login('salah12345')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]['username'], 'student1')
+        self.assertNotEqual(received[0]['password'], 'salah12345')
+
+    @mock.patch('courses.hashing.PASSWORD_HASHER_TIMEOUT', 0.01)
+    def test_hashing_timeout_returns_503(self):
+        with mock.patch('courses.hashing._get_executor', return_value=StuckExecutor()):
+            response = self.login('rahasia123')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+    @mock.patch('courses.hashing.PASSWORD_HASHER_TIMEOUT', 0.01)
+    def test_timed_out_job_holds_slots_until_it_finishes(self):
+        running = Future()
+        running.set_running_or_notify_cancel()
+        executor = mock.Mock(**{'submit.return_value': running})
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        queue_slots = threading.BoundedSemaphore(1)
+        with mock.patch('courses.hashing._get_executor', return_value=executor), \
+                mock.patch('courses.hashing._queue_slots', queue_slots), \
+                mock.patch('courses.hashing.PASSWORD_HASHER_HOST_SLOTS', 1), \
+                mock.patch('courses.hashing.PASSWORD_HASHER_LOCK_DIR', directory.name):
+            self.assertEqual(self.login('rahasia123').status_code, 503)
+            # Job di child process masih berjalan: slot antrean dan slot host tetap terpakai
+            self.assertFalse(queue_slots.acquire(blocking=False))
+            with self.assertRaises(HashingPoolBusy):
+                hashing._acquire_host_slot()
+
+            running.set_result(True)
+            self.assertTrue(queue_slots.acquire(blocking=False))
+            hashing._acquire_host_slot()()
+
+
+class ConditionalGetTests(APITestCase):
+
+    def test_200_carries_validators(self):
+        response = self.client.get('/api/v1/courses')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_if_none_match_returns_304_with_validators(self):
+        first = self.client.get('/api/v1/courses')
+        response = self.client.get('/api/v1/courses', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response['Last-Modified'], first['Last-Modified'])
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since_returns_304(self):
+        first = self.client.get(f'/api/v1/courses/{self.courses[0].id}')
+        response = self.client.get(
+            f'/api/v1/courses/{self.courses[0].id}', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'],
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+
+    def test_write_changes_etag(self):
+        first = self.client.get('/api/v1/courses')
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(code='CS99', name='Baru')
+        response = self.client.get('/api/v1/courses', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_update_without_new_max_changes_etag(self):
+        first = self.client.get('/api/v1/courses')
+        with self.captureOnCommitCallbacks(execute=True):
+            # Update di tempat pada baris lama: MAX(updated_at) dan COUNT tetap
+            Course.objects.filter(pk=self.courses[0].pk).update(name='Diubah')
+            invalidate('courses')
+        response = self.client.get('/api/v1/courses', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_pages_share_one_aggregate(self):
+        first = self.client.get('/api/v1/courses', {'cursor': '', 'page_size': 3}).json()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/courses', {'cursor': first['next'], 'page_size': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if 'MAX(' in query['sql'].upper()])
+
+
+class ResponseCacheTests(APITestCase):
+
+    def test_repeated_request_is_served_from_cache(self):
+        self.client.get('/api/v1/comments')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/comments')
+        self.assertEqual(response.status_code, 200)
+
+    def test_write_invalidates_cached_response(self):
+        before = self.client.get('/api/v1/courses', {'page_size': 100}).json()
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(code='CS99', name='Baru')
+        after = self.client.get('/api/v1/courses', {'page_size': 100}).json()
+        self.assertEqual(after['count'], before['count'] + 1)
+        self.assertIn('Baru', [item['name'] for item in after['items']])
+
+    def test_throttle_applies_to_cache_hits(self):
+        statuses = [self.client.get('/api/v1/comments').status_code for _ in range(31)]
+        self.assertEqual(statuses[:30], [200] * 30)
+        self.assertEqual(statuses[30], 429)
+
+
+class CounterTests(APITestCase):
+
+    def counts(self, course):
+        course.refresh_from_db()
+        return course.enrollment_count, course.content_count, course.member_count
+
+    def test_create_and_delete_update_counters(self):
+        course = self.courses[1]
+        enrollment = Enrollment.objects.create(student=self.student, course=course)
+        content = CourseContent.objects.create(course_id=course, name='Pertemuan 1')
+        self.assertEqual(self.counts(course), (1, 1, 0))
+
+        enrollment.delete()
+        content.delete()
+        self.assertEqual(self.counts(course), (0, 0, 0))
+
+    def test_comment_count_follows_comments(self):
+        self.content.refresh_from_db()
+        self.assertEqual(self.content.comment_count, 3)
+        Comment.objects.filter(content_id=self.content).first().delete()
+        self.content.refresh_from_db()
+        self.assertEqual(self.content.comment_count, 2)
+
+    def test_cascade_delete_skips_counters_of_deleted_parents(self):
+        course = self.courses[0]
+        with CaptureQueriesContext(connection) as queries:
+            course.delete()
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertFalse([sql for sql in updates if '"courses_course"' in sql or '"courses_coursecontent"' in sql])
+        self.assertFalse(CourseContent.objects.filter(pk=self.content.pk).exists())
+
+    def test_cascade_from_user_updates_surviving_parents(self):
+        other = CourseContent.objects.create(course_id=self.courses[1], name='Pertemuan 2')
+        member = CourseMember.objects.create(course=self.courses[1], user_id=self.student, roles='student')
+        Comment.objects.create(content_id=other, member_id=member, comment='Halo')
+        self.assertEqual(self.counts(self.courses[1])[2], 1)
+
+        self.student.delete()
+        other.refresh_from_db()
+        self.content.refresh_from_db()
+        self.assertEqual(self.counts(self.courses[0])[2], 0)
+        self.assertEqual(self.counts(self.courses[1])[2], 0)
+        self.assertEqual((other.comment_count, self.content.comment_count), (0, 0))
+
+
+class ThrottleBackendTests(TestCase):
+    """Sliding window counter, sama untuk setiap backend"""
+
+    def backends(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return [
+            MemoryThrottleBackend(),
+            SQLiteThrottleBackend(location=os.path.join(directory.name, 'throttle.sqlite3')),
+            CacheThrottleBackend(alias='default'),
+        ]
+
+    @override_settings(CACHES=TEST_CACHES)
+    def test_rejects_after_limit_within_window(self):
+        for backend in self.backends():
+            with self.subTest(backend=type(backend).__name__):
+                results = [backend.hit('scope|60|1.2.3.4', 3, 60, now=6000.0 + i) for i in range(4)]
+                self.assertEqual(results, [True, True, True, False])
+                # Request yang ditolak tidak ikut dihitung
+                self.assertEqual(backend.usage('scope|60|1.2.3.4', 60, now=6004.0), 3)
+
+    @override_settings(CACHES=TEST_CACHES)
+    def test_previous_window_is_weighted(self):
+        for backend in self.backends():
+            with self.subTest(backend=type(backend).__name__):
+                for i in range(4):
+                    backend.hit('scope|60|5.6.7.8', 4, 60, now=6000.0 + i)
+                # Seperempat window berikutnya: 4 * 0.75 = 3 masih terhitung
+                self.assertTrue(backend.hit('scope|60|5.6.7.8', 4, 60, now=6075.0))
+                self.assertFalse(backend.hit('scope|60|5.6.7.8', 4, 60, now=6075.0))
+                # Dua window kemudian semua request lama terlupakan
+                self.assertTrue(backend.hit('scope|60|5.6.7.8', 4, 60, now=6200.0))
+
+    @override_settings(CACHES=TEST_CACHES)
+    def test_keys_are_independent(self):
+        for backend in self.backends():
+            with self.subTest(backend=type(backend).__name__):
+                self.assertTrue(backend.hit('scope|60|9.9.9.1', 1, 60, now=6000.0))
+                self.assertFalse(backend.hit('scope|60|9.9.9.1', 1, 60, now=6001.0))
+                self.assertTrue(backend.hit('scope|60|9.9.9.2', 1, 60, now=6001.0))
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        backend = MemoryThrottleBackend(max_keys=2)
+        for key in ('a', 'b', 'c'):
+            backend.hit(key, 10, 60, now=6000.0)
+        self.assertEqual(backend.keys(), ['b', 'c'])
+
+
+class ThrottleDecoratorTests(APITestCase):
+
+    def test_endpoint_rejects_with_429_after_limit(self):
+        payload = {'username': 'student1', 'password': 'salah12345'}
+        statuses = [
+            self.client.post('/api/v1/auth/login', payload, content_type='application/json').status_code
+            for _ in range(6)
+        ]
+        self.assertEqual(statuses, [401] * 5 + [429])
+
+    def test_limit_is_per_client_ip(self):
+        for _ in range(30):
+            self.client.get('/api/v1/comments')
+        self.assertEqual(self.client.get('/api/v1/comments').status_code, 429)
+        self.assertEqual(self.client.get('/api/v1/comments', REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+
+@override_settings(SESSION_ENGINE='courses.sessions')
+class SessionEngineTests(APITestCase):
+
+    def cached(self, session_key: str):
+        return caches['sessions'].get(SessionStore(session_key).cache_key)
+
+    def test_logout_removes_cached_session(self):
+        self.client.force_login(self.student)
+        session_key = self.client.session.session_key
+        self.assertIsNotNone(self.cached(session_key))
+
+        self.client.get('/logout/')
+        self.assertIsNone(self.cached(session_key))
+        self.assertFalse(SessionStore().exists(session_key))
+
+    def test_expiry_only_save_is_skipped(self):
+        session = SessionStore()
+        session['cart'] = [1]
+        session.save()
+
+        with self.assertNumQueries(0):
+            unchanged = SessionStore(session.session_key)
+            unchanged.get('cart')
+            unchanged.save()
+
+        changed = SessionStore(session.session_key)
+        changed['cart'] = [1, 2]
+        with CaptureQueriesContext(connection) as queries:
+            changed.save()
+        self.assertTrue(queries)
+
+
+class MemberFilterTests(APITestCase):
+
+    def get_members(self, **params):
+        token = RefreshToken.for_user(self.teacher).access_token
+        return self.client.get('/api/v1/members', params, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_roles_filter_is_exact(self):
+        self.assertEqual([item['id'] for item in self.get_members(roles='Student').json()['items']], [self.member.id])
+        self.assertEqual(self.get_members(roles='stud').json()['items'], [])
+
+    def test_roles_filter_uses_composite_index(self):
+        plan = CourseMember.objects.filter(roles='student').order_by('-joined_at', '-id').explain()
+        self.assertIn('member_roles_recent_idx', plan)
+
+
+class ServerModeTests(TestCase):
+
+    def test_read_views_are_sync_under_wsgi(self):
+        for view in (api.get_current_user, api.list_courses, api.get_course, api.list_contents, api.list_comments):
+            with self.subTest(view=view.__name__):
+                self.assertFalse(inspect.iscoroutinefunction(view))
+
+    @mock.patch('courses.servermode.ASYNC_VIEWS', True)
+    def test_asgi_mode_serves_coroutines(self):
+        def get_item(request, item_id: int):
+            return item_id
+
+        async def aget_item(request, item_id: int):
+            return -item_id
+
+        lazy = async_under_asgi(get_item)
+        variant = asgi_variant(aget_item)(get_item)
+        self.assertTrue(inspect.iscoroutinefunction(lazy))
+        self.assertTrue(inspect.iscoroutinefunction(variant))
+        self.assertEqual(variant.__name__, 'get_item')
+        self.assertEqual(async_to_sync(lazy)(None, 3), 3)
+        self.assertEqual(async_to_sync(variant)(None, 3), -3)
+
+
+class StatsTests(APITestCase):
+
+    def stat(self, name: str) -> int:
+        return Statistic.objects.get(name=name).value
+
+    def test_create_and_delete_update_stats(self):
+        self.assertEqual(get_stats()['total_courses'], 7)
+        course = Course.objects.create(code='CS50', name='Statistik')
+        Enrollment.objects.create(student=self.student, course=course)
+        self.assertEqual(self.stat('total_courses'), 8)
+        self.assertEqual(self.stat('total_enrollments'), 1)
+
+        course.delete()
+        self.assertEqual(self.stat('total_courses'), 7)
+        self.assertEqual(self.stat('total_enrollments'), 0)
+
+    def test_reconcile_repairs_bulk_drift(self):
+        get_stats()
+        # bulk_create tidak mengirim signal: counter tertinggal
+        Course.objects.bulk_create([Course(code='CS60', name='Bulk 1'), Course(code='CS61', name='Bulk 2')])
+        self.assertEqual(get_stats()['total_courses'], 7)
+        self.assertEqual(reconcile('total_courses'), (7, 9))
+        self.assertEqual(get_stats()['total_courses'], 9)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StatsTransactionTests(TransactionTestCase):
+
+    def test_failed_stats_update_rolls_back_insert(self):
+        with mock.patch('courses.signals.increment', side_effect=DatabaseError('statistik gagal')):
+            with self.assertRaises(DatabaseError):
+                Course.objects.create(code='CS70', name='Atomik')
+        self.assertFalse(Course.objects.filter(code='CS70').exists())
+
+
+class CourseDetailPageTests(APITestCase):
+
+    def test_pagination_counts_rows_not_counters(self):
+        Course.objects.filter(pk=self.courses[0].pk).update(instructor=self.teacher)
+        Enrollment.objects.create(student=self.student, course=self.courses[0])
+        # Counter drift (misal operasi bulk): halaman tetap memakai COUNT(*)
+        Course.objects.filter(pk=self.courses[0].pk).update(enrollment_count=0)
+        response = self.client.get(f'/courses/{self.courses[0].pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['enrollments'].paginator.count, 1)
+        self.assertEqual(len(response.context['enrollments'].object_list), 1)
+
+
+class QueryInspectorTests(APITestCase):
+
+    def run_view(self, view):
+        install_recorder(connection)
+        return query_count_middleware(view)(RequestFactory().get('/inspect'))
+
+    def test_headers_report_query_count(self):
+        response = self.client.get('/api/v1/courses')
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+    def test_budget_violation_raises_in_tests(self):
+        with mock.patch.dict('courses.middleware.QUERY_BUDGETS', {'api-1.0.0:list_courses': 1}):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'budget 1'):
+                self.client.get('/api/v1/courses')
+
+    @mock.patch('courses.middleware.QUERY_BUDGET_RAISE', False)
+    def test_budget_violation_is_logged_when_not_raising(self):
+        with mock.patch.dict('courses.middleware.QUERY_BUDGETS', {'api-1.0.0:list_courses': 1}):
+            with self.assertLogs('courses.queries', 'WARNING') as logs:
+                response = self.client.get('/api/v1/courses')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(logs.records[0].getMessage())['budget'], 1)
+
+    def test_repeated_query_shape_is_reported_as_n_plus_one(self):
+        def view(request):
+            # Satu query teacher per course
+            return HttpResponse(','.join(course.teacher.username for course in Course.objects.all()))
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'N+1: 7x'):
+            self.run_view(view)
+
+    def test_clean_request_skips_log_serialisation(self):
+        with mock.patch('courses.middleware.json.dumps') as dumps:
+            self.run_view(lambda request: HttpResponse('ok'))
+        dumps.assert_not_called()
+
+
+class MetricsEndpointTests(APITestCase):
+
+    def test_denied_without_token_by_default(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    @mock.patch('courses.metrics.METRICS_TOKEN', 'rahasia')
+    def test_token_is_required_when_set(self):
+        self.client.get('/api/v1/courses')
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer rahasia')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('lms_http_requests_total{', response.content.decode())
+
+    @mock.patch('courses.metrics.METRICS_PUBLIC', True)
+    def test_public_mode_serves_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+
+class FragmentCacheTests(APITestCase):
+
+    def test_course_card_is_cached_until_course_changes(self):
+        Course.objects.update(instructor=self.teacher)
+        course = self.courses[0]
+        self.assertContains(self.client.get('/courses/'), 'Pemrograman 1')
+
+        # update() tidak mengubah updated_at: kartu lama tetap dipakai
+        Course.objects.filter(pk=course.pk).update(name='Nama Baru')
+        self.assertNotContains(self.client.get('/courses/'), 'Nama Baru')
+
+        course.refresh_from_db()
+        course.save()
+        self.assertContains(self.client.get('/courses/'), 'Nama Baru')
+
+
+class SearchTests(APITestCase):
+
+    def codes(self, query: str) -> list:
+        return list(search(Course.objects.all(), query).values_list('code', flat=True))
+
+    def test_prefix_terms_must_all_match(self):
+        self.assertEqual(len(self.codes('pemrog')), 7)
+        self.assertEqual(self.codes('pemrog basis'), ['CS02', 'CS04', 'CS06'])
+        self.assertEqual(self.codes('tidakada'), [])
+
+    def test_more_relevant_rows_rank_first(self):
+        Course.objects.create(code='PY01', name='Python', description='Python untuk analisis data dengan python')
+        Course.objects.create(code='PY02', name='Statistik', description='Contoh kode memakai python')
+        self.assertEqual(self.codes('python'), ['PY01', 'PY02'])
+        response = self.client.get('/api/v1/courses', {'search': 'python'})
+        self.assertEqual([item['name'] for item in response.json()['items']], ['Python', 'Statistik'])
+
+    def test_query_without_words_falls_back_to_icontains(self):
+        Course.objects.create(code='CPP1', name='C++ Dasar')
+        results = search(Course.objects.all(), '++')
+        self.assertEqual([course.code for course in results], ['CPP1'])
+        self.assertEqual(results[0].search_rank, 0.0)
+
+    def test_signals_keep_index_in_sync(self):
+        course, pk = self.courses[0], self.courses[0].pk
+        self.assertEqual(self.codes('pemrograman 1'), ['CS01'])
+        course.name = 'Jaringan Komputer'
+        course.save()
+        self.assertEqual(self.codes('jaringan'), ['CS01'])
+        self.assertEqual(self.codes('pemrograman 1'), [])
+
+        course.delete()
+        self.assertEqual(self.codes('jaringan'), [])
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM "courses_course_fts" WHERE rowid = %s', [pk])
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+class TrigramIndexTests(APITestCase):
+    migration = import_module('courses.migrations.0004_user_trigram_indexes')
+
+    def statements(self, vendor: str) -> list:
+        schema_editor = mock.Mock(**{'connection.vendor': vendor})
+        self.migration.create_trigram_indexes(django_apps, schema_editor)
+        return [call.args[0] for call in schema_editor.execute.call_args_list]
+
+    def test_index_expression_matches_postgres_icontains(self):
+        statements = self.statements('postgresql')
+        self.assertEqual(statements[0], 'CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in self.migration.TRIGRAM_COLUMNS:
+            # Ekspresi yang sama dengan hasil kompilasi `<column>__icontains` di PostgreSQL
+            lookup = PostgresOperations(mock.Mock()).lookup_cast('icontains', 'CharField') % f'"{column}"'
+            with self.subTest(column=column):
+                self.assertTrue(any(f'gin (({lookup}) gin_trgm_ops)' in sql for sql in statements))
+
+    def test_other_databases_are_skipped(self):
+        self.assertEqual(self.statements('sqlite'), [])
+
+    def test_user_search_matches_substrings(self):
+        token = RefreshToken.for_user(self.teacher).access_token
+        response = self.client.get('/api/v1/users', {'search': 'DENT'}, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual([item['username'] for item in response.json()['items']], ['student1'])
+
+
+class JWTUserCacheTests(APITestCase):
+
+    def me(self):
+        token = RefreshToken.for_user(self.student).access_token
+        return self.client.get('/api/v1/me', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_cached_user_skips_user_query(self):
+        self.assertEqual(self.me().status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.me().status_code, 200)
+        self.assertFalse([query for query in queries if 'auth_user' in query['sql']])
+
+    def test_deactivation_through_save_is_immediate(self):
+        self.assertEqual(self.me().status_code, 200)
+        self.student.is_active = False
+        self.student.save()
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_deactivation_without_signal_applies_after_ttl(self):
+        self.assertEqual(self.me().status_code, 200)
+        User.objects.filter(pk=self.student.pk).update(is_active=False)
+        self.assertEqual(self.me().status_code, 200)
+
+        expired = time.monotonic() + user_cache.ttl + 1
+        with mock.patch('courses.authentication.time.monotonic', return_value=expired):
+            self.assertEqual(self.me().status_code, 401)
+
+
+class HealthProbeTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Cache hasil readiness per proses dimulai kosong di setiap test
+        for name, value in (('_ready_result', None), ('_ready_expires', 0.0)):
+            patcher = mock.patch.object(health, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_liveness_does_not_touch_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/live')
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_readiness_result_is_cached(self):
+        first = self.client.get('/health/ready')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual((first.json()['status'], first.json()['cached']), ('ready', False))
+        with self.assertNumQueries(0):
+            second = self.client.get('/health/ready')
+        self.assertTrue(second.json()['cached'])
+
+    def test_pending_migrations_are_not_ready(self):
+        pending = [(Migration('0099_baru', 'courses'), False)]
+        with mock.patch('courses.health.MigrationExecutor.migration_plan', return_value=pending):
+            response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['pending_migrations'], ['courses.0099_baru'])
+
+
+
+@override_settings(CACHES=TEST_CACHES)
+@mock.patch('courses.replicas.DATABASE_REPLICAS', ['replica1'])
+class ReplicaRoutingTests(SimpleTestCase):
+    """Keputusan router diuji tanpa database replica sungguhan"""
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        self.factory = RequestFactory()
+        self.router = replicas.ReplicaRouter()
+
+    def serve(self, request, write=False, namespaces=()):
+        """Jalankan view `@use_replica` lewat middleware; returns (response, alias baca)"""
+        seen = []
+
+        @replicas.use_replica(*namespaces)
+        def view(request):
+            seen.append(self.router.db_for_read(Course))
+            if write:
+                self.router.db_for_write(Course)
+                seen.append(self.router.db_for_read(Course))
+            return HttpResponse()
+
+        response = replicas.replica_middleware(view)(request)
+        return response, seen
+
+    def test_reads_use_replica_until_request_writes(self):
+        response, seen = self.serve(self.factory.post('/'), write=True)
+        self.assertEqual(seen, ['replica1', 'default'])
+        self.assertIn(replicas.STICKY_COOKIE, response.cookies)
+
+    def test_read_only_request_is_not_sticky(self):
+        response, seen = self.serve(self.factory.get('/'))
+        self.assertEqual(seen, ['replica1'])
+        self.assertNotIn(replicas.STICKY_COOKIE, response.cookies)
+
+    def test_sticky_cookie_reads_from_primary(self):
+        request = self.factory.get('/')
+        request.COOKIES[replicas.STICKY_COOKIE] = '1'
+        self.assertEqual(self.serve(request)[1], ['default'])
+
+    def test_jwt_writer_sticks_without_cookie(self):
+        user = User(pk=42, username='penulis')
+        header = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        self.serve(self.factory.post('/', **header), write=True)
+        self.assertEqual(self.serve(self.factory.get('/', **header))[1], ['default'])
+        self.assertEqual(self.serve(self.factory.get('/'))[1], ['replica1'])
+
+    def test_recently_written_namespace_reads_from_primary(self):
+        caches[settings.API_CACHE_ALIAS].set(written_key('courses'), 1)
+        self.assertEqual(self.serve(self.factory.get('/'), namespaces=('courses',))[1], ['default'])
+        self.assertEqual(self.serve(self.factory.get('/'), namespaces=('contents',))[1], ['replica1'])
+
+    def test_routing_state_follows_async_view_into_threads(self):
+        @replicas.use_replica()
+        async def view(request):
+            alias = await sync_to_async(self.router.db_for_read)(Course)
+            return HttpResponse(alias)
+
+        response = async_to_sync(replicas.replica_middleware(view))(self.factory.get('/'))
+        self.assertEqual(response.content, b'replica1')
+        self.assertEqual(self.router.db_for_read(Course), 'default')
+
+
+class FakePool:
+    """Pengganti psycopg_pool.ConnectionPool: hanya `pop_stats()`"""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def pop_stats(self) -> dict:
+        stats, self.stats = self.stats, {key: value for key, value in self.stats.items() if key in POOL_GAUGES}
+        return stats
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Metric pool diuji dengan pool palsu (tanpa server PostgreSQL)"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = MetricsStore(directory=directory.name)
+        patcher = mock.patch('courses.metrics._store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def wrapper(self):
+        settings_dict = dict(connections.settings[DEFAULT_DB_ALIAS], OPTIONS={})
+        return PooledDatabaseWrapper(settings_dict, 'pooled')
+
+    def test_collector_exports_gauges_and_counter_deltas(self):
+        pool = FakePool({
+            'pool_size': 4, 'pool_available': 1, 'requests_waiting': 2,
+            'requests_num': 10, 'requests_wait_ms': 1500, 'connections_lost': 0,
+        })
+        with mock.patch.dict(PooledDatabaseWrapper._connection_pools, {'default': pool}, clear=True):
+            collect_pool_stats(self.store)
+            collect_pool_stats(self.store)
+
+        labels = (('alias', 'default'),)
+        self.assertEqual(self.store.gauges[('lms_db_pool_size', labels)], 4)
+        self.assertEqual(self.store.gauges[('lms_db_pool_requests_waiting', labels)], 2)
+        # Counter dari pop_stats() adalah selisih: pemanggilan kedua tidak menambah
+        self.assertEqual(self.store.counters[('lms_db_pool_requests_total', labels)], 10)
+        self.assertEqual(self.store.counters[('lms_db_pool_wait_seconds_total', labels)], 1.5)
+        self.assertNotIn(('lms_db_pool_connections_lost_total', labels), self.store.counters)
+
+    def test_checkout_latency_is_observed_only_with_pool(self):
+        wrapper = self.wrapper()
+        with mock.patch('django.db.backends.postgresql.base.DatabaseWrapper.get_new_connection', return_value='conn'):
+            self.assertEqual(wrapper.get_new_connection({}), 'conn')
+            self.assertEqual(self.store.histograms, {})
+            with mock.patch.object(PooledDatabaseWrapper, 'pool', FakePool({})):
+                self.assertEqual(wrapper.get_new_connection({}), 'conn')
+
+        _, _, count = self.store.histograms[('lms_db_pool_checkout_seconds', (('alias', 'pooled'),))]
+        self.assertEqual(count, 1)
+
+    def test_child_process_forgets_parent_pools(self):
+        with mock.patch.dict(PooledDatabaseWrapper._connection_pools, {'default': FakePool({})}, clear=True):
+            _forget_pools()
+            self.assertEqual(PooledDatabaseWrapper._connection_pools, {})
+
+
+class StartupTests(TestCase):
+    """Langkah boot dilewati selama fingerprint-nya tidak berubah"""
+
+    def test_migrate_is_skipped_without_pending_migrations(self):
+        with mock.patch('courses.startup.call_command') as command:
+            self.assertEqual(startup.run_migrate()['status'], 'skipped')
+        command.assert_not_called()
+
+    def test_demo_runs_once_per_fingerprint(self):
+        with mock.patch('courses.startup.call_command') as command:
+            self.assertEqual(startup.run_demo()['status'], 'ran')
+            self.assertEqual(startup.run_demo()['status'], 'skipped')
+            self.assertEqual(command.call_count, 1)
+            with mock.patch('courses.startup.demo_fingerprint', return_value='setup_demo diubah'):
+                self.assertEqual(startup.run_demo()['status'], 'ran')
+            self.assertEqual(startup.run_demo(force=True)['status'], 'ran')
+        self.assertEqual(command.call_count, 3)
+
+    def test_static_runs_again_only_when_sources_change(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with override_settings(STATIC_ROOT=directory.name), \
+                mock.patch('courses.startup.call_command') as command:
+            self.assertEqual(startup.run_static()['status'], 'ran')
+            self.assertEqual(startup.run_static()['status'], 'skipped')
+            with mock.patch('courses.startup.static_fingerprint', return_value='file static baru'):
+                self.assertEqual(startup.run_static()['status'], 'ran')
+        self.assertEqual(command.call_count, 2)
+
+    def test_failed_migrate_skips_demo(self):
+        failing = mock.Mock(side_effect=DatabaseError('database belum siap'))
+        demo = mock.Mock()
+        with mock.patch('courses.startup.run_migrate', failing), mock.patch('courses.startup.run_demo', demo):
+            results = startup.boot(steps=('migrate', 'demo'))
+        self.assertEqual(results['migrate']['status'], 'failed')
+        self.assertIn('database belum siap', results['migrate']['error'])
+        self.assertNotIn('demo', results)
+        demo.assert_not_called()
+
+
+class PreloadTests(SimpleTestCase):
+
+    def test_warm_up_compiles_project_templates_without_queries(self):
+        names = preload._project_templates()
+        self.assertIn('courses/course_list.html', names)
+        self.assertFalse([name for name in names if name.startswith('admin/')])
+
+        engine = engines['django'].engine
+        engine.template_loaders[0].reset()
+        with mock.patch('courses.preload.connections.close_all') as close_all:
+            timings = preload.warm_up()
+        close_all.assert_called_once()
+
+        self.assertEqual(set(timings), {'urls', 'openapi', 'templates'})
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+        # Key cached loader = nama template (tanpa skip)
+        self.assertLessEqual(set(names), set(engine.template_loaders[0].get_template_cache))
@@ -1,59 +1,306 @@
 """
 Throttling (Rate Limiting) Implementation
 Membatasi jumlah request per IP address dalam periode waktu tertentu
+
+Menggunakan algoritma sliding window counter: setiap key hanya menyimpan
+(awal window, jumlah request window sekarang, jumlah request window
+sebelumnya), sehingga kerja dan memori per request konstan. Key yang idle
+dibuang secara LRU setelah jumlah key mencapai THROTTLE_MAX_KEYS.
+
+Backend penyimpanan dipilih lewat setting THROTTLE_BACKEND:
+- MemoryThrottleBackend: memori per proses (limit berlaku per worker)
+- SQLiteThrottleBackend: file SQLite (WAL) dipakai bersama semua worker di host
+- CacheThrottleBackend: Django cache (Redis/Memcached untuk lintas host)
 """
 from ninja.errors import HttpError
+from asgiref.sync import sync_to_async
 from functools import wraps
-from collections import defaultdict
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from .metrics import record_throttle_rejection
+import inspect
+import os
+import random
+import sqlite3
+import threading
 import time
 
 
-# Request tracker untuk menyimpan history request per IP
-request_tracker = defaultdict(list)
+THROTTLE_MAX_KEYS = getattr(settings, 'THROTTLE_MAX_KEYS', 10000)
+
+
+class MemoryThrottleBackend:
+    """
+    Penyimpanan sliding window counter di memori proses (LRU terbatas)
+
+    Setiap entry: key -> [window_start, current_count, previous_count]
+    """
+
+    def __init__(self, max_keys: int = THROTTLE_MAX_KEYS):
+        self.max_keys = max_keys
+        self.windows = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _roll(entry: list, time_window: int, now: float) -> list:
+        """Geser window jika waktu sudah melewati window aktif"""
+        window_start = now - (now % time_window)
+        if entry[0] == window_start:
+            return entry
+        if entry[0] == window_start - time_window:
+            return [window_start, 0, entry[1]]
+        return [window_start, 0, 0]
+
+    @staticmethod
+    def _estimate(entry: list, time_window: int, now: float) -> float:
+        """Perkiraan jumlah request dalam time_window detik terakhir"""
+        elapsed = (now - entry[0]) / time_window
+        return entry[2] * (1 - elapsed) + entry[1]
+
+    def hit(self, key: str, max_requests: int, time_window: int, now: float = None) -> bool:
+        """
+        Catat satu request untuk key jika masih di bawah limit
+
+        Returns:
+            bool: True jika request diperbolehkan
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.windows.get(key, [0, 0, 0])
+            entry = self._roll(entry, time_window, now)
+            allowed = self._estimate(entry, time_window, now) < max_requests
+            if allowed:
+                entry[1] += 1
+            self.windows[key] = entry
+            self.windows.move_to_end(key)
+            while len(self.windows) > self.max_keys:
+                self.windows.popitem(last=False)
+        return allowed
+
+    def usage(self, key: str, time_window: int, now: float = None) -> float:
+        """Perkiraan jumlah request untuk key tanpa mencatat request baru"""
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.windows.get(key)
+        if entry is None:
+            return 0
+        return self._estimate(self._roll(entry, time_window, now), time_window, now)
+
+    def keys(self) -> list:
+        with self.lock:
+            return list(self.windows.keys())
+
+    def purge(self, max_age: int, now: float = None):
+        """Hapus key yang tidak aktif lebih dari max_age detik"""
+        now = time.time() if now is None else now
+        with self.lock:
+            for key in [k for k, entry in self.windows.items() if now - entry[0] > max_age]:
+                del self.windows[key]
+
+
+class SQLiteThrottleBackend:
+    """
+    Sliding window counter di file SQLite (mode WAL) yang dipakai bersama
+
+    Semua worker gunicorn di satu host membuka file yang sama; setiap hit
+    dijalankan dalam transaksi `BEGIN IMMEDIATE` sehingga read-modify-write
+    bersifat atomik antar proses. Key idle dibuang berdasarkan waktu akses
+    terakhir ketika jumlah baris melebihi THROTTLE_MAX_KEYS.
+    """
+
+    PRUNE_PROBABILITY = 0.01
+
+    def __init__(self, location: str = None, max_keys: int = THROTTLE_MAX_KEYS):
+        self.location = location or getattr(settings, 'THROTTLE_LOCATION', '/tmp/lms_throttle.sqlite3')
+        self.max_keys = max_keys
+        self.local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Koneksi per thread dan per proses (aman setelah fork gunicorn)
+        if getattr(self.local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.location, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS throttle ('
+                'key TEXT PRIMARY KEY, window_start REAL, current INTEGER, '
+                'previous INTEGER, touched REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS throttle_touched ON throttle (touched)')
+            self.local.conn, self.local.pid = conn, os.getpid()
+        return self.local.conn
+
+    def _read(self, conn, key: str) -> list:
+        row = conn.execute(
+            'SELECT window_start, current, previous FROM throttle WHERE key = ?', (key,)
+        ).fetchone()
+        return list(row) if row else [0, 0, 0]
+
+    def hit(self, key: str, max_requests: int, time_window: int, now: float = None) -> bool:
+        now = time.time() if now is None else now
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            entry = MemoryThrottleBackend._roll(self._read(conn, key), time_window, now)
+            allowed = MemoryThrottleBackend._estimate(entry, time_window, now) < max_requests
+            if allowed:
+                entry[1] += 1
+            conn.execute(
+                'INSERT OR REPLACE INTO throttle (key, window_start, current, previous, touched) '
+                'VALUES (?, ?, ?, ?, ?)', (key, *entry, now)
+            )
+            if random.random() < self.PRUNE_PROBABILITY:
+                self._prune(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed
+
+    def _prune(self, conn):
+        excess = conn.execute('SELECT COUNT(*) FROM throttle').fetchone()[0] - self.max_keys
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM throttle WHERE key IN '
+                '(SELECT key FROM throttle ORDER BY touched LIMIT ?)', (excess,)
+            )
+
+    def usage(self, key: str, time_window: int, now: float = None) -> float:
+        now = time.time() if now is None else now
+        entry = MemoryThrottleBackend._roll(self._read(self._connection(), key), time_window, now)
+        return MemoryThrottleBackend._estimate(entry, time_window, now)
+
+    def keys(self) -> list:
+        return [row[0] for row in self._connection().execute('SELECT key FROM throttle')]
+
+    def purge(self, max_age: int, now: float = None):
+        now = time.time() if now is None else now
+        self._connection().execute('DELETE FROM throttle WHERE touched < ?', (now - max_age,))
+
+
+class CacheThrottleBackend:
+    """
+    Sliding window counter di Django cache
+
+    Satu entry cache per window (`<key>:<window_start>`) dengan TTL dua window.
+    Increment memakai `cache.incr`, atomik pada Redis/Memcached; untuk
+    LocMemCache/FileBasedCache limit hanya akurat per proses/host.
+    """
+
+    def __init__(self, alias: str = None):
+        self.alias = alias or getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _counts(self, key: str, time_window: int, now: float) -> tuple:
+        window_start = int(now - (now % time_window))
+        current_key = f'throttle:{key}:{window_start}'
+        previous = self.cache.get(f'throttle:{key}:{window_start - time_window}', 0)
+        return window_start, current_key, previous
+
+    def hit(self, key: str, max_requests: int, time_window: int, now: float = None) -> bool:
+        now = time.time() if now is None else now
+        window_start, current_key, previous = self._counts(key, time_window, now)
+        self.cache.add(current_key, 0, time_window * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Entry ter-evict di antara add dan incr
+            self.cache.set(current_key, 1, time_window * 2)
+            current = 1
+        elapsed = (now - window_start) / time_window
+        if previous * (1 - elapsed) + current - 1 < max_requests:
+            return True
+        # Request ditolak tidak ikut dihitung
+        self.cache.decr(current_key)
+        return False
+
+    def usage(self, key: str, time_window: int, now: float = None) -> float:
+        now = time.time() if now is None else now
+        window_start, current_key, previous = self._counts(key, time_window, now)
+        elapsed = (now - window_start) / time_window
+        return previous * (1 - elapsed) + self.cache.get(current_key, 0)
+
+    def keys(self) -> list:
+        # Cache tidak mendukung enumerasi key
+        return []
+
+    def purge(self, max_age: int, now: float = None):
+        # Entry cache kadaluarsa sendiri lewat TTL
+        pass
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Instance backend sesuai setting THROTTLE_BACKEND (dibuat sekali per proses)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'THROTTLE_BACKEND', 'courses.throttling.MemoryThrottleBackend')
+                _backend = import_string(path)()
+    return _backend
+
+
+def make_key(scope: str, client_ip: str, time_window: int) -> str:
+    return f'{scope}|{time_window}|{client_ip}'
 
 
 def throttle(max_requests: int = 10, time_window: int = 60):
     """
     Decorator untuk rate limiting
-    
+
     Args:
         max_requests: Maksimal jumlah request yang diperbolehkan
         time_window: Periode waktu dalam detik
-    
+
     Usage:
         @throttle(max_requests=10, time_window=60)
         def my_endpoint(request):
             return {"message": "success"}
-    
+
     Raises:
         HttpError 429: Jika request melebihi batas
     """
     def decorator(func):
-        @wraps(func)
-        def wrapper(request, *args, **kwargs):
+        # Limit dihitung per endpoint per IP
+        scope = f'{func.__module__}.{func.__qualname__}'
+
+        def check(request):
             # Get client IP address
             client_ip = request.META.get('REMOTE_ADDR', 'unknown')
-            current_time = time.time()
-            
-            # Bersihkan request lama yang sudah melewati time window
-            request_tracker[client_ip] = [
-                req_time for req_time in request_tracker[client_ip]
-                if current_time - req_time < time_window
-            ]
-            
-            # Check apakah sudah mencapai limit
-            if len(request_tracker[client_ip]) >= max_requests:
+
+            # Check apakah sudah mencapai limit (sekaligus mencatat request)
+            if not get_backend().hit(make_key(scope, client_ip, time_window), max_requests, time_window):
+                record_throttle_rejection(request)
                 raise HttpError(
-                    429, 
+                    429,
                     f"Rate limit exceeded. Maximum {max_requests} requests per {time_window} seconds."
                 )
-            
-            # Tambahkan request saat ini ke tracker
-            request_tracker[client_ip].append(current_time)
-            
-            # Execute fungsi asli
-            return func(request, *args, **kwargs)
-        
+
+        if inspect.iscoroutinefunction(func):
+            # Backend sinkron (SQLite menunggu lock hingga 5 detik) dijalankan di
+            # thread agar tidak menahan event loop; semua backend thread-safe
+            acheck = sync_to_async(check, thread_sensitive=False)
+
+            @wraps(func)
+            async def wrapper(request, *args, **kwargs):
+                await acheck(request)
+                return await func(request, *args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(request, *args, **kwargs):
+                check(request)
+                # Execute fungsi asli
+                return func(request, *args, **kwargs)
+
         return wrapper
     return decorator
 
@@ -61,41 +308,33 @@ def throttle(max_requests: int = 10, time_window: int = 60):
 def get_request_stats(ip_address: str) -> dict:
     """
     Mendapatkan statistik request untuk IP tertentu
-    
+
     Args:
         ip_address: IP address yang ingin dicek
-    
+
     Returns:
-        dict: Informasi tentang jumlah request dalam time window
+        dict: Informasi tentang jumlah request dalam time window per endpoint
     """
-    current_time = time.time()
-    recent_requests = [
-        req_time for req_time in request_tracker[ip_address]
-        if current_time - req_time < 60
-    ]
-    
+    backend = get_backend()
+    endpoints = {}
+    for key in backend.keys():
+        scope, time_window, client_ip = key.rsplit('|', 2)
+        if client_ip == ip_address:
+            endpoints[scope] = round(backend.usage(key, int(time_window)), 2)
+
     return {
         "ip_address": ip_address,
-        "requests_last_minute": len(recent_requests),
-        "total_tracked_requests": len(request_tracker[ip_address])
+        "requests_in_window": endpoints,
+        "tracked_keys": len(endpoints)
     }
 
 
 def clear_old_requests():
     """
-    Membersihkan request lama dari tracker (untuk maintenance)
-    Dipanggil secara periodik untuk menghemat memori
+    Membersihkan key yang sudah idle dari tracker (untuk maintenance)
+    Tidak wajib dipanggil: jumlah key sudah dibatasi LRU (THROTTLE_MAX_KEYS)
     """
-    current_time = time.time()
-    for ip_address in list(request_tracker.keys()):
-        request_tracker[ip_address] = [
-            req_time for req_time in request_tracker[ip_address]
-            if current_time - req_time < 3600  # Keep last 1 hour
-        ]
-        
-        # Hapus IP yang sudah tidak ada request
-        if not request_tracker[ip_address]:
-            del request_tracker[ip_address]
+    get_backend().purge(max_age=3600)  # Keep last 1 hour
 
 
 # Predefined throttle decorators untuk kemudahan penggunaan
@@ -3,19 +3,24 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.conf import settings
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from .models import Course, Enrollment, Material
 from .forms import CourseForm, EnrollmentForm, MaterialForm
+from .replicas import use_replica
+from .search import search
+from .stats import get_stats
 
 # Home/Dashboard View
 def home(request):
     """Dashboard utama LMS"""
     try:
-        total_courses = Course.objects.count()
-        total_enrollments = Enrollment.objects.count()
-        total_materials = Material.objects.count()
-        recent_courses = Course.objects.all().order_by('-created_at')[:6]
+        # Counter dipelihara oleh signal (courses.stats), tanpa COUNT(*) per tabel
+        stats = get_stats()
+        total_courses = stats['total_courses']
+        total_enrollments = stats['total_enrollments']
+        total_materials = stats['total_materials']
+        recent_courses = Course.objects.select_related('instructor').order_by('-created_at')[:6]
     except Exception:
         # Database tables don't exist yet (migrations not run)
         total_courses = 0
@@ -33,20 +38,16 @@ def home(request):
 
 
 # Course Views
+@use_replica()
 def course_list(request):
     """List semua courses dengan search functionality"""
     query = request.GET.get('q', '')
     try:
-        courses = Course.objects.all()
+        courses = Course.objects.select_related('instructor')
         
         if query:
-            courses = courses.filter(
-                Q(code__icontains=query) | 
-                Q(name__icontains=query) |
-                Q(description__icontains=query)
-            )
-        
-        courses = courses.annotate(enrollment_count=Count('enrollments'))
+            courses = search(courses, query)
+        # enrollment_count adalah kolom denormalisasi (courses.counters), tanpa JOIN/GROUP BY
     except Exception:
         # Database tables don't exist yet
         courses = []
@@ -54,6 +55,7 @@ def course_list(request):
     context = {
         'courses': courses,
         'query': query,
+        'fragment_timeout': settings.TEMPLATE_FRAGMENT_TIMEOUT,
     }
     return render(request, 'courses/course_list.html', context)
 
@@ -90,6 +92,7 @@ def course_detail(request, pk):
         'course': course,
         'materials': materials_paginated,
         'enrollments': enrollments,
+        'fragment_timeout': settings.TEMPLATE_FRAGMENT_TIMEOUT,
     }
     return render(request, 'courses/course_detail.html', context)
 
@@ -206,13 +209,14 @@ def material_delete(request, pk):
 
 
 # Enrollment Views
+@use_replica()
 def enrollment_list(request):
     """List all enrollments"""
     try:
         enrollments_list = Enrollment.objects.select_related('student', 'course').all()
         all_courses = Course.objects.all()
         
-        # Filter by student search
+        # Filter by student search (index trigram pada auth_user.username di PostgreSQL)
         student_query = request.GET.get('student', '')
         if student_query:
             enrollments_list = enrollments_list.filter(student__username__icontains=student_query)
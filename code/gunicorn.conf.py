@@ -0,0 +1,36 @@
+"""
+Konfigurasi gunicorn (dibaca otomatis dari working directory /code)
+
+GUNICORN_PRELOAD=True: aplikasi di-import dan dipanaskan sekali di master
+(courses/preload.py) lalu dipakai bersama worker secara copy-on-write.
+Mengikuti anjuran dokumentasi gc.freeze(): gc dimatikan di master sejak awal,
+gc.freeze() sebelum fork (objek master dipindah ke generasi permanen sehingga
+tidak pernah disentuh gc worker) dan gc dinyalakan lagi di worker.
+"""
+import gc
+import os
+
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'False') == 'True'
+
+if preload_app:
+    gc.disable()
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from courses.preload import warm_up
+
+    timings = warm_up()
+    server.log.info('Preload warm-up: %s', ', '.join(f'{part} {seconds:.3f}s' for part, seconds in timings.items()))
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
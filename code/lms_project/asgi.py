@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'lms_project.settings')
+# Tanpa WhiteNoise (sinkron) di MIDDLEWARE, lihat settings.py
+os.environ.setdefault('SERVER_MODE', 'asgi')
 
 application = get_asgi_application()
+
+from courses.asgi_static import StaticRootHandler  # noqa: E402
+
+# Static files dilayani async sebelum masuk chain middleware Django
+application = StaticRootHandler(application)
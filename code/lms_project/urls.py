@@ -17,11 +17,15 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from courses.api import apiv1
-from courses.health import health_check
+from courses.health import health_check, liveness, readiness
+from courses.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('health/', health_check, name='health_check'),  # Health check endpoint
+    path('health/', health_check, name='health_check'),  # Health check endpoint (diagnostik)
+    path('health/live', liveness, name='health_live'),  # Liveness probe (tanpa database)
+    path('health/ready', readiness, name='health_ready'),  # Readiness probe (dicache)
+    path('metrics', metrics_view, name='metrics'),  # Prometheus metrics
     path('', include('courses.urls')),  # Include courses URLs
     path('api/v1/', apiv1.urls),  # Include API URLs
 ]
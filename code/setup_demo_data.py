@@ -1,6 +1,7 @@
 """
 Script untuk setup demo data SimpleLMS
 Jalankan dengan: docker exec -it lms_app python manage.py shell < setup_demo_data.py
+Untuk data berukuran produksi gunakan: python manage.py setup_demo --scale N
 """
 
 from django.contrib.auth.models import User
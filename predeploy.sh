@@ -2,6 +2,6 @@
 
 # Pre-deploy script - runs migrations before starting the app
 echo "Running database migrations..."
-python manage.py migrate --noinput
+python manage.py boot --steps migrate
 
 echo "Migrations completed successfully!"
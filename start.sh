@@ -14,18 +14,19 @@ fi
 echo "PORT: ${PORT}"
 echo "========================="
 
-# Run migrations first (with retry logic)
-echo "Running database migrations..."
+# Migrations, static files and demo data in one process (with retry logic).
+# Each step is skipped when its fingerprint is unchanged since the last start
+# (see courses/startup.py); collectstatic runs in parallel with the DB steps.
+echo "Running startup steps (migrate, collectstatic, setup_demo)..."
 max_retries=5
 retry_count=0
 
 while [ $retry_count -lt $max_retries ]; do
-    if python manage.py migrate --noinput; then
-        echo "Migrations completed successfully!"
+    if python manage.py boot; then
         break
     else
         retry_count=$((retry_count + 1))
-        echo "Migration attempt $retry_count failed. Retrying in 3 seconds..."
+        echo "Startup attempt $retry_count failed. Retrying in 3 seconds..."
         sleep 3
     fi
 done
@@ -34,17 +35,42 @@ if [ $retry_count -eq $max_retries ]; then
     echo "Warning: Migrations failed after $max_retries attempts. Starting anyway..."
 fi
 
-# Collect static files
-echo "Collecting static files..."
-python manage.py collectstatic --noinput || echo "Warning: collectstatic failed"
-
-# Setup demo data (only if database is empty)
-echo "Setting up demo data..."
-python manage.py setup_demo || echo "Demo data already exists or setup failed"
+# Per-worker metric files are summed by /metrics; start every deploy from zero.
+# /metrics answers 403 unless METRICS_TOKEN is set (Prometheus sends it as a
+# bearer token) or METRICS_PUBLIC=True.
+export METRICS_DIR=${METRICS_DIR:-/tmp/lms_metrics}
+rm -rf "$METRICS_DIR"
 
 # Use PORT from environment or default to 8000
 PORT=${PORT:-8000}
 
+# Run password hashing (login/register) on a bounded process pool. Logins past
+# the host-wide hashing limit get an immediate 503 instead of queueing; an
+# admitted login still holds its sync worker until the hash finishes or times
+# out (see courses/hashing.py)
+export PASSWORD_HASHING_MODE=${PASSWORD_HASHING_MODE:-pool}
+
+# Import and warm the app once in the gunicorn master and share it with the
+# workers copy-on-write, with gc.freeze() before fork (see gunicorn.conf.py).
+# GUNICORN_PRELOAD=False restores per-worker imports (e.g. for code reload).
+export GUNICORN_PRELOAD=${GUNICORN_PRELOAD:-True}
+
+# SERVER_MODE=asgi serves the app through uvicorn workers so the async read
+# endpoints (courses, contents, comments, /me) do not hold a worker while
+# waiting on the database. Default stays on the classic WSGI workers.
+# In ASGI mode WhiteNoise (sync-only) is dropped from MIDDLEWARE and static
+# files are served by an async handler (see courses/asgi_static.py).
+export SERVER_MODE=${SERVER_MODE:-wsgi}
+
+if [ "$SERVER_MODE" = "asgi" ]; then
+    echo "Starting gunicorn (ASGI, uvicorn workers) on port $PORT..."
+    exec gunicorn lms_project.asgi:application \
+        --bind 0.0.0.0:$PORT \
+        --workers 3 \
+        --worker-class uvicorn_worker.UvicornWorker \
+        --log-level info
+fi
+
 # Start gunicorn
 echo "Starting gunicorn on port $PORT..."
 exec gunicorn lms_project.wsgi:application \